@@ -2,19 +2,26 @@
 import os
 import time
 import json
-import boto3
-from datetime import datetime, timedelta
+import signal
+import socket
+from datetime import datetime
 import threading
-from collections import defaultdict
+from collections import defaultdict, deque
+
+from logtail import LogFollower
+from logparse import AlertLineParser, alert_epoch
+from dedup import DedupStore
+from dispatcher import NotificationDispatcher
+from counters import SlidingCounters, parse_duration
+from rules import RuleSet
+from ingest import IngestServer
+from history import AlertHistory, http_routes
+from metrics import AlertMetrics
+from state import SQLiteState
+from sinks import build_sinks, EMAIL_SINKS
 
 class AlertService:
-    def __init__(self):
-        # AWS SES Configuration
-        self.ses_client = boto3.client(
-            'ses',
-            region_name=os.getenv('AWS_REGION', 'us-east-1')
-        )
-        
+    def __init__(self, sinks=None):
         # Email configuration
         self.sender_email = os.getenv('SENDER_EMAIL', 'monitoring@yourdomain.com')
         self.recipient_emails = os.getenv('RECIPIENT_EMAILS', '').split(',')
@@ -23,74 +30,139 @@ class AlertService:
         self.alert_log = os.getenv('ALERT_LOG', '/var/log/container_alerts.log')
         
         # State directory for writable files
-        self.state_dir = '/app/state'
+        self.state_dir = os.getenv('STATE_DIR', '/app/state')
         os.makedirs(self.state_dir, exist_ok=True)
-        self.processed_alerts_file = os.path.join(self.state_dir, 'processed_alerts.json')
+        self.processed_alerts_file = os.path.join(self.state_dir, 'processed_alerts.bin')
+        # Lines older than this are forgotten by the duplicate check
+        self.dedup_window = int(os.getenv('DEDUP_WINDOW', '86400'))  # 24 hours
         
         self.check_interval = int(os.getenv('CHECK_INTERVAL', '30'))  # seconds
         
         # Rate limiting
         self.alert_cooldown = int(os.getenv('ALERT_COOLDOWN', '300'))  # 5 minutes
         self.last_alert_times = defaultdict(lambda: datetime.min)
-        self.alert_counts = defaultdict(int)
+        # Per-type sliding-window counts, e.g. alerts in the last 5m/1h/24h
+        self.count_windows = [w.strip() for w in os.getenv('ALERT_WINDOWS', '5m,1h,24h').split(',') if w.strip()]
+        self.alert_counts = SlidingCounters(self.count_windows)
+        # Escalate a type to critical when it fires this often within the window
+        self.escalation_window = os.getenv('ESCALATION_WINDOW', self.count_windows[0])
+        self.escalation_threshold = int(os.getenv('ESCALATION_THRESHOLD', '10'))
+        if self.escalation_window not in self.count_windows:
+            self.count_windows.append(self.escalation_window)
+            self.alert_counts = SlidingCounters(self.count_windows)
         
         # Alert aggregation
-        self.alert_buffer = defaultdict(list)
+        self.alert_buffer = {}  # group key -> (rule, buffered alerts)
         self.buffer_timeout = int(os.getenv('BUFFER_TIMEOUT', '60'))  # seconds
         
+        # Severity, grouping, cooldown, inhibition and routing rules (ALERT_RULES file);
+        # ALERT_COOLDOWN and BUFFER_TIMEOUT are the defaults for rules without their own
+        self.rules = RuleSet.from_env(cooldown=self.alert_cooldown, buffer=self.buffer_timeout)
+        
+        # Precompiled alert line parser; counts unparseable lines by reason
+        self.parser = AlertLineParser()
+        # Last alerts from either input, quoted in notifications
+        self.recent_alerts = deque(maxlen=10)
+        
+        # Every accepted alert and notification is kept in SQLite for queries
+        self.history = AlertHistory(os.getenv('ALERT_HISTORY_DB', os.path.join(self.state_dir, 'alert_history.db')))
+        self.history_retention = parse_duration(os.getenv('HISTORY_RETENTION', '30d'))
+        self.last_prune = 0
+        self.metrics = AlertMetrics(parse_stats=self.parser.stats)
+        
+        # Instances sharing STATE_DIR elect a leader; only the leader processes and sends.
+        # Cooldowns and buffered alerts are kept there too, so they survive restarts
+        self.instance_id = os.getenv('INSTANCE_ID', f"{socket.gethostname()}:{os.getpid()}")
+        self.state = SQLiteState(
+            os.getenv('ALERT_STATE_DB', os.path.join(self.state_dir, 'alert_state.db')),
+            holder=self.instance_id,
+            lease_ttl=float(os.getenv('LEADER_LEASE', '15'))
+        )
+        self.is_leader = False
+        
+        # Alerts arrive from the log follower and, optionally, the ingest API threads
+        self.lock = threading.Lock()
+        self.ingest_address = os.getenv('INGEST_ADDRESS')  # e.g. 0.0.0.0:8025 or unix:/app/state/ingest.sock
+        self.ingest_server = None
+        
+        # Notifications are delivered by background workers so a slow or failing
+        # sink never holds up alert processing
+        self.dispatcher = NotificationDispatcher(
+            sinks if sinks is not None else build_sinks(sender=self.sender_email),
+            workers=int(os.getenv('NOTIFY_WORKERS', '2')),
+            queue_size=int(os.getenv('NOTIFY_QUEUE_SIZE', '100')),
+            max_attempts=int(os.getenv('NOTIFY_MAX_ATTEMPTS', '5')),
+            retry_base=float(os.getenv('NOTIFY_RETRY_BASE', '1')),
+            retry_max=float(os.getenv('NOTIFY_RETRY_MAX', '60')),
+            batch_size=int(os.getenv('RECIPIENT_BATCH_SIZE', '50')),  # SES allows 50 per message
+            dead_letter_file=os.path.join(self.state_dir, 'dead_letter.jsonl'),
+            on_result=self.record_delivery
+        )
+        
+        self.log_follower = None
+        self.load_state()
+        self.state_fresh = True  # loaded state is current until another instance may have led
+    
+    def load_state(self):
+        """Load log position, processed alerts, cooldowns, buffers and recent counts from disk"""
+        # Follows the alert log from the last read position (kept across restarts)
+        if self.log_follower:
+            self.log_follower.close()
+        self.log_follower = LogFollower(
+            self.alert_log,
+            state_file=os.path.join(self.state_dir, 'alert_log_position.json')
+        )
+        
         # Load processed alerts
         self.processed_alerts = self.load_processed_alerts()
+        
+        self.last_alert_times = defaultdict(lambda: datetime.min, {
+            key: datetime.fromtimestamp(last_sent) for key, last_sent in self.state.cooldowns().items()
+        })
+        
+        # Buffered alerts are regrouped with the current rules
+        self.alert_buffer = {}
+        for alert in self.state.buffered():
+            alert.setdefault('ts', alert_epoch(alert['timestamp']))  # saved before 'ts' existed
+            rule, key = self.rules.classify(alert)
+            self.alert_buffer.setdefault(key, (rule, []))[1].append(alert)
+        
+        # Sliding counts and inhibitions are rebuilt from the alert history
+        self.alert_counts = SlidingCounters(self.count_windows)
+        lookback = max([*self.alert_counts.windows.values(), *(i.duration for i in self.rules.inhibitions)])
+        for ts, alert_type, message in self.history.replay(time.time() - lookback):
+            self.alert_counts.add(alert_type, now=ts)
+            self.rules.restore_source({'alert_type': alert_type, 'message': message}, ts)
     
     def load_processed_alerts(self):
         """Load already processed alerts to avoid duplicates"""
-        if os.path.exists(self.processed_alerts_file):
+        store = DedupStore(self.processed_alerts_file, window=self.dedup_window)
+        legacy_file = os.path.join(self.state_dir, 'processed_alerts.json')
+        if os.path.exists(legacy_file):
             try:
-                with open(self.processed_alerts_file, 'r') as f:
-                    return set(json.load(f))
-            except:
-                return set()
-        return set()
+                print(f"Imported {store.import_json(legacy_file)} processed alerts from {legacy_file}")
+            except Exception as e:
+                print(f"Warning: Could not import {legacy_file}: {e}")
+        return store
     
     def save_processed_alerts(self):
-        """Save processed alerts to file"""
+        """Append newly processed alerts to the state file"""
         try:
-            with open(self.processed_alerts_file, 'w') as f:
-                json.dump(list(self.processed_alerts), f)
+            self.processed_alerts.flush()
         except Exception as e:
             print(f"Warning: Could not save processed alerts: {e}")
     
     def parse_alert_line(self, line):
         """Parse alert line from log file"""
-        try:
-            # Expected format: [2024-03-20 10:15:30] ALERT: High CPU - CPU usage is 85% (threshold: 40%)
-            parts = line.strip().split('] ALERT: ', 1)
-            if len(parts) != 2:
-                return None
-            
-            timestamp_str = parts[0].strip('[')
-            alert_content = parts[1]
-            
-            # Split alert type and message
-            alert_parts = alert_content.split(' - ', 1)
-            if len(alert_parts) != 2:
-                return None
-            
-            return {
-                'timestamp': timestamp_str,
-                'alert_type': alert_parts[0],
-                'message': alert_parts[1],
-                'line': line.strip()
-            }
-        except Exception as e:
-            print(f"Error parsing alert line: {e}")
-            return None
+        # Expected format: [2024-03-20 10:15:30] ALERT: High CPU - CPU usage is 85% (threshold: 40%)
+        return self.parser.parse(line)
     
-    def should_send_alert(self, alert_type):
+    def should_send_alert(self, group_key, cooldown):
         """Check if alert should be sent based on rate limiting"""
         now = datetime.now()
-        last_sent = self.last_alert_times[alert_type]
+        last_sent = self.last_alert_times[group_key]
         
-        if (now - last_sent).total_seconds() < self.alert_cooldown:
+        if (now - last_sent).total_seconds() < cooldown:
             return False
         
         return True
@@ -131,139 +203,254 @@ Application: http://localhost:8080
 Alert Frequency:
 ---------------
 """
-        for alert_type, count in self.alert_counts.items():
-            body += f"  - {alert_type}: {count} alerts in last hour\n"
+        for alert_type, counts in self.alert_counts.snapshot().items():
+            windows = ', '.join(f"{counts[window]} in last {window}" for window in self.count_windows)
+            escalated = " (ESCALATED)" if self.is_escalated(alert_type) else ""
+            body += f"  - {alert_type}: {windows}{escalated}\n"
+        
+        body += """
+Recent Alert Log:
+----------------
+"""
+        for line in self.recent_alerts:
+            body += f"  {line}\n"
         
         return body
     
-    def send_email(self, subject, body):
-        """Send email using AWS SES"""
-        try:
-            response = self.ses_client.send_email(
-                Source=self.sender_email,
-                Destination={
-                    'ToAddresses': self.recipient_emails
-                },
-                Message={
-                    'Subject': {
-                        'Data': subject,
-                        'Charset': 'UTF-8'
-                    },
-                    'Body': {
-                        'Text': {
-                            'Data': body,
-                            'Charset': 'UTF-8'
-                        }
-                    }
-                }
-            )
-            print(f"Email sent successfully: {response['MessageId']}")
-            return True
-        except Exception as e:
-            print(f"Error sending email: {e}")
-            return False
+    def send_email(self, subject, body, sinks=None, tag=None):
+        """Queue an email for delivery; returns False if it went straight to the dead-letter file"""
+        return self.dispatcher.submit(subject, body, self.recipient_emails, sinks, tag)
+    
+    def record_delivery(self, notification, sink, status, attempts, error):
+        """Dispatcher callback: count the result and add it to the notification's history"""
+        self.metrics.inc('sent' if status == 'sent' else 'failed', sink)
+        if notification.tag is not None:
+            try:
+                self.history.record_delivery(notification.tag, sink, status, attempts, error)
+            except Exception as e:
+                print(f"Warning: Could not record delivery: {e}")
     
     def process_alerts(self):
-        """Process new alerts from log file"""
-        if not os.path.exists(self.alert_log):
-            return
-        
-        new_alerts = []
+        """Process alerts appended to the log file since the last check"""
+        # Alerts posted to standby instances
+        try:
+            inbox = self.state.take_inbox()
+        except Exception as e:
+            print(f"Error reading alert inbox: {e}")
+            inbox = []
+        if inbox:
+            self.handle_alerts(inbox, source='api')
         
         try:
-            with open(self.alert_log, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and line not in self.processed_alerts:
-                        alert = self.parse_alert_line(line)
-                        if alert:
-                            new_alerts.append(alert)
-                            self.processed_alerts.add(line)
-                            
-                            # Update alert counts
-                            self.alert_counts[alert['alert_type']] += 1
+            lines = self.log_follower.read_new()
         except Exception as e:
             print(f"Error reading alert log: {e}")
             return
         
-        # Buffer alerts for aggregation
-        for alert in new_alerts:
-            self.alert_buffer[alert['alert_type']].append(alert)
+        self.handle_alerts(self.parser.parse_many(lines))
         
-        # Check if we should send buffered alerts
-        self.check_and_send_buffered_alerts()
+        # Save the log position
+        self.log_follower.save_state()
         
-        # Save processed alerts
-        self.save_processed_alerts()
+        # Drop history past the retention period about once an hour
+        if time.time() - self.last_prune > 3600:
+            self.last_prune = time.time()
+            try:
+                self.history.prune(time.time() - self.history_retention)
+            except Exception as e:
+                print(f"Warning: Could not prune alert history: {e}")
+            # Cooldowns longer than any rule's are over
+            longest = max(rule.cooldown for rule in [*self.rules.rules, self.rules.fallback])
+            self.save_state(self.state.prune_cooldowns, time.time() - longest)
+    
+    def handle_alerts(self, alerts, source='log'):
+        """Run parsed alerts through dedup, counting, inhibition and buffering; returns how many were new"""
+        with self.lock:
+            fresh = []
+            for alert in alerts:
+                if alert['line'] in self.processed_alerts:
+                    continue
+                fresh.append(alert)
+                self.processed_alerts.add(alert['line'])
+                self.recent_alerts.append(alert['line'])
+                
+                # Update alert counts
+                self.alert_counts.add(alert['alert_type'])
+                
+                # e.g. no High CPU notifications while the container is down
+                alert['suppressed'] = self.rules.inhibited(alert)
+                if alert['suppressed']:
+                    self.metrics.inc('suppressed', alert['alert_type'])
+                
+                # Buffer alerts for aggregation, one buffer per rule group
+                rule, key = self.rules.classify(alert)
+                if not alert['suppressed']:
+                    self.alert_buffer.setdefault(key, (rule, []))[1].append(alert)
+            
+            self.metrics.inc('ingested', source, len(fresh))
+            self.metrics.inc('duplicates', source, len(alerts) - len(fresh))
+            try:
+                self.history.record_alerts(fresh, source)
+            except Exception as e:
+                print(f"Warning: Could not record alert history: {e}")
+            self.save_state(self.state.add_buffered, [a for a in fresh if not a['suppressed']])
+            
+            # Check if we should send buffered alerts
+            self.check_and_send_buffered_alerts()
+            
+            # Save processed alerts
+            self.save_processed_alerts()
+            return len(fresh)
+    
+    def is_escalated(self, alert_type):
+        """True when an alert type fires faster than the escalation threshold"""
+        return self.alert_counts.count(alert_type, self.escalation_window) >= self.escalation_threshold
     
     def check_and_send_buffered_alerts(self):
         """Check and send buffered alerts"""
         now = datetime.now()
-        alerts_to_send = []
+        routes = defaultdict(list)  # sink names -> alerts to send there
         
-        for alert_type, alerts in list(self.alert_buffer.items()):
+        for key, (rule, alerts) in list(self.alert_buffer.items()):
+            # Drop alerts inhibited since they were buffered
+            inhibited = [a for a in alerts if self.rules.inhibits(a)]
+            if inhibited:
+                alerts[:] = [a for a in alerts if a not in inhibited]
+                self.suppress(inhibited)
+                self.save_state(self.state.remove_buffered, inhibited)
             if not alerts:
+                del self.alert_buffer[key]
                 continue
             
-            # Check if we should send this alert type
-            if not self.should_send_alert(alert_type):
+            # Check if we should send this group
+            if not self.should_send_alert(key, rule.cooldown):
                 continue
             
-            # Check if buffer timeout reached or critical alert
-            first_alert_time = datetime.strptime(alerts[0]['timestamp'], '%Y-%m-%d %H:%M:%S')
-            time_diff = (now - first_alert_time).total_seconds()
+            # Check if the rule's buffer time is up, enough alerts piled up, or the type escalated
+            time_diff = now.timestamp() - alerts[0]['ts']
             
-            if (time_diff >= self.buffer_timeout or 
-                alert_type in ['Container Down', 'Application Unhealthy'] or 
-                len(alerts) >= 5):
+            if (time_diff >= rule.buffer or 
+                len(alerts) >= rule.flush_count or
+                self.is_escalated(alerts[0]['alert_type'])):
                 
-                alerts_to_send.extend(alerts)
-                self.last_alert_times[alert_type] = now
-                self.alert_buffer[alert_type] = []
+                routes[tuple(rule.sinks)].extend(alerts)
+                self.last_alert_times[key] = now
+                del self.alert_buffer[key]
+                self.save_state(self.state.set_cooldown, key, now.timestamp())
+                self.save_state(self.state.remove_buffered, alerts)
         
-        if alerts_to_send:
-            # Determine email subject based on severity
-            critical_alerts = [a for a in alerts_to_send if a['alert_type'] in ['Container Down', 'Application Unhealthy']]
-            if critical_alerts:
-                subject = f"🚨 CRITICAL: {os.getenv('CONTAINER_NAME', 'Container')} Alert"
+        for sinks, alerts_to_send in routes.items():
+            # Subject follows the most severe alert; a rate escalation counts as critical
+            severities = {'critical' if self.is_escalated(a['alert_type']) else a['severity'] for a in alerts_to_send}
+            container = os.getenv('CONTAINER_NAME', 'Container')
+            if 'critical' in severities:
+                severity, subject = 'critical', f"🚨 CRITICAL: {container} Alert"
+            elif 'warning' in severities:
+                severity, subject = 'warning', f"⚠️ WARNING: {container} Alert"
             else:
-                subject = f"⚠️ WARNING: {os.getenv('CONTAINER_NAME', 'Container')} Alert"
+                severity, subject = 'info', f"ℹ️ INFO: {container} Alert"
             
             body = self.format_email_body(alerts_to_send)
-            self.send_email(subject, body)
+            try:
+                notification_id = self.history.record_notification(subject, severity, sinks, alerts_to_send)
+            except Exception as e:
+                print(f"Warning: Could not record notification: {e}")
+                notification_id = None
+            self.metrics.inc('notifications', severity)
+            self.send_email(subject, body, list(sinks), notification_id)
+    
+    def save_state(self, action, *args):
+        """Write cooldown/buffer changes to the shared state; processing goes on if that fails"""
+        try:
+            action(*args)
+        except Exception as e:
+            print(f"Warning: Could not save alert state: {e}")
+    
+    def ingest(self, alerts):
+        """Ingest API handler: process on the leader, queue for the leader on a standby"""
+        if self.is_leader:
+            return self.handle_alerts(alerts, source='api')
+        self.state.enqueue(alerts)
+        return len(alerts)
     
-    def cleanup_old_counts(self):
-        """Clean up old alert counts (keep last hour only)"""
-        one_hour_ago = datetime.now() - timedelta(hours=1)
-        # This is simplified - in production you'd track timestamps for each alert
-        # For now, we'll just reset counts periodically
-        if hasattr(self, 'last_cleanup') and (datetime.now() - self.last_cleanup).total_seconds() > 3600:
-            self.alert_counts.clear()
-            self.last_cleanup = datetime.now()
-        elif not hasattr(self, 'last_cleanup'):
-            self.last_cleanup = datetime.now()
+    def elect(self):
+        """Take or renew the leader lease; reload shared state when taking over"""
+        try:
+            leader = self.state.acquire_lease()
+        except Exception as e:
+            print(f"Error renewing leader lease: {e}")
+            leader = False
+        if leader and not self.is_leader:
+            if not self.state_fresh:
+                with self.lock:
+                    self.load_state()
+            print(f"{self.instance_id} is now the leader")
+        elif not leader:
+            if self.is_leader:
+                print(f"{self.instance_id} lost the leader lease; standing by")
+            self.state_fresh = False
+        self.is_leader = leader
+        return leader
+    
+    def suppress(self, alerts):
+        """Count and record buffered alerts dropped by an inhibition"""
+        for alert in alerts:
+            alert['suppressed'] = True
+            self.metrics.inc('suppressed', alert['alert_type'])
+        try:
+            self.history.mark_suppressed(alerts)
+        except Exception as e:
+            print(f"Warning: Could not record suppressed alerts: {e}")
     
     def run(self):
         """Main service loop"""
         print(f"Alert Service started. Monitoring {self.alert_log}")
         print(f"Sending alerts to: {', '.join(self.recipient_emails)}")
-        print(f"State directory: {self.state_dir}")
+        print(f"Notification sinks: {', '.join(sink.name for sink in self.dispatcher.sinks)}")
+        print(f"State directory: {self.state_dir} (instance {self.instance_id})")
+        print(f"Watching for new alerts with {'inotify' if self.log_follower.uses_inotify else 'polling'}")
         
+        if self.ingest_address:
+            # Pushed alerts are handled on the request threads, without waiting for the loop
+            routes = http_routes(self.history)
+            if self.metrics.registry is not None:
+                routes['/metrics'] = lambda params: self.metrics.render()
+            self.ingest_server = IngestServer(
+                self.ingest,
+                self.ingest_address,
+                token=os.getenv('INGEST_TOKEN'),
+                routes=routes
+            )
+            self.ingest_server.start()
+            print(f"Accepting alerts on {self.ingest_address}/alerts")
+        
+        # The lease is renewed well before it expires
+        renew_interval = max(1, self.state.lease_ttl / 3)
         while True:
             try:
-                self.process_alerts()
-                self.cleanup_old_counts()
-                time.sleep(self.check_interval)
+                if self.elect():
+                    self.process_alerts()
+                    # Wakes up as soon as the log changes; check_interval still bounds
+                    # the wait so buffered alerts are flushed on time
+                    self.log_follower.wait(min(self.check_interval, renew_interval))
+                else:
+                    time.sleep(renew_interval)
             except KeyboardInterrupt:
                 print("Alert service stopped")
+                if self.ingest_server:
+                    self.ingest_server.stop()
+                self.dispatcher.close()
+                # Let a standby take over right away
+                self.state.release_lease()
                 break
             except Exception as e:
                 print(f"Error in main loop: {e}")
                 time.sleep(self.check_interval)
 
 if __name__ == "__main__":
-    # Check required environment variables
-    required_vars = ['SENDER_EMAIL', 'RECIPIENT_EMAILS']
+    # Email sinks need a sender and recipients; webhook/file sinks do not
+    sink_names = [name.strip().lower() for name in os.getenv('NOTIFY_SINKS', 'ses').split(',')]
+    required_vars = ['SENDER_EMAIL', 'RECIPIENT_EMAILS'] if set(sink_names) & set(EMAIL_SINKS) else []
     missing_vars = [var for var in required_vars if not os.getenv(var)]
     
     if missing_vars:
@@ -273,5 +460,7 @@ if __name__ == "__main__":
         print("  RECIPIENT_EMAILS - Comma-separated list of recipient emails")
         exit(1)
     
+    # docker stop sends SIGTERM; shut down cleanly as on Ctrl-C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
     service = AlertService()
     service.run()
\ No newline at end of file
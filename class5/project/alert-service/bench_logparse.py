@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Lines/sec of the logparse parsers against the per-line split/strptime approach
+
+Generates (or reads) a multi-million-line alert log and Apache combined access
+log and times three passes over each:
+
+- legacy: split()/strip() per field and datetime.strptime per timestamp, the
+  way alert_service.py parsed alert lines and their timestamps before
+- regex + strptime: the precompiled pattern but no timestamp cache
+- logparse: precompiled pattern and per-minute timestamp cache
+
+Usage:
+    python3 bench_logparse.py --lines 2000000
+    python3 bench_logparse.py --alert-log /var/log/container_alerts.log --access-log server.log
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from logparse import (ALERT_PATTERN, ALERT_TIMESTAMP_FORMAT, APACHE_TIMESTAMP_FORMAT, COMBINED_PATTERN,
+                      AlertLineParser, CombinedLogParser)
+
+ALERT_TYPES = [
+    ('High CPU', 'CPU usage is {:.2f}% (threshold: 40%)'),
+    ('High Memory', 'Memory usage is {:.2f}% (threshold: 50%)'),
+    ('Slow Response', 'Response time is {:.0f}ms (threshold: 1000ms)'),
+    ('Application Unhealthy', 'Application health check failed'),
+]
+REQUESTS = ['GET /api/users', 'POST /api/login', 'GET /api/products', 'GET /dashboard', 'POST /api/orders',
+            'GET /api/stats', 'DELETE /api/users/123', 'GET /health']
+
+
+def generate(path, lines, make_line):
+    """Write `lines` lines, about three per second of log time, with 0.1% garbage"""
+    start = time.time() - lines / 3
+    with open(path, 'w') as f:
+        for i in range(lines):
+            if i % 1000 == 999:
+                f.write('truncated line without a timestamp\n')
+            else:
+                f.write(make_line(start + i / 3) + '\n')
+
+
+def alert_line(ts):
+    alert_type, message = random.choice(ALERT_TYPES)
+    stamp = datetime.fromtimestamp(ts).strftime(ALERT_TIMESTAMP_FORMAT)
+    return f"[{stamp}] ALERT: {alert_type} - {message.format(random.uniform(40, 100))}"
+
+
+def access_line(ts):
+    stamp = datetime.fromtimestamp(ts).astimezone().strftime(APACHE_TIMESTAMP_FORMAT)
+    status = random.choice((200, 200, 200, 304, 404, 500))
+    return (f'192.168.1.{random.randint(1, 254)} - - [{stamp}] "{random.choice(REQUESTS)} HTTP/1.1" '
+            f'{status} {random.randint(0, 5000)} "-" "Mozilla/5.0"')
+
+
+# ----- the approaches being compared -----
+
+def legacy_alert(line):
+    try:
+        parts = line.strip().split('] ALERT: ', 1)
+        if len(parts) != 2:
+            return None
+        alert_parts = parts[1].split(' - ', 1)
+        if len(alert_parts) != 2:
+            return None
+        timestamp = parts[0].strip('[')
+        return (datetime.strptime(timestamp, ALERT_TIMESTAMP_FORMAT).timestamp(), alert_parts[0], alert_parts[1])
+    except Exception:
+        return None
+
+
+def legacy_access(line):
+    try:
+        fields = line.split('"')
+        host, _, _, stamp = fields[0].split(' ', 3)
+        method, path, protocol = fields[1].split(' ')
+        status, size = fields[2].split()
+        ts = datetime.strptime(stamp.strip()[1:-1], APACHE_TIMESTAMP_FORMAT).timestamp()
+        return (host, ts, method, path, int(status), size)
+    except Exception:
+        return None
+
+
+def regex_alert(line):
+    match = ALERT_PATTERN.match(line.strip())
+    if match is None:
+        return None
+    timestamp, alert_type, message = match.groups()
+    return (datetime.strptime(timestamp, ALERT_TIMESTAMP_FORMAT).timestamp(), alert_type, message)
+
+
+def regex_access(line):
+    match = COMBINED_PATTERN.match(line)
+    if match is None:
+        return None
+    return (match.group(1), datetime.strptime(match.group(4), APACHE_TIMESTAMP_FORMAT).timestamp(), match.group(5))
+
+
+def measure(label, path, parse):
+    parsed = 0
+    lines = 0
+    started = time.perf_counter()
+    with open(path) as f:
+        for line in f:
+            lines += 1
+            if parse(line) is not None:
+                parsed += 1
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<18} {lines / elapsed:>12,.0f} lines/s   {elapsed:6.2f}s   parsed {parsed:,}/{lines:,}")
+    return lines / elapsed
+
+
+def bench(title, path, passes):
+    print(f"{title} ({os.path.getsize(path) / 1048576:.0f} MiB)")
+    rates = [measure(label, path, parse) for label, parse in passes]
+    print(f"  speedup vs legacy: {rates[-1] / rates[0]:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=2000000, help='lines to generate per log')
+    parser.add_argument('--alert-log', help='existing alert log to parse instead of a generated one')
+    parser.add_argument('--access-log', help='existing access log to parse instead of a generated one')
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix='logparse-bench-')
+    alert_log = args.alert_log or os.path.join(scratch, 'alerts.log')
+    access_log = args.access_log or os.path.join(scratch, 'access.log')
+    if not args.alert_log:
+        generate(alert_log, args.lines, alert_line)
+    if not args.access_log:
+        generate(access_log, args.lines, access_line)
+
+    alerts = AlertLineParser()
+    bench('Alert log', alert_log, [
+        ('legacy', legacy_alert),
+        ('regex + strptime', regex_alert),
+        ('logparse', alerts.parse),
+    ])
+    access = CombinedLogParser()
+    bench('Access log', access_log, [
+        ('legacy', legacy_access),
+        ('regex + strptime', regex_access),
+        ('logparse', access.parse),
+    ])
+    for name, stats in (('alert', alerts.stats.snapshot()), ('access', access.stats.snapshot())):
+        print(f"{name} parse errors: {stats['errors']}")
+
+    if not (args.alert_log and args.access_log):
+        for path in (alert_log, access_log):
+            if path.startswith(scratch):
+                os.remove(path)
+        os.rmdir(scratch)
+
+
+if __name__ == '__main__':
+    main()
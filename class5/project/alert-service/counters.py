@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Sliding-window alert counters
+
+Each window is a ring of time buckets with a running total. Adding an event
+and reading the count are O(1) amortized: buckets that slid out of the window
+are cleared lazily as time advances, at most once each.
+"""
+import re
+import time
+
+UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_duration(value):
+    """'90s', '5m', '1h', '7d' or plain seconds -> seconds"""
+    match = re.fullmatch(r'\s*(\d+)\s*([smhd]?)\s*', str(value))
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    return int(match.group(1)) * UNITS[match.group(2) or 's']
+
+
+class WindowCounter:
+    """Events in the last `window` seconds, at a resolution of window/buckets"""
+
+    def __init__(self, window, buckets=60):
+        self.window = window
+        self.buckets = buckets
+        self.width = window / buckets
+        self.counts = [0] * buckets
+        self.total = 0
+        self.head = None  # absolute index of the newest bucket
+
+    def _advance(self, now):
+        index = int(now // self.width)
+        if self.head is None or index - self.head >= self.buckets:
+            self.counts = [0] * self.buckets
+            self.total = 0
+        elif index > self.head:
+            for i in range(self.head + 1, index + 1):
+                slot = i % self.buckets
+                self.total -= self.counts[slot]
+                self.counts[slot] = 0
+        else:
+            return index
+        self.head = index
+        return index
+
+    def add(self, n=1, now=None):
+        index = self._advance(time.time() if now is None else now)
+        if index < self.head - self.buckets + 1:
+            return  # older than the window
+        self.counts[index % self.buckets] += n
+        self.total += n
+
+    def count(self, now=None):
+        self._advance(time.time() if now is None else now)
+        return self.total
+
+
+class SlidingCounters:
+    """Per-alert-type counters over several named windows, e.g. 5m/1h/24h"""
+
+    def __init__(self, windows=('5m', '1h', '24h'), buckets=60):
+        self.windows = {name: parse_duration(name) for name in windows}
+        self.buckets = buckets
+        self.counters = {}
+
+    def add(self, alert_type, n=1, now=None):
+        counters = self.counters.get(alert_type)
+        if counters is None:
+            counters = self.counters[alert_type] = {
+                name: WindowCounter(seconds, self.buckets) for name, seconds in self.windows.items()
+            }
+        for counter in counters.values():
+            counter.add(n, now)
+
+    def count(self, alert_type, window, now=None):
+        counters = self.counters.get(alert_type)
+        return counters[window].count(now) if counters else 0
+
+    def rate(self, alert_type, window, now=None):
+        """Events per minute over a window"""
+        return self.count(alert_type, window, now) * 60 / self.windows[window]
+
+    def snapshot(self, now=None):
+        """{alert_type: {window: count}} for types seen within the longest window"""
+        now = time.time() if now is None else now
+        result = {}
+        for alert_type, counters in self.counters.items():
+            counts = {name: counter.count(now) for name, counter in counters.items()}
+            if any(counts.values()):
+                result[alert_type] = counts
+        return result
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Time-windowed set of already processed alert lines
+
+Lines are stored as 8-byte BLAKE2 digests with the time they were seen and
+forgotten once older than the window, so memory is bounded by the alert rate
+rather than by the age of the log. Persistence is an append-only file of
+fixed-size (digest, seen_at) records: each cycle appends only the new
+digests, and the file is compacted (rewritten and atomically renamed) once
+expired records make up more than half of it.
+"""
+import hashlib
+import json
+import os
+import struct
+import time
+
+RECORD = struct.Struct('<8sd')
+
+
+def digest(line):
+    return hashlib.blake2b(line.encode('utf-8', errors='replace'), digest_size=8).digest()
+
+
+class DedupStore:
+    """Set-like store of recently seen lines with expiry"""
+
+    def __init__(self, path, window=86400, min_compact_records=1024):
+        self.path = path
+        self.window = window
+        self.min_compact_records = min_compact_records
+        self._seen = {}        # digest -> seen_at, in insertion (= time) order
+        self._pending = []     # records not yet appended to the file
+        self._file_records = 0
+        self._load()
+
+    def _load(self):
+        cutoff = time.time() - self.window
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return
+        # Ignore a trailing partial record left by an interrupted write
+        usable = len(data) - len(data) % RECORD.size
+        for key, seen_at in RECORD.iter_unpack(data[:usable]):
+            if seen_at >= cutoff:
+                self._seen.pop(key, None)
+                self._seen[key] = seen_at
+        self._file_records = usable // RECORD.size
+        if usable != len(data):
+            self.compact()
+
+    def __contains__(self, line):
+        seen_at = self._seen.get(digest(line))
+        return seen_at is not None and seen_at >= time.time() - self.window
+
+    def __len__(self):
+        return len(self._seen)
+
+    def add(self, line, seen_at=None):
+        seen_at = time.time() if seen_at is None else seen_at
+        key = digest(line)
+        self._seen.pop(key, None)
+        self._seen[key] = seen_at
+        self._pending.append(RECORD.pack(key, seen_at))
+
+    def expire(self):
+        """Forget digests older than the window"""
+        cutoff = time.time() - self.window
+        while self._seen:
+            key = next(iter(self._seen))
+            if self._seen[key] >= cutoff:
+                break
+            del self._seen[key]
+
+    def flush(self):
+        """Append new records; compact the file when it is mostly expired records"""
+        self.expire()
+        if self._pending:
+            with open(self.path, 'ab') as f:
+                f.write(b''.join(self._pending))
+            self._file_records += len(self._pending)
+            self._pending = []
+        if self._file_records > max(self.min_compact_records, 2 * len(self._seen)):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the file with only the live records (atomic rename)"""
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(b''.join(RECORD.pack(key, seen_at) for key, seen_at in self._seen.items()))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._file_records = len(self._seen)
+        self._pending = []
+
+    def import_json(self, json_path):
+        """Take over a legacy processed_alerts.json list of lines, then remove it"""
+        with open(json_path) as f:
+            lines = json.load(f)
+        now = time.time()
+        for line in lines:
+            self.add(line, now)
+        self.flush()
+        os.remove(json_path)
+        return len(lines)
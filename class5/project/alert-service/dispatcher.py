@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Asynchronous notification dispatcher
+
+Alert processing only enqueues notifications; a small pool of worker threads
+delivers them to the configured sinks. Failed sends are retried with
+exponential backoff and full jitter, and notifications that still fail (or
+that arrive while the queue is full) are appended to a dead-letter file as
+JSON lines so nothing is dropped silently.
+
+A sink is any object with a `name`, a `send(subject, body, recipients)`
+method that raises on failure, and a `close()` method (see sinks.py).
+`on_result(notification, sink_name, status, attempts, error)` is called from
+the workers with status "sent", "failed" or "dropped".
+"""
+import json
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+
+_STOP = object()
+
+
+class Notification:
+    def __init__(self, subject, body, recipients, tag=None):
+        self.subject = subject
+        self.body = body
+        self.recipients = list(recipients)
+        self.tag = tag  # caller's reference, passed back to on_result
+        self.created = time.time()
+
+
+class NotificationDispatcher:
+    """Bounded queue + worker pool delivering notifications to every sink"""
+
+    def __init__(self, sinks, workers=2, queue_size=100, max_attempts=5, retry_base=1.0,
+                 retry_max=60.0, batch_size=50, dead_letter_file=None, on_result=None):
+        self.sinks = list(sinks)
+        self.on_result = on_result
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.batch_size = batch_size
+        self.dead_letter_file = dead_letter_file
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.dropped = 0
+        self._stats_lock = threading.Lock()
+        self._dead_letter_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._workers = [threading.Thread(target=self._work, name=f"notify-{i}", daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, subject, body, recipients, sinks=None, tag=None):
+        """Queue a notification without blocking; returns False if it had to be dead-lettered
+
+        `sinks` limits delivery to the sinks with those names (default: all).
+        """
+        targets = self.sinks if not sinks else [sink for sink in self.sinks if sink.name in sinks]
+        if not targets:
+            print(f"Warning: no configured sink matches {', '.join(sinks)}; notification dropped")
+            return False
+        recipients = [r for r in recipients if r]
+        # Sinks with per-message recipient limits (SES: 50) get one send per batch
+        batches = [recipients[i:i + self.batch_size] for i in range(0, len(recipients), self.batch_size)] or [[]]
+        queued = True
+        for batch in batches:
+            notification = Notification(subject, body, batch, tag)
+            for sink in targets:
+                try:
+                    self.queue.put_nowait((notification, sink))
+                except queue.Full:
+                    self._count('dropped')
+                    self._dead_letter(notification, sink, 'queue full', 0)
+                    self._report(notification, sink, 'dropped', 0, 'queue full')
+                    queued = False
+        return queued
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._deliver(*item)
+            finally:
+                self.queue.task_done()
+
+    def _deliver(self, notification, sink):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                sink.send(notification.subject, notification.body, notification.recipients)
+                self._count('sent')
+                self._report(notification, sink, 'sent', attempt, None)
+                return
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+                print(f"Error sending via {sink.name} (attempt {attempt}/{self.max_attempts}): {error}")
+                if attempt == self.max_attempts or self._stopping.is_set():
+                    break
+                self._count('retries')
+                # Exponential backoff with full jitter
+                delay = random.uniform(0, min(self.retry_max, self.retry_base * 2 ** (attempt - 1)))
+                if self._stopping.wait(delay):
+                    break
+        self._count('failed')
+        self._dead_letter(notification, sink, error, attempt)
+        self._report(notification, sink, 'failed', attempt, error)
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _report(self, notification, sink, status, attempts, error):
+        if self.on_result:
+            try:
+                self.on_result(notification, sink.name, status, attempts, error)
+            except Exception as e:
+                print(f"Error recording delivery result: {e}")
+
+    def _dead_letter(self, notification, sink, error, attempts):
+        if not self.dead_letter_file:
+            return
+        record = {
+            'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'sink': sink.name,
+            'error': error,
+            'attempts': attempts,
+            'subject': notification.subject,
+            'recipients': notification.recipients,
+            'body': notification.body
+        }
+        try:
+            with self._dead_letter_lock, open(self.dead_letter_file, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        except OSError as e:
+            print(f"Error writing dead letter: {e}")
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'queued': self.queue.qsize(),
+                'sent': self.sent,
+                'failed': self.failed,
+                'retries': self.retries,
+                'dropped': self.dropped
+            }
+
+    def close(self, timeout=10):
+        """Deliver what is queued (waiting up to timeout), then stop workers and close sinks"""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        # Anything still retrying now fails fast into the dead-letter file
+        self._stopping.set()
+        for _ in self._workers:
+            self.queue.put(_STOP)
+        for worker in self._workers:
+            worker.join(max(0, deadline - time.monotonic()) + 1)
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                print(f"Error closing {sink.name}: {e}")
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""SQLite history of alerts and the notifications sent for them
+
+Every alert the service accepts is stored once (duplicates are not), with
+the rule and severity it was classified as and whether an inhibition
+suppressed it. Notifications are stored when queued, linked to the alerts
+they carried, and each sink's delivery result is added when the dispatcher
+reports it. Timestamps are epoch seconds and (alert_type, ts) is indexed,
+so "how many High Memory alerts fired last week" is an index range count.
+
+Usage:
+    python3 history.py counts --since 7d --type "High Memory"
+    python3 history.py counts --since 24h --by hour
+    python3 history.py alerts --since 1h --limit 20
+    python3 history.py notifications --since 1d
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from counters import parse_duration
+from sqlitetx import transaction
+
+HISTORY_DB = os.getenv('ALERT_HISTORY_DB', os.path.join(os.getenv('STATE_DIR', '/app/state'), 'alert_history.db'))
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    alert_type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    source TEXT NOT NULL,
+    rule TEXT,
+    severity TEXT,
+    suppressed INTEGER NOT NULL DEFAULT 0,
+    notification_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS alerts_type_ts ON alerts (alert_type, ts);
+CREATE INDEX IF NOT EXISTS alerts_ts ON alerts (ts);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    subject TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    alerts INTEGER NOT NULL,
+    sinks TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notifications_ts ON notifications (ts);
+
+CREATE TABLE IF NOT EXISTS deliveries (
+    notification_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    sink TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS deliveries_notification ON deliveries (notification_id);
+"""
+
+# Expressions usable with counts(by=...)
+GROUPS = {
+    'type': 'alert_type',
+    'rule': 'rule',
+    'severity': 'severity',
+    'source': 'source',
+    'hour': "strftime('%Y-%m-%d %H:00', ts, 'unixepoch', 'localtime')",
+    'day': "strftime('%Y-%m-%d', ts, 'unixepoch', 'localtime')",
+}
+
+
+def format_timestamp(ts):
+    return datetime.fromtimestamp(ts).strftime(TIMESTAMP_FORMAT)
+
+
+class AlertHistory:
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self, work):
+        with self._lock:
+            return transaction(self._conn, work)
+
+    def record_alerts(self, alerts, source):
+        """Store accepted alerts in one transaction; sets alert['id'] on each"""
+        def insert(conn):
+            for alert in alerts:
+                alert['id'] = conn.execute(
+                    'INSERT INTO alerts (ts, alert_type, message, source, rule, severity, suppressed) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (alert['ts'], alert['alert_type'], alert['message'], source,
+                     alert.get('rule'), alert.get('severity'), int(alert.get('suppressed', False)))
+                ).lastrowid
+        if alerts:
+            self._transaction(insert)
+
+    def mark_suppressed(self, alerts):
+        ids = [(alert['id'],) for alert in alerts if 'id' in alert]
+        if ids:
+            self._transaction(lambda conn: conn.executemany('UPDATE alerts SET suppressed = 1 WHERE id = ?', ids))
+
+    def record_notification(self, subject, severity, sinks, alerts):
+        """Store a queued notification and link its alerts; returns its id"""
+        def insert(conn):
+            notification_id = conn.execute(
+                'INSERT INTO notifications (ts, subject, severity, alerts, sinks) VALUES (?, ?, ?, ?, ?)',
+                (time.time(), subject, severity, len(alerts), ','.join(sinks) or '*')
+            ).lastrowid
+            conn.executemany('UPDATE alerts SET notification_id = ? WHERE id = ?',
+                             [(notification_id, alert['id']) for alert in alerts if 'id' in alert])
+            return notification_id
+        return self._transaction(insert)
+
+    def record_delivery(self, notification_id, sink, status, attempts, error=None):
+        with self._lock:
+            self._conn.execute('INSERT INTO deliveries VALUES (?, ?, ?, ?, ?, ?)',
+                               (notification_id, time.time(), sink, status, attempts, error))
+
+    def prune(self, before):
+        """Delete history older than `before` (epoch seconds); returns alerts removed"""
+        def delete(conn):
+            removed = conn.execute('DELETE FROM alerts WHERE ts < ?', (before,)).rowcount
+            conn.execute('DELETE FROM deliveries WHERE notification_id IN '
+                         '(SELECT id FROM notifications WHERE ts < ?)', (before,))
+            conn.execute('DELETE FROM notifications WHERE ts < ?', (before,))
+            return removed
+        return self._transaction(delete)
+
+    # ----- queries -----
+
+    def _where(self, start, end, alert_type=None):
+        sql = 'WHERE ts >= ? AND ts <= ?'
+        params = [start if start is not None else 0, end if end is not None else 2 ** 62]
+        if alert_type:
+            sql += ' AND alert_type = ?'
+            params.append(alert_type)
+        return sql, params
+
+    def counts(self, start=None, end=None, alert_type=None, by='type'):
+        """[(group, alerts, suppressed, notified)] for a time range, grouped by GROUPS[by]"""
+        if by not in GROUPS:
+            raise ValueError(f"Cannot group by {by}; use one of {', '.join(GROUPS)}")
+        where, params = self._where(start, end, alert_type)
+        sql = (f"SELECT {GROUPS[by]} AS grp, COUNT(*), SUM(suppressed), COUNT(notification_id) "
+               f"FROM alerts {where} GROUP BY grp ORDER BY grp")
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def alerts(self, start=None, end=None, alert_type=None, limit=100):
+        """Newest alerts first: (ts, alert_type, message, source, rule, severity, suppressed, notification_id)"""
+        where, params = self._where(start, end, alert_type)
+        sql = ('SELECT ts, alert_type, message, source, rule, severity, suppressed, notification_id '
+               f'FROM alerts {where} ORDER BY ts DESC LIMIT ?')
+        with self._lock:
+            return self._conn.execute(sql, params + [int(limit)]).fetchall()
+
+    def replay(self, start):
+        """(ts, alert_type, message) of alerts since start, oldest first"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT ts, alert_type, message FROM alerts WHERE ts >= ? ORDER BY ts', (start,)
+            ).fetchall()
+
+    def notifications(self, start=None, end=None, limit=100):
+        """Newest notifications first: (id, ts, subject, severity, alerts, sinks, deliveries)
+
+        deliveries is "sink:status" for each reported delivery, comma-separated.
+        """
+        where, params = self._where(start, end)
+        sql = ("SELECT id, ts, subject, severity, alerts, sinks, "
+               "(SELECT group_concat(d.sink || ':' || d.status) FROM deliveries d WHERE d.notification_id = n.id) "
+               f"FROM notifications n {where} ORDER BY ts DESC LIMIT ?")
+        with self._lock:
+            return self._conn.execute(sql, params + [int(limit)]).fetchall()
+
+
+def http_routes(history):
+    """GET routes for the ingest API: /history/{counts,alerts,notifications}?since=7d&type=...&by=..."""
+    def window(params):
+        now = time.time()
+        return now - parse_duration(params.get('since', '24h')), now
+
+    def counts(params):
+        start, end = window(params)
+        rows = history.counts(start, end, params.get('type'), params.get('by', 'type'))
+        return [{'group': group, 'alerts': total, 'suppressed': suppressed, 'notified': notified}
+                for group, total, suppressed, notified in rows]
+
+    def alerts(params):
+        start, end = window(params)
+        rows = history.alerts(start, end, params.get('type'), int(params.get('limit', 100)))
+        return [dict(zip(('timestamp', 'alert_type', 'message', 'source', 'rule', 'severity', 'suppressed',
+                          'notification_id'), (format_timestamp(row[0]),) + row[1:])) for row in rows]
+
+    def notifications(params):
+        start, end = window(params)
+        rows = history.notifications(start, end, int(params.get('limit', 100)))
+        return [dict(zip(('id', 'timestamp', 'subject', 'severity', 'alerts', 'sinks', 'deliveries'),
+                         row[:1] + (format_timestamp(row[1]),) + row[2:])) for row in rows]
+
+    def as_json(query):
+        return lambda params: ('application/json', json.dumps(query(params)).encode())
+
+    return {
+        '/history/counts': as_json(counts),
+        '/history/alerts': as_json(alerts),
+        '/history/notifications': as_json(notifications),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Alert history')
+    parser.add_argument('--db', default=HISTORY_DB, help='SQLite database path')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('counts', 'Alert counts per group'), ('alerts', 'Recent alerts'),
+                            ('notifications', 'Recent notifications and their delivery results')):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument('--since', default='24h', help='e.g. 90s, 15m, 24h, 7d')
+        if name != 'notifications':
+            command.add_argument('--type', help='only this alert type')
+        if name == 'counts':
+            command.add_argument('--by', default='type', choices=sorted(GROUPS))
+        else:
+            command.add_argument('--limit', type=int, default=50)
+
+    args = parser.parse_args()
+    history = AlertHistory(args.db)
+    now = time.time()
+    start = now - parse_duration(args.since)
+
+    if args.command == 'counts':
+        print(f"{args.by:<24} {'alerts':>8} {'suppressed':>11} {'notified':>9}")
+        for group, total, suppressed, notified in history.counts(start, now, args.type, args.by):
+            print(f"{str(group):<24} {total:>8} {suppressed:>11} {notified:>9}")
+    elif args.command == 'alerts':
+        for ts, alert_type, message, source, rule, severity, suppressed, notification_id in \
+                history.alerts(start, now, args.type, args.limit):
+            state = 'suppressed' if suppressed else (f"notification {notification_id}" if notification_id else 'pending')
+            print(f"{format_timestamp(ts)} [{severity}] {alert_type} - {message} ({source}, {rule}, {state})")
+    elif args.command == 'notifications':
+        for notification_id, ts, subject, severity, alerts, sinks, deliveries in \
+                history.notifications(start, now, args.limit):
+            print(f"{notification_id:>6} {format_timestamp(ts)} {subject} - {alerts} alerts -> {sinks} "
+                  f"[{deliveries or 'pending'}]")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""HTTP ingest API for structured alerts
+
+Producers POST batches of alerts as JSON instead of appending lines to the
+alert log:
+
+    POST /alerts
+    {"alerts": [{"type": "High CPU", "message": "CPU usage is 93%", "timestamp": 1760000000}]}
+
+A bare list or a single alert object is accepted too. `timestamp` is optional
+(epoch seconds or "YYYY-mm-dd HH:MM:SS", default now). The response is 202
+with the number of alerts accepted and how many were duplicates.
+
+The server listens on "host:port" or, with "unix:/path/to.sock", on a unix
+socket. Requests are handled on their own threads and passed to a handler
+callable, which for the alert service feeds the same dedup/buffer/cooldown
+pipeline as the log file. Read-only GET routes (history queries, /metrics)
+can be added with `routes`.
+"""
+import hmac
+import json
+import os
+import socketserver
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from logparse import alert_epoch
+
+MAX_BODY = 1024 * 1024
+MAX_BATCH = 1000
+
+
+class IngestError(ValueError):
+    pass
+
+
+def normalize_alert(item):
+    """Validate one alert object and convert it to the parse_alert_line() shape"""
+    if not isinstance(item, dict):
+        raise IngestError("each alert must be an object")
+    alert_type = item.get('type', item.get('alert_type'))
+    message = item.get('message')
+    for name, value in (('type', alert_type), ('message', message)):
+        if not isinstance(value, str) or not value.strip():
+            raise IngestError(f"alert {name} must be a non-empty string")
+        if '\n' in value:
+            raise IngestError(f"alert {name} must be a single line")
+
+    timestamp = item.get('timestamp')
+    try:
+        if timestamp is None:
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        elif isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+            timestamp = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+        ts = alert_epoch(timestamp)
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise IngestError("alert timestamp must be epoch seconds or 'YYYY-mm-dd HH:MM:SS'")
+
+    alert_type, message = alert_type.strip(), message.strip()
+    return {
+        'timestamp': timestamp,
+        'ts': ts,
+        'alert_type': alert_type,
+        'message': message,
+        # Same text as a log line, so the duplicate check covers both inputs
+        'line': f"[{timestamp}] ALERT: {alert_type} - {message}"
+    }
+
+
+def parse_batch(body):
+    """Request body -> list of normalized alerts"""
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        raise IngestError(f"invalid JSON: {e}")
+    if isinstance(payload, dict):
+        payload = payload['alerts'] if 'alerts' in payload else [payload]
+    if not isinstance(payload, list):
+        raise IngestError("expected an alert, a list of alerts or {\"alerts\": [...]}")
+    if len(payload) > MAX_BATCH:
+        raise IngestError(f"at most {MAX_BATCH} alerts per request")
+    return [normalize_alert(item) for item in payload]
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        # A socket file left behind by a previous run would make bind() fail
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+class IngestServer:
+    """Accepts alert batches on /alerts and hands them to handler(alerts) -> accepted count
+
+    routes maps GET paths to route(params) -> (content type, bytes); routes in
+    `public` (e.g. /metrics) do not need the token.
+    """
+
+    def __init__(self, handler, address, token=None, routes=None, public=('/health', '/metrics')):
+        self.handler = handler
+        self.address = address
+        self.token = token
+        self.routes = routes or {}
+        self.public = public
+        self.requests = 0
+        self.rejected = 0
+        self.server = self._make_server(address)
+        self._thread = None
+
+    def _make_server(self, address):
+        request_handler = self._request_handler()
+        if address.startswith('unix:'):
+            return UnixHTTPServer(address[len('unix:'):], request_handler)
+        host, _, port = address.rpartition(':')
+        server = ThreadingHTTPServer((host or '0.0.0.0', int(port)), request_handler)
+        server.daemon_threads = True
+        return server
+
+    def _request_handler(self):
+        ingest = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def reply(self, status, payload, content_type='application/json'):
+                body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def authorized(self):
+                return not ingest.token or hmac.compare_digest(
+                    self.headers.get('Authorization', ''), f"Bearer {ingest.token}")
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path == '/health':
+                    return self.reply(200, {'status': 'ok'})
+                route = ingest.routes.get(url.path)
+                if route is None:
+                    return self.reply(404, {'error': 'not found'})
+                if url.path not in ingest.public and not self.authorized():
+                    return self.reply(401, {'error': 'unauthorized'})
+                try:
+                    content_type, body = route(dict(parse_qsl(url.query)))
+                except ValueError as e:
+                    return self.reply(400, {'error': str(e)})
+                except Exception as e:
+                    print(f"Error serving {url.path}: {e}")
+                    return self.reply(500, {'error': 'request could not be served'})
+                self.reply(200, body, content_type)
+
+            def do_POST(self):
+                # Errors before the body is read leave it unread, so those replies close the connection
+                if self.path != '/alerts':
+                    self.close_connection = True
+                    return self.reply(404, {'error': 'not found'})
+                if not self.authorized():
+                    self.close_connection = True
+                    return self.reply(401, {'error': 'unauthorized'})
+                header = self.headers.get('Content-Length')
+                if header is None:
+                    self.close_connection = True
+                    return self.reply(411, {'error': 'Content-Length required'})
+                try:
+                    length = int(header)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    self.close_connection = True
+                    return self.reply(400, {'error': 'invalid Content-Length'})
+                if length > MAX_BODY:
+                    self.close_connection = True
+                    return self.reply(413, {'error': f"body larger than {MAX_BODY} bytes"})
+                try:
+                    alerts = parse_batch(self.rfile.read(length))
+                except IngestError as e:
+                    ingest.rejected += 1
+                    return self.reply(400, {'error': str(e)})
+                ingest.requests += 1
+                try:
+                    accepted = ingest.handler(alerts)
+                except Exception as e:
+                    print(f"Error handling ingested alerts: {e}")
+                    return self.reply(500, {'error': 'alerts could not be processed'})
+                self.reply(202, {'accepted': accepted, 'duplicates': len(alerts) - accepted})
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='alert-ingest', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
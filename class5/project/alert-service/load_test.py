@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Offline load test for the alert service
+
+Starts local stub servers (an HTTP webhook receiver and a minimal SMTP
+server), points the webhook and SMTP sinks at them, writes alerts to a
+temporary alert log and drives AlertService.process_alerts. Reports ingest
+throughput, deliveries per sink and how many connections the sinks opened.
+
+Usage:
+    python3 load_test.py --alerts 20000 --batch 200 --fail-rate 0.1
+"""
+import argparse
+import json
+import os
+import random
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ALERT_TYPES = ['High CPU', 'High Memory', 'Slow Response', 'Application Unhealthy', 'Container Down']
+
+
+class StubStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        self.rejected = 0
+
+    def add(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def webhook_stub(stats, fail_rate):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            stats.add('connections')
+
+        def do_POST(self):
+            json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            status = 503 if random.random() < fail_rate else 204
+            stats.add('rejected' if status == 503 else 'messages')
+            self.send_response(status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def smtp_stub(stats):
+    class Handler(socketserver.StreamRequestHandler):
+        def reply(self, line):
+            self.wfile.write(line.encode() + b'\r\n')
+
+        def handle(self):
+            stats.add('connections')
+            self.reply('220 stub ESMTP')
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                command = line.decode(errors='replace').strip().upper()
+                if command.startswith(('EHLO', 'HELO')):
+                    self.reply('250-stub')
+                    self.reply('250 8BITMIME')
+                elif command == 'DATA':
+                    self.reply('354 end with .')
+                    while self.rfile.readline() not in (b'.\r\n', b''):
+                        pass
+                    stats.add('messages')
+                    self.reply('250 queued')
+                elif command == 'QUIT':
+                    self.reply('221 bye')
+                    return
+                else:
+                    self.reply('250 OK')
+
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--alerts', type=int, default=10000)
+    parser.add_argument('--batch', type=int, default=100, help='alerts appended per processing cycle')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='share of webhook requests answered 503')
+    args = parser.parse_args()
+
+    webhook_stats, smtp_stats = StubStats(), StubStats()
+    webhook = webhook_stub(webhook_stats, args.fail_rate)
+    smtp = smtp_stub(smtp_stats)
+
+    workdir = tempfile.mkdtemp(prefix='alert-load-')
+    alert_log = os.path.join(workdir, 'container_alerts.log')
+    open(alert_log, 'w').close()
+    os.environ.update({
+        'ALERT_LOG': alert_log,
+        'STATE_DIR': os.path.join(workdir, 'state'),
+        'NOTIFY_SINKS': 'webhook,smtp',
+        'WEBHOOK_URL': f"http://127.0.0.1:{webhook.server_address[1]}/alerts",
+        'SMTP_HOST': '127.0.0.1',
+        'SMTP_PORT': str(smtp.server_address[1]),
+        'SMTP_STARTTLS': 'false',
+        'SENDER_EMAIL': 'monitor@example.com',
+        'RECIPIENT_EMAILS': 'ops@example.com',
+        'ALERT_COOLDOWN': '0',
+        'BUFFER_TIMEOUT': '0',
+        'NOTIFY_RETRY_BASE': '0.01',
+        'NOTIFY_QUEUE_SIZE': '10000',
+    })
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from alert_service import AlertService
+
+    service = AlertService()
+    started = time.perf_counter()
+    written = 0
+    while written < args.alerts:
+        with open(alert_log, 'a') as f:
+            for _ in range(min(args.batch, args.alerts - written)):
+                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                alert_type = random.choice(ALERT_TYPES)
+                f.write(f"[{timestamp}] ALERT: {alert_type} - load test alert {written}\n")
+                written += 1
+        service.process_alerts()
+    ingest_seconds = time.perf_counter() - started
+    service.dispatcher.close(timeout=60)
+    total_seconds = time.perf_counter() - started
+
+    stats = service.dispatcher.stats()
+    print(f"Alerts ingested:     {written} in {ingest_seconds:.2f}s ({written / ingest_seconds:,.0f}/s)")
+    print(f"Notifications:       sent {stats['sent']}, retries {stats['retries']}, "
+          f"failed {stats['failed']}, dropped {stats['dropped']} ({total_seconds:.2f}s total)")
+    print(f"Webhook stub:        {webhook_stats.messages} accepted, {webhook_stats.rejected} rejected, "
+          f"{webhook_stats.connections} connections")
+    print(f"SMTP stub:           {smtp_stats.messages} messages, {smtp_stats.connections} connections")
+    print(f"Working directory:   {workdir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Prometheus counters for the alert service
+
+Served as /metrics by the ingest API. Counting works without the optional
+prometheus_client package; only the exposition needs it.
+"""
+import threading
+
+try:
+    from prometheus_client import CollectorRegistry, CONTENT_TYPE_LATEST, generate_latest
+    from prometheus_client.core import CounterMetricFamily
+except ImportError:
+    CollectorRegistry = None
+
+
+class AlertMetrics:
+    """Labelled counters kept as plain dicts and exported on each scrape"""
+
+    COUNTERS = {
+        'ingested': ('alert_service_alerts_ingested', 'Alerts accepted (after the duplicate check)', ['source']),
+        'duplicates': ('alert_service_alerts_duplicate', 'Alerts dropped as already processed', ['source']),
+        'suppressed': ('alert_service_alerts_suppressed', 'Alerts not sent because an inhibition was active',
+                       ['alert_type']),
+        'notifications': ('alert_service_notifications_queued', 'Notifications queued for delivery', ['severity']),
+        'sent': ('alert_service_notifications_sent', 'Notifications delivered', ['sink']),
+        'failed': ('alert_service_notifications_failed', 'Notifications dead-lettered after retries or a full queue',
+                   ['sink']),
+    }
+
+    def __init__(self, parse_stats=None):
+        self._lock = threading.Lock()
+        self.values = {name: {} for name in self.COUNTERS}
+        self.parse_stats = parse_stats  # logparse.ParseStats of the alert log parser
+        self.registry = None
+        if CollectorRegistry is not None:
+            self.registry = CollectorRegistry()
+            self.registry.register(self)
+
+    def inc(self, name, label, n=1):
+        with self._lock:
+            counts = self.values[name]
+            counts[label] = counts.get(label, 0) + n
+
+    def collect(self):
+        with self._lock:
+            values = {name: dict(counts) for name, counts in self.values.items()}
+        for name, (metric, documentation, labels) in self.COUNTERS.items():
+            family = CounterMetricFamily(metric, documentation, labels=labels)
+            for label, value in sorted(values[name].items()):
+                family.add_metric([label], value)
+            yield family
+        if self.parse_stats is not None:
+            stats = self.parse_stats.snapshot()
+            yield CounterMetricFamily('alert_service_log_lines', 'Alert log lines read', value=stats['lines'])
+            errors = CounterMetricFamily('alert_service_log_parse_errors', 'Alert log lines that did not parse',
+                                         labels=['reason'])
+            for reason, value in sorted(stats['errors'].items()):
+                errors.add_metric([reason], value)
+            yield errors
+
+    def render(self):
+        """(content type, body) in the Prometheus text format"""
+        if self.registry is None:
+            raise RuntimeError("prometheus_client is not installed")
+        return CONTENT_TYPE_LATEST, generate_latest(self.registry)
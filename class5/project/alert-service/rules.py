@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Declarative alert rules
+
+Rules are read from a YAML (or JSON) file and compiled once into a matcher:
+
+    defaults:                  # applied to every rule
+      severity: warning
+      cooldown: 300            # seconds between notifications for one group
+      buffer: 60               # seconds to collect alerts before sending
+      flush_count: 5           # ...or send as soon as this many are buffered
+      group_by: [alert_type]   # alert fields / named regex groups forming the group key
+      sinks: []                # sink names to route to; empty = every sink
+    rules:                     # first matching rule wins
+      - name: container-down
+        match: {type: Container Down}
+        severity: critical
+        buffer: 0
+      - name: anomalies
+        match: {type_regex: 'Anomaly$', message_regex: '(?P<metric>\\w+) .* on (?P<container>\\S+)'}
+        group_by: [alert_type, container]
+    inhibit:                   # while a source alert fired within `duration`, drop targets
+      - source: {type: Container Down}
+        target: {type: [High CPU, High Memory, Slow Response]}
+        duration: 300
+
+`type` takes a string or a list and is matched exactly; `type_regex` and
+`message_regex` are searched. Matching looks up the candidate rules for an
+alert type in a bounded per-type table built on first use, so exact-type rules cost
+one dict lookup and only message regexes run per alert.
+"""
+import json
+import os
+import re
+import time
+
+SEVERITIES = ('info', 'warning', 'critical')
+
+# Alert types remembered in the candidate table; ingested alerts can carry any type
+TYPE_CACHE_SIZE = 1024
+
+# Built-in rules matching the service's historical behaviour
+DEFAULT_RULES = {
+    'defaults': {'severity': 'warning', 'cooldown': 300, 'buffer': 60, 'flush_count': 5,
+                 'group_by': ['alert_type'], 'sinks': []},
+    'rules': [
+        {'name': 'critical', 'match': {'type': ['Container Down', 'Application Unhealthy']},
+         'severity': 'critical', 'buffer': 0},
+        {'name': 'default', 'match': {}},
+    ],
+    'inhibit': [],
+}
+
+
+def load_rules_file(path):
+    """Parse a rules file; YAML needs the optional pyyaml package"""
+    with open(path) as f:
+        text = f.read()
+    if path.endswith('.json'):
+        return json.loads(text)
+    try:
+        import yaml
+    except ImportError:
+        raise RuntimeError(f"pyyaml is required to read {path} (or provide the rules as .json)")
+    return yaml.safe_load(text) or {}
+
+
+class Matcher:
+    """Compiled `match` block"""
+
+    def __init__(self, spec):
+        spec = spec or {}
+        unknown = set(spec) - {'type', 'type_regex', 'message_regex'}
+        if unknown:
+            raise ValueError(f"Unknown match keys: {', '.join(sorted(unknown))}")
+        types = spec.get('type')
+        self.types = None if types is None else frozenset([types] if isinstance(types, str) else types)
+        self.type_regex = re.compile(spec['type_regex']) if 'type_regex' in spec else None
+        self.message_regex = re.compile(spec['message_regex']) if 'message_regex' in spec else None
+
+    def matches_type(self, alert_type):
+        if self.types is not None and alert_type not in self.types:
+            return False
+        return self.type_regex is None or self.type_regex.search(alert_type) is not None
+
+    def match_message(self, message):
+        """Named groups of the message match ({} without message_regex), or None"""
+        if self.message_regex is None:
+            return {}
+        match = self.message_regex.search(message)
+        return None if match is None else match.groupdict()
+
+
+class Rule:
+    def __init__(self, spec, defaults):
+        settings = {**defaults, **spec}
+        self.name = settings.get('name', 'unnamed')
+        self.matcher = Matcher(settings.get('match'))
+        self.severity = settings.get('severity', 'warning')
+        if self.severity not in SEVERITIES:
+            raise ValueError(f"Rule {self.name}: severity must be one of {', '.join(SEVERITIES)}")
+        self.cooldown = float(settings.get('cooldown', 300))
+        self.buffer = float(settings.get('buffer', 60))
+        self.flush_count = int(settings.get('flush_count', 5))
+        self.group_by = list(settings.get('group_by') or ['alert_type'])
+        self.sinks = list(settings.get('sinks') or [])
+
+
+class Inhibition:
+    def __init__(self, spec):
+        self.source = Matcher(spec.get('source'))
+        self.target = Matcher(spec.get('target'))
+        self.duration = float(spec.get('duration', 300))
+        self.active_until = 0.0
+
+    def matches(self, matcher, alert):
+        return matcher.matches_type(alert['alert_type']) and matcher.match_message(alert['message']) is not None
+
+
+class RuleSet:
+    """Classifies alerts: which rule applies, its group key, and whether it is inhibited"""
+
+    def __init__(self, config=None):
+        config = DEFAULT_RULES if config is None else config
+        defaults = {**DEFAULT_RULES['defaults'], **(config.get('defaults') or {})}
+        self.rules = [Rule(spec, defaults) for spec in config.get('rules') or []]
+        # Anything no rule matches still gets the defaults
+        self.fallback = Rule({'name': 'default'}, defaults)
+        self.inhibitions = [Inhibition(spec) for spec in config.get('inhibit') or []]
+        self._by_type = {}
+        self.suppressed = 0
+
+    @classmethod
+    def from_env(cls, path=None, cooldown=None, buffer=None):
+        """Rules from ALERT_RULES if set and present, otherwise the built-in defaults
+
+        cooldown/buffer (ALERT_COOLDOWN/BUFFER_TIMEOUT) are the defaults for
+        rules that do not set their own, unless the file's `defaults` block
+        sets them too.
+        """
+        path = path or os.getenv('ALERT_RULES')
+        env_defaults = {name: value for name, value in (('cooldown', cooldown), ('buffer', buffer))
+                        if value is not None}
+        if path and os.path.exists(path):
+            config = load_rules_file(path)
+            defaults = {**env_defaults, **(config.get('defaults') or {})}
+        else:
+            config = DEFAULT_RULES
+            defaults = {**config['defaults'], **env_defaults}
+        return cls({**config, 'defaults': defaults})
+
+    def _candidates(self, alert_type):
+        candidates = self._by_type.get(alert_type)
+        if candidates is None:
+            if len(self._by_type) >= TYPE_CACHE_SIZE:
+                self._by_type.clear()
+            candidates = self._by_type[alert_type] = [
+                rule for rule in self.rules if rule.matcher.matches_type(alert_type)
+            ]
+        return candidates
+
+    def classify(self, alert):
+        """(rule, group_key) for an alert; fills alert['rule'] and alert['severity']"""
+        for rule in self._candidates(alert['alert_type']):
+            groups = rule.matcher.match_message(alert['message'])
+            if groups is not None:
+                break
+        else:
+            rule, groups = self.fallback, {}
+        alert['rule'] = rule.name
+        alert['severity'] = rule.severity
+        fields = {**alert, **groups}
+        key = (rule.name,) + tuple(str(fields.get(name, '')) for name in rule.group_by)
+        return rule, key
+
+    def inhibited(self, alert, now=None):
+        """Record alert as an inhibition source if it is one; True if it should be dropped"""
+        now = time.time() if now is None else now
+        dropped = False
+        for inhibition in self.inhibitions:
+            if inhibition.matches(inhibition.source, alert):
+                inhibition.active_until = now + inhibition.duration
+            elif inhibition.active_until > now and inhibition.matches(inhibition.target, alert):
+                dropped = True
+        if dropped:
+            self.suppressed += 1
+        return dropped
+
+    def restore_source(self, alert, at):
+        """Re-arm inhibitions from an alert seen at `at` (e.g. replayed from history after a restart)"""
+        for inhibition in self.inhibitions:
+            if inhibition.matches(inhibition.source, alert):
+                inhibition.active_until = max(inhibition.active_until, at + inhibition.duration)
+
+    def inhibits(self, alert, now=None):
+        """True if an active inhibition targets alert (no state change)"""
+        now = time.time() if now is None else now
+        return any(inhibition.active_until > now and inhibition.matches(inhibition.target, alert)
+                   for inhibition in self.inhibitions)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Notification sinks used by the dispatcher
+
+Each sink sends one notification with `send(subject, body, recipients)` and
+raises on failure; retries are left to the dispatcher. Sinks that talk to a
+server keep their connection open between sends (one per worker thread).
+
+build_sinks() picks sinks from NOTIFY_SINKS, e.g. "ses", "smtp,webhook" or
+"file". boto3 is only imported when the SES sink is used.
+"""
+import http.client
+import json
+import os
+import smtplib
+import ssl
+import sys
+import threading
+from datetime import datetime
+from email.message import EmailMessage
+from urllib.parse import urlsplit
+
+from keepalive import request_with_retry
+
+
+class SESSink:
+    """Email through AWS SES; the boto3 client is created on the first send"""
+
+    name = 'ses'
+
+    def __init__(self, sender, region=None, connect_timeout=5, read_timeout=10):
+        self.sender = sender
+        self.region = region or os.getenv('AWS_REGION', 'us-east-1')
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        # boto3 clients are thread-safe and pool their HTTPS connections
+        with self._lock:
+            if self._client is None:
+                import boto3
+                from botocore.config import Config
+                self._client = boto3.client(
+                    'ses',
+                    region_name=self.region,
+                    # The dispatcher retries with backoff, so botocore should not
+                    config=Config(connect_timeout=self.connect_timeout, read_timeout=self.read_timeout,
+                                  retries={'total_max_attempts': 1})
+                )
+            return self._client
+
+    def send(self, subject, body, recipients):
+        response = self.client.send_email(
+            Source=self.sender,
+            Destination={'ToAddresses': recipients},
+            Message={
+                'Subject': {'Data': subject, 'Charset': 'UTF-8'},
+                'Body': {'Text': {'Data': body, 'Charset': 'UTF-8'}}
+            }
+        )
+        print(f"Email sent successfully: {response['MessageId']}")
+
+    def close(self):
+        pass
+
+
+class PerThreadConnections:
+    """One connection per worker thread, remembered so they can all be closed"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def get(self):
+        return getattr(self._local, 'conn', None)
+
+    def set(self, conn):
+        self._local.conn = conn
+        if conn is not None:
+            with self._lock:
+                self._all.append(conn)
+                self.opened += 1
+
+    def discard(self, close):
+        conn = self.get()
+        self._local.conn = None
+        if conn is not None:
+            with self._lock:
+                if conn in self._all:
+                    self._all.remove(conn)
+            try:
+                close(conn)
+            except Exception:
+                pass
+
+    def close_all(self, close):
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            try:
+                close(conn)
+            except Exception:
+                pass
+
+
+class SMTPSink:
+    """Email over SMTP, keeping the session open between messages"""
+
+    name = 'smtp'
+
+    def __init__(self, sender, host, port=587, username=None, password=None, starttls=True, timeout=10):
+        self.sender = sender
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.sessions = PerThreadConnections()
+
+    def _connect(self):
+        session = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            session.starttls(context=ssl.create_default_context())
+        if self.username:
+            session.login(self.username, self.password or '')
+        return session
+
+    def send(self, subject, body, recipients):
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = ', '.join(recipients)
+        message['Subject'] = subject
+        message.set_content(body)
+
+        session = self.sessions.get()
+        if session is not None:
+            try:
+                session.send_message(message)
+                return
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # Server closed the idle session; reconnect once below
+                self.sessions.discard(lambda s: s.close())
+        session = self._connect()
+        self.sessions.set(session)
+        session.send_message(message)
+
+    def close(self):
+        self.sessions.close_all(lambda s: s.quit())
+
+
+class WebhookSink:
+    """POSTs notifications as JSON to an HTTP(S) endpoint over keep-alive connections"""
+
+    name = 'webhook'
+
+    def __init__(self, url, headers=None, timeout=10):
+        parts = urlsplit(url)
+        self.url = url
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.https else 80)
+        self.path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        self.headers = {'Content-Type': 'application/json', **(headers or {})}
+        self.timeout = timeout
+        self.connections = PerThreadConnections()
+
+    def _connect(self):
+        if self.https:
+            conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout,
+                                               context=ssl.create_default_context())
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        self.connections.set(conn)
+        return conn
+
+    def send(self, subject, body, recipients):
+        payload = json.dumps({
+            'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'subject': subject,
+            'recipients': recipients,
+            'body': body
+        }).encode()
+
+        def post(conn):
+            conn.request('POST', self.path, body=payload, headers=self.headers)
+            response = conn.getresponse()
+            response.read()
+            return response
+
+        response = request_with_retry(self.connections.get, self._connect, post, self._discard)
+        if response.will_close:
+            self._discard()
+        if response.status >= 300:
+            raise RuntimeError(f"Webhook returned HTTP {response.status}")
+
+    def _discard(self, conn=None):
+        # Forgets this thread's connection, which is the one passed in
+        self.connections.discard(lambda c: c.close())
+
+    def close(self):
+        self.connections.close_all(lambda c: c.close())
+
+
+class FileSink:
+    """Appends notifications to a file (or stdout for "-") as JSON lines"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = 'stdout' if path == '-' else 'file'
+        self._lock = threading.Lock()
+
+    def send(self, subject, body, recipients):
+        record = {
+            'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'subject': subject,
+            'recipients': recipients,
+            'body': body
+        }
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            if self.path == '-':
+                sys.stdout.write(line)
+                sys.stdout.flush()
+            else:
+                with open(self.path, 'a') as f:
+                    f.write(line)
+
+    def close(self):
+        pass
+
+
+def build_sinks(names=None, sender=None):
+    """Create the sinks listed (comma-separated) in names or NOTIFY_SINKS"""
+    names = names if names is not None else os.getenv('NOTIFY_SINKS', 'ses')
+    sender = sender or os.getenv('SENDER_EMAIL', 'monitoring@yourdomain.com')
+    sinks = []
+    for name in [n.strip().lower() for n in names.split(',') if n.strip()]:
+        if name == 'ses':
+            sinks.append(SESSink(sender))
+        elif name == 'smtp':
+            sinks.append(SMTPSink(
+                sender,
+                host=os.getenv('SMTP_HOST', 'localhost'),
+                port=int(os.getenv('SMTP_PORT', '587')),
+                username=os.getenv('SMTP_USERNAME'),
+                password=os.getenv('SMTP_PASSWORD'),
+                starttls=os.getenv('SMTP_STARTTLS', 'true').lower() == 'true'
+            ))
+        elif name == 'webhook':
+            url = os.getenv('WEBHOOK_URL')
+            if not url:
+                raise ValueError("NOTIFY_SINKS includes webhook but WEBHOOK_URL is not set")
+            token = os.getenv('WEBHOOK_TOKEN')
+            sinks.append(WebhookSink(url, headers={'Authorization': f"Bearer {token}"} if token else None))
+        elif name == 'file':
+            sinks.append(FileSink(os.getenv('NOTIFY_FILE', '/app/state/notifications.jsonl')))
+        elif name == 'stdout':
+            sinks.append(FileSink('-'))
+        else:
+            raise ValueError(f"Unknown notification sink: {name}")
+    return sinks
+
+
+# Sinks that deliver to RECIPIENT_EMAILS
+EMAIL_SINKS = ('ses', 'smtp')
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Shared state for running several AlertService instances
+
+Instances that share the state directory (on one host; SQLite relies on
+file locks) coordinate through one SQLite database:
+
+- a leader lease: only the instance holding it reads the alert log, buffers
+  alerts and sends notifications; it renews the lease every loop, and a
+  standby takes over once the lease has not been renewed for `lease_ttl`
+- cooldowns and buffered alerts, written through as they change, so a new
+  leader - or the same instance after a restart - carries on where the last
+  one stopped instead of re-sending or forgetting alerts
+- an inbox for alerts posted to a standby's ingest API, drained by the leader
+
+Any object with the same methods can stand in for SQLiteState as a backend.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+from sqlitetx import transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cooldowns (
+    group_key TEXT PRIMARY KEY,
+    last_sent REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS buffered (
+    id INTEGER PRIMARY KEY,
+    alert TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS inbox (
+    id INTEGER PRIMARY KEY,
+    alert TEXT NOT NULL
+);
+"""
+
+
+class SQLiteState:
+    def __init__(self, path, holder, lease_ttl=15):
+        self.path = path
+        self.holder = holder
+        self.lease_ttl = lease_ttl
+        self._lock = threading.Lock()
+        # Other instances may hold the write lock briefly; wait instead of failing
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self, work, mode=''):
+        with self._lock:
+            return transaction(self._conn, work, mode)
+
+    # ----- leader lease -----
+
+    def acquire_lease(self, name='leader'):
+        """Take or renew the lease; True if this instance holds it afterwards"""
+        def acquire(conn):
+            now = time.time()
+            row = conn.execute('SELECT holder, expires FROM leases WHERE name = ?', (name,)).fetchone()
+            if row and row[0] != self.holder and row[1] > now:
+                return False
+            conn.execute('INSERT OR REPLACE INTO leases VALUES (?, ?, ?)', (name, self.holder, now + self.lease_ttl))
+            return True
+        # IMMEDIATE takes the write lock up front, so two instances cannot both see an expired lease
+        return self._transaction(acquire, 'IMMEDIATE')
+
+    def release_lease(self, name='leader'):
+        """Give the lease up so a standby can take over without waiting for it to expire"""
+        with self._lock:
+            self._conn.execute('DELETE FROM leases WHERE name = ? AND holder = ?', (name, self.holder))
+
+    def leader(self, name='leader'):
+        """(holder, expires) of the current lease, or None"""
+        with self._lock:
+            row = self._conn.execute('SELECT holder, expires FROM leases WHERE name = ?', (name,)).fetchone()
+        return tuple(row) if row and row[1] > time.time() else None
+
+    # ----- cooldowns -----
+
+    def cooldowns(self):
+        """{group key tuple: epoch seconds of the last notification}"""
+        with self._lock:
+            rows = self._conn.execute('SELECT group_key, last_sent FROM cooldowns').fetchall()
+        return {tuple(json.loads(key)): last_sent for key, last_sent in rows}
+
+    def set_cooldown(self, key, last_sent):
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO cooldowns VALUES (?, ?)', (json.dumps(list(key)), last_sent))
+
+    def prune_cooldowns(self, before):
+        with self._lock:
+            self._conn.execute('DELETE FROM cooldowns WHERE last_sent < ?', (before,))
+
+    # ----- buffered alerts -----
+
+    def buffered(self):
+        """Alerts waiting in buffers, oldest first; each carries its 'buffer_id'"""
+        with self._lock:
+            rows = self._conn.execute('SELECT id, alert FROM buffered ORDER BY id').fetchall()
+        return [{**json.loads(alert), 'buffer_id': row_id} for row_id, alert in rows]
+
+    def add_buffered(self, alerts):
+        """Store alerts as buffered; sets alert['buffer_id'] on each"""
+        def insert(conn):
+            for alert in alerts:
+                alert['buffer_id'] = conn.execute('INSERT INTO buffered (alert) VALUES (?)',
+                                                  (json.dumps(alert),)).lastrowid
+        if alerts:
+            self._transaction(insert)
+
+    def remove_buffered(self, alerts):
+        ids = [(alert['buffer_id'],) for alert in alerts if 'buffer_id' in alert]
+        if ids:
+            self._transaction(lambda conn: conn.executemany('DELETE FROM buffered WHERE id = ?', ids))
+
+    # ----- inbox -----
+
+    def enqueue(self, alerts):
+        """Hand alerts received by a standby to the leader"""
+        if alerts:
+            self._transaction(lambda conn: conn.executemany(
+                'INSERT INTO inbox (alert) VALUES (?)', [(json.dumps(alert),) for alert in alerts]))
+
+    def take_inbox(self, limit=1000):
+        """Remove and return up to `limit` queued alerts, oldest first"""
+        def take(conn):
+            rows = conn.execute('SELECT id, alert FROM inbox ORDER BY id LIMIT ?', (limit,)).fetchall()
+            if rows:
+                conn.execute('DELETE FROM inbox WHERE id <= ?', (rows[-1][0],))
+            return [json.loads(alert) for _, alert in rows]
+        return self._transaction(take, 'IMMEDIATE')
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Keep-alive request helper shared by the monitor dashboard and the alert service"""
+import http.client
+
+# Errors after which a connection is closed rather than reused
+CONNECTION_ERRORS = (http.client.HTTPException, OSError)
+
+
+def request_with_retry(acquire, connect, send, discard, retry_on=CONNECTION_ERRORS):
+    """Return send(conn) on a kept-alive connection, retrying once on a fresh one
+
+    acquire() returns an idle connection or None, connect() opens a new one
+    and discard(conn) closes and forgets one that failed. A server may close
+    an idle keep-alive connection at any time, so if send() fails with one of
+    `retry_on` on a reused connection it is retried once on a new connection;
+    failures on a fresh connection are raised.
+    """
+    for attempt in (1, 2):
+        conn = acquire() if attempt == 1 else None
+        reused = conn is not None
+        if conn is None:
+            conn = connect()
+        try:
+            return send(conn)
+        except CONNECTION_ERRORS as e:
+            discard(conn)
+            if reused and attempt == 1 and isinstance(e, retry_on):
+                continue
+            raise
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Fast parsers for alert log lines and Apache combined-format access logs
+
+Each format is matched by one precompiled regular expression. Timestamps are
+converted to epoch seconds once, at parse time, through a cache keyed on the
+minute: lines from the same minute differ only in their seconds, so a whole
+minute of log costs a single strptime/mktime. Lines that do not parse are
+counted per reason (with the first example kept) instead of being printed.
+
+    [2024-03-20 10:15:30] ALERT: High CPU - CPU usage is 85% (threshold: 40%)
+    192.168.1.100 - - [08/Jul/2025:10:15:23 +0000] "GET /api/users HTTP/1.1" 200 1234 "-" "Mozilla/5.0"
+"""
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+ALERT_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+APACHE_TIMESTAMP_FORMAT = '%d/%b/%Y:%H:%M:%S %z'
+
+ALERT_PATTERN = re.compile(r'\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] ALERT: (.+?) - (.*)')
+# host ident user [time] "request" status bytes ["referer" "user agent"]
+COMBINED_PATTERN = re.compile(
+    r'(\S+) (\S+) (\S+) \[([^\]]*)\] "([^"]*)" (\d{3}) (\d+|-)'
+    r'(?: "([^"]*)" "([^"]*)")?'
+)
+
+# Minutes remembered per cache; a log rarely revisits old minutes
+CACHE_SIZE = 4096
+
+
+class TimestampCache:
+    """Epoch seconds for timestamps, computed once per distinct minute
+
+    `seconds` is the slice holding the two-digit seconds in a value `width`
+    characters long; the rest of the string (including any UTC offset) names
+    the minute. Values of any other length are parsed by strptime alone.
+    """
+
+    def __init__(self, fmt, seconds, width):
+        self.fmt = fmt
+        self.seconds = seconds
+        self.width = width
+        self.start, self.stop = seconds.start, seconds.stop
+        self._minutes = {}
+
+    def __call__(self, value):
+        if len(value) != self.width:
+            # Slicing would misread e.g. a truncated '2024-03-20 10:15:3'
+            parsed = datetime.strptime(value, self.fmt)
+            return parsed.timestamp() if parsed.tzinfo else time.mktime(parsed.timetuple())
+        key = value[:self.start] + value[self.stop:]
+        base = self._minutes.get(key)
+        if base is None:
+            # Seconds zeroed so the cached value is the start of the minute
+            stamp = value[:self.start] + '00' + value[self.stop:]
+            parsed = datetime.strptime(stamp, self.fmt)
+            base = parsed.timestamp() if parsed.tzinfo else time.mktime(parsed.timetuple())
+            if len(self._minutes) >= CACHE_SIZE:
+                self._minutes.clear()
+            self._minutes[key] = base
+        seconds = int(value[self.seconds])
+        if seconds > 59:
+            raise ValueError(f"second out of range in {value!r}")
+        return base + seconds
+
+
+class ParseStats:
+    """Line counts and per-reason error counts for one parser"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.lines = 0
+        self.parsed = 0
+        self.errors = Counter()
+        self.samples = {}  # reason -> first offending line
+
+    def ok(self):
+        with self._lock:
+            self.lines += 1
+            self.parsed += 1
+
+    def error(self, reason, line):
+        with self._lock:
+            self.lines += 1
+            self.errors[reason] += 1
+            self.samples.setdefault(reason, line[:200].rstrip())
+
+    def snapshot(self):
+        with self._lock:
+            return {'lines': self.lines, 'parsed': self.parsed, 'errors': dict(self.errors),
+                    'samples': dict(self.samples)}
+
+
+def alert_timestamp_cache():
+    # 'YYYY-mm-dd HH:MM:SS'
+    return TimestampCache(ALERT_TIMESTAMP_FORMAT, slice(17, 19), 19)
+
+
+def apache_timestamp_cache():
+    # 'dd/Mon/YYYY:HH:MM:SS +zzzz'
+    return TimestampCache(APACHE_TIMESTAMP_FORMAT, slice(18, 20), 26)
+
+
+# Shared cache for one-off conversions of alert timestamps
+alert_epoch = alert_timestamp_cache()
+
+
+class AlertLineParser:
+    """Parses '[timestamp] ALERT: type - message' lines"""
+
+    def __init__(self):
+        self.stats = ParseStats()
+        self.epoch = alert_timestamp_cache()
+
+    def parse(self, line):
+        """Alert dict (timestamp, ts, alert_type, message, line) or None"""
+        line = line.strip()
+        match = ALERT_PATTERN.match(line)
+        if match is None:
+            self.stats.error(self._reason(line), line)
+            return None
+        timestamp, alert_type, message = match.groups()
+        try:
+            ts = self.epoch(timestamp)
+        except ValueError:
+            self.stats.error('bad_timestamp', line)
+            return None
+        self.stats.ok()
+        return {'timestamp': timestamp, 'ts': ts, 'alert_type': alert_type, 'message': message, 'line': line}
+
+    def parse_many(self, lines):
+        """Parsed alerts from lines, skipping blank and unparseable ones"""
+        parse = self.parse
+        return [alert for alert in (parse(line) for line in lines if line.strip()) if alert]
+
+    @staticmethod
+    def _reason(line):
+        # Only runs for lines that failed, to say why
+        if '] ALERT: ' not in line:
+            return 'not_an_alert'
+        if ' - ' not in line.split('] ALERT: ', 1)[1]:
+            return 'missing_message'
+        return 'bad_timestamp'
+
+
+class CombinedLogParser:
+    """Parses Apache common/combined access log lines"""
+
+    def __init__(self):
+        self.stats = ParseStats()
+        self.epoch = apache_timestamp_cache()
+
+    def parse(self, line):
+        """Request dict or None; method/path/protocol are None for a malformed request line"""
+        match = COMBINED_PATTERN.match(line)
+        if match is None:
+            self.stats.error('malformed', line)
+            return None
+        host, ident, user, timestamp, request, status, size, referer, agent = match.groups()
+        try:
+            ts = self.epoch(timestamp)
+        except ValueError:
+            self.stats.error('bad_timestamp', line)
+            return None
+        parts = request.split(' ')
+        method, path, protocol = parts if len(parts) == 3 else (None, None, None)
+        self.stats.ok()
+        return {
+            'host': host, 'ident': ident, 'user': user, 'ts': ts, 'request': request,
+            'method': method, 'path': path, 'protocol': protocol, 'status': int(status),
+            'bytes': 0 if size == '-' else int(size), 'referer': referer, 'user_agent': agent
+        }
+
+    def parse_many(self, lines):
+        parse = self.parse
+        return [entry for entry in (parse(line) for line in lines if line.strip()) if entry]
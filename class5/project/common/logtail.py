@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Log tail helpers shared by the monitor dashboard and the alert service"""
+import json
+import os
+import struct
+import threading
+import time
+
+# Size of each backwards read when looking for line breaks
+BLOCK_SIZE = 8192
+
+# Most bytes LogFollower.read_new() reads per call; a backlog is returned over several calls
+READ_SIZE = 1024 * 1024
+
+
+def tail_lines(path, n=10, block_size=BLOCK_SIZE):
+    """Return the last n lines of a file, reading backwards from the end in blocks
+
+    Only as many blocks as are needed to find n line breaks are read, so the
+    cost depends on n and the line length rather than on the size of the file.
+    """
+    if n <= 0:
+        return []
+
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        chunks = []
+        newlines = 0
+
+        # Read blocks backwards until we have more than n line breaks
+        # (one extra so the first, possibly partial, line can be dropped)
+        while position > 0 and newlines <= n:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+
+    data = b''.join(reversed(chunks))
+    lines = data.splitlines()
+
+    # If we stopped before the start of the file the first line is partial
+    if position > 0 and lines:
+        lines = lines[1:]
+
+    return [line.decode('utf-8', errors='replace').strip() for line in lines[-n:]]
+
+
+class TailCache:
+    """Cache of file tails keyed by path, invalidated on mtime/size change"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, n=10):
+        """Return the last n lines of path, reading the file only if it changed"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return []
+
+        key = (st.st_mtime_ns, st.st_size, n)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == key:
+                return list(entry[1])
+
+        lines = tail_lines(path, n)
+        with self._lock:
+            self._entries[path] = (key, lines)
+        return list(lines)
+
+    def clear(self):
+        """Drop all cached tails"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide cache used by cached_tail()
+_tail_cache = TailCache()
+
+
+def cached_tail(path, n=10):
+    """Return the last n lines of path using the shared process-wide cache"""
+    return _tail_cache.get(path, n)
+
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+# struct inotify_event header: wd, mask, cookie, len (followed by len bytes of name)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class Inotify:
+    """Minimal inotify binding through ctypes; raises OSError where unavailable"""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('inotify is not available')
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+    def watch(self, path, mask=WATCH_MASK):
+        import ctypes
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {path}')
+        return wd
+
+    def wait(self, timeout, names=None):
+        """Block until an event arrives or timeout passes; True if there were events
+
+        With `names`, only events for those file names (in a watched
+        directory) count; others are drained and the wait goes on.
+        """
+        import select
+        deadline = time.monotonic() + timeout
+        while True:
+            readable, _, _ = select.select([self.fd], [], [], max(0, deadline - time.monotonic()))
+            if not readable:
+                return False
+            if self._drain(names):
+                return True
+
+    def _drain(self, names):
+        """Read all queued events; True if any is for one of names (or names is None)"""
+        relevant = names is None
+        try:
+            while True:
+                data = os.read(self.fd, 65536)
+                if not data:
+                    break
+                position = 0
+                while position + EVENT_HEADER.size <= len(data):
+                    _, mask, _, length = EVENT_HEADER.unpack_from(data, position)
+                    name = data[position + EVENT_HEADER.size:position + EVENT_HEADER.size + length]
+                    position += EVENT_HEADER.size + length
+                    # After an overflow the lost events may have been ours
+                    if mask & IN_Q_OVERFLOW or os.fsdecode(name.rstrip(b'\0')) in (names or ()):
+                        relevant = True
+        except BlockingIOError:
+            pass
+        return relevant
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LogFollower:
+    """Returns the lines appended to a log since the previous call
+
+    The (inode, offset) position is kept in a small state file so a restart
+    continues where it left off. A new inode at the path means the log was
+    rotated: the rest of the old file is read first, then the new one from the
+    start. A file shorter than the offset was truncated and is re-read from 0.
+    Lines are only returned once complete (terminated by a newline).
+    """
+
+    def __init__(self, path, state_file=None, poll_interval=1.0, read_size=READ_SIZE):
+        self.path = path
+        self.state_file = state_file
+        self.poll_interval = poll_interval
+        self.read_size = read_size
+        self.inode = None
+        self.offset = 0
+        self.rotations = 0
+        self.truncations = 0
+        self._file = None
+        self._more = False  # the last read stopped at read_size, so more may be waiting
+        self._load_state()
+        self._inotify = None
+        try:
+            inotify = Inotify()
+        except OSError:
+            return
+        try:
+            # Watch the directory so creation and rotation of the log are seen too;
+            # wait() only wakes for events naming the log itself
+            inotify.watch(os.path.dirname(os.path.abspath(path)))
+        except OSError:
+            inotify.close()
+            return
+        self._inotify = inotify
+
+    @property
+    def uses_inotify(self):
+        return self._inotify is not None
+
+    def _load_state(self):
+        if not self.state_file:
+            return
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+            self.inode, self.offset = state['inode'], state['offset']
+        except (OSError, ValueError, KeyError, TypeError):
+            self.inode, self.offset = None, 0
+
+    def save_state(self):
+        """Persist the current position (atomically, via rename)"""
+        if not self.state_file:
+            return
+        tmp = self.state_file + '.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                json.dump({'inode': self.inode, 'offset': self.offset}, f)
+            os.replace(tmp, self.state_file)
+        except OSError as e:
+            print(f"Warning: Could not save log position: {e}")
+
+    def _open(self, st):
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, 'rb')
+        # The file at the path may have changed between stat() and open()
+        opened = os.fstat(self._file.fileno())
+        if opened.st_ino != st.st_ino:
+            st = opened
+        if self.inode != st.st_ino:
+            if self.inode is not None:
+                self.rotations += 1
+            self.inode, self.offset = st.st_ino, 0
+        return st
+
+    def _read_from(self, f):
+        """Complete lines from the current offset of f, at most about read_size bytes; advances the offset"""
+        f.seek(self.offset)
+        data = f.read(self.read_size)
+        end = data.rfind(b'\n') + 1
+        # A single line longer than read_size is read on until it ends
+        while end == 0 and len(data) >= self.read_size:
+            block = f.read(self.read_size)
+            if not block:
+                break
+            end = block.rfind(b'\n') + 1
+            if end:
+                end += len(data)
+            data += block
+        self._more = len(data) >= self.read_size
+        if end == 0:
+            return []
+        self.offset += end
+        return [line.decode('utf-8', errors='replace') for line in data[:end].splitlines()]
+
+    def read_new(self):
+        """Return the complete lines appended since the last call
+
+        A large backlog (after a fresh start, a truncation or a long outage)
+        is returned read_size bytes at a time; wait() returns at once while
+        some of it is left.
+        """
+        self._more = False
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []
+
+        lines = []
+        if self._file is not None and self.inode != st.st_ino:
+            # Rotated: finish the old file (still open) before switching
+            lines.extend(self._read_from(self._file))
+            if self._more:
+                return lines
+            self._file.close()
+            self._file = None
+
+        if self._file is None or self.inode != st.st_ino:
+            st = self._open(st)
+        if st.st_size < self.offset:
+            self.truncations += 1
+            self.offset = 0
+        if st.st_size > self.offset:
+            lines.extend(self._read_from(self._file))
+        return lines
+
+    def wait(self, timeout):
+        """Sleep until the log may have changed or timeout passes"""
+        if self._more:
+            return True
+        if self._inotify is not None:
+            return self._inotify.wait(timeout, {os.path.basename(self.path)})
+
+        # Polling fallback: a stat() per poll_interval
+        deadline = time.monotonic() + timeout
+        try:
+            before = os.stat(self.path)
+            before = (before.st_ino, before.st_size)
+        except OSError:
+            before = None
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))
+            try:
+                st = os.stat(self.path)
+                now = (st.st_ino, st.st_size)
+            except OSError:
+                now = None
+            if now != before:
+                return True
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""SQLite transaction helper shared by the alert service and the metrics store"""
+
+
+def transaction(conn, work, mode=''):
+    """Run work(conn) between BEGIN [mode] and COMMIT and return its result
+
+    conn must be in autocommit mode (isolation_level=None). Callers hold their
+    own lock around this. It also rolls back on KeyboardInterrupt (SIGTERM), so
+    a BEGIN is never left open on a shared database.
+    """
+    conn.execute(f'BEGIN {mode}')
+    try:
+        result = work(conn)
+        conn.execute('COMMIT')
+        return result
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Push alerts to the alert service's ingest API instead of the alert log
+
+push() only queues the alert; a background thread sends whatever queued up
+within `flush_interval` as one batch over a keep-alive connection. If the
+alert service cannot be reached, the batch is handed to `fallback` (the
+dashboard appends it to the alert log, which the service also reads), so
+no alert is lost while it is restarting.
+
+The URL is http(s)://host:port/alerts or unix:/path/to.sock for a unix socket.
+"""
+import http.client
+import json
+import queue
+import ssl
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from docker_api import UnixHTTPConnection
+from keepalive import request_with_retry
+
+_STOP = object()
+
+
+class AlertPusher:
+    def __init__(self, url, token=None, fallback=None, flush_interval=0.1, max_batch=100, timeout=5):
+        self.url = url
+        self.fallback = fallback
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.headers = {'Content-Type': 'application/json'}
+        if token:
+            self.headers['Authorization'] = f"Bearer {token}"
+        if url.startswith('unix:'):
+            self.socket_path, self.path = url[len('unix:'):], '/alerts'
+        else:
+            parts = urlsplit(url)
+            self.socket_path = None
+            self.https = parts.scheme == 'https'
+            self.host, self.port = parts.hostname, parts.port
+            self.path = parts.path or '/alerts'
+        self.pushed = 0
+        self.failed = 0
+        self._conn = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='alert-push', daemon=True)
+        self._thread.start()
+
+    def push(self, alert_type, message, timestamp=None):
+        timestamp = timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._queue.put({'type': alert_type, 'message': message, 'timestamp': timestamp})
+
+    def _connect(self):
+        if self.socket_path:
+            self._conn = UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        elif self.https:
+            self._conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout,
+                                                     context=ssl.create_default_context())
+        else:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self._conn
+
+    def _discard(self, conn):
+        conn.close()
+        self._conn = None
+
+    def _post(self, alerts):
+        body = json.dumps({'alerts': alerts}).encode()
+
+        def post(conn):
+            conn.request('POST', self.path, body=body, headers=self.headers)
+            response = conn.getresponse()
+            response.read()
+            return response
+
+        response = request_with_retry(lambda: self._conn, self._connect, post, self._discard)
+        if response.will_close:
+            self._discard(self._conn)
+        if response.status >= 300:
+            raise RuntimeError(f"ingest API returned HTTP {response.status}")
+
+    def _next_batch(self):
+        """Block for the first alert, then collect more for up to flush_interval"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while batch[-1] is not _STOP and len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            stop = batch[-1] is _STOP
+            alerts = [alert for alert in batch if alert is not _STOP]
+            if alerts:
+                try:
+                    self._post(alerts)
+                    self.pushed += len(alerts)
+                except Exception as e:
+                    self.failed += len(alerts)
+                    print(f"Error pushing {len(alerts)} alerts to {self.url}: {e}")
+                    if self.fallback:
+                        self.fallback(alerts)
+            if stop:
+                return
+
+    def close(self, timeout=5):
+        """Send what is still queued, then stop the thread"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
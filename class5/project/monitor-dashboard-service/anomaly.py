@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Streaming anomaly detection over collected samples
+
+Every estimator here is updated in O(1) per sample with constant memory, so
+the stage keeps up with 1s sampling across many containers:
+
+- EWMA mean/variance gives the expected level and spread of a metric
+- a P-square quantile sketch tracks a rolling high percentile
+- a one-sided CUSUM over EWMA-standardized residuals detects level shifts
+
+A spike is reported when a sample is both far from the EWMA (z-score) and
+above the rolling quantile; a level shift when the CUSUM crosses its limit.
+"""
+import math
+
+
+class EWMA:
+    """Exponentially weighted mean and variance"""
+
+    def __init__(self, alpha=0.1):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+
+    def update(self, value):
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.var = (1 - self.alpha) * (self.var + diff * increment)
+        self.count += 1
+
+    @property
+    def std(self):
+        return math.sqrt(self.var)
+
+
+class P2Quantile:
+    """P-square streaming quantile estimate (Jain & Chlamtac) using five markers"""
+
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def update(self, value):
+        self.count += 1
+        if self.count <= 5:
+            self.heights.append(value)
+            self.heights.sort()
+            return
+
+        heights = self.heights
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Adjust the three middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - self.positions[i]
+            if (d >= 1 and self.positions[i + 1] - self.positions[i] > 1) or \
+               (d <= -1 and self.positions[i - 1] - self.positions[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = self._linear(i, step)
+                heights[i] = candidate
+                self.positions[i] += step
+
+    def _parabolic(self, i, d):
+        n, q = self.positions, self.heights
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, d):
+        n, q = self.positions, self.heights
+        return q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+
+    def value(self):
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            index = min(len(self.heights) - 1, int(round(self.p * (len(self.heights) - 1))))
+            return self.heights[index]
+        return self.heights[2]
+
+
+class RollingQuantile:
+    """P-square estimate that follows recent data by alternating two sketches
+
+    A fresh sketch is started every `window` samples; the estimate comes from
+    the older one until the new one has seen half a window.
+    """
+
+    def __init__(self, p, window=300):
+        self.p = p
+        self.window = window
+        self._current = P2Quantile(p)
+        self._previous = None
+
+    def update(self, value):
+        self._current.update(value)
+        if self._current.count >= self.window:
+            self._previous = self._current
+            self._current = P2Quantile(self.p)
+
+    def value(self):
+        if self._previous is not None and self._current.count < self.window // 2:
+            return self._previous.value()
+        return self._current.value()
+
+
+class CUSUM:
+    """One-sided CUSUM detecting upward shifts in standardized values"""
+
+    def __init__(self, drift=0.5, threshold=8.0):
+        self.drift = drift
+        self.threshold = threshold
+        self.sum = 0.0
+
+    def update(self, z):
+        """Return True when an upward level shift is detected"""
+        self.sum = max(0.0, self.sum + z - self.drift)
+        if self.sum > self.threshold:
+            self.sum = 0.0
+            return True
+        return False
+
+
+class MetricDetector:
+    """Detectors for one metric of one container"""
+
+    def __init__(self, label, unit, min_std, z_threshold=4.0, warmup=30,
+                 alpha=0.1, quantile=0.99, cooldown=10):
+        self.label = label
+        self.unit = unit
+        self.min_std = min_std
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        # After a level shift the EWMA needs ~3/alpha samples to catch up
+        self.cooldowns = {'spike': cooldown, 'shift': max(cooldown, int(3 / alpha))}
+        self.ewma = EWMA(alpha)
+        self.quantile = RollingQuantile(quantile)
+        self.cusum = CUSUM()
+        self._quiet = {'spike': 0, 'shift': 0}
+
+    def update(self, value):
+        """Feed one sample; return a list of (alert_type, message) tuples"""
+        alerts = []
+        if self.ewma.count >= self.warmup:
+            mean = self.ewma.mean
+            std = max(self.ewma.std, self.min_std)
+            z = (value - mean) / std
+            high = self.quantile.value()
+
+            if z >= self.z_threshold and high is not None and value > high:
+                alerts.append(self._alert('spike', f"{self.label} Anomaly",
+                    f"{self.label} {value:.1f}{self.unit} is {z:.1f} std above "
+                    f"average {mean:.1f}{self.unit} (p99 {high:.1f}{self.unit})"))
+            if self.cusum.update(z):
+                alerts.append(self._alert('shift', f"{self.label} Level Shift",
+                    f"{self.label} shifted up to {value:.1f}{self.unit} "
+                    f"from average {mean:.1f}{self.unit}"))
+
+        self.ewma.update(value)
+        self.quantile.update(value)
+        for kind in self._quiet:
+            self._quiet[kind] = max(0, self._quiet[kind] - 1)
+        return [alert for alert in alerts if alert]
+
+    def _alert(self, kind, alert_type, message):
+        # Suppress repeats of the same kind during its cooldown
+        if self._quiet[kind]:
+            return None
+        self._quiet[kind] = self.cooldowns[kind] + 1
+        return alert_type, message
+
+
+# Metric name -> (label, unit, minimum std used for z-scores)
+METRICS = {
+    'cpu': ('CPU', '%', 1.0),
+    'memory_percent': ('Memory', '%', 0.5),
+    'response_time': ('Latency', 'ms', 5.0),
+}
+
+
+class AnomalyDetector:
+    """Per-container, per-metric detectors fed from collected stats"""
+
+    def __init__(self, emit, **options):
+        self.emit = emit
+        self.options = options
+        self.detectors = {}
+
+    def observe(self, container, stats):
+        """Feed one stats sample and emit any alerts it triggers"""
+        for metric, (label, unit, min_std) in METRICS.items():
+            value = stats.get(metric)
+            if value is None:
+                continue
+            key = (container, metric)
+            detector = self.detectors.get(key)
+            if detector is None:
+                detector = self.detectors[key] = MetricDetector(label, unit, min_std, **self.options)
+            for alert_type, message in detector.update(float(value)):
+                self.emit(alert_type, f"{message} on {container}")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Static assets served under content-hash file names
+
+dashboard.css is published as dashboard.<hash>.css, so browsers can cache it
+for a year: a changed file gets a new name and the page links to that. Files
+are read, hashed and pre-compressed once at startup.
+"""
+import hashlib
+import mimetypes
+import os
+
+from compression import brotli, compress
+
+CACHE_FOREVER = 'public, max-age=31536000, immutable'
+
+
+class Asset:
+    def __init__(self, name, data):
+        self.name = name
+        self.digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        self.hashed_name = f"{stem}.{self.digest}{ext}"
+        self.mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self.bodies = {None: data, 'gzip': compress(data, 'gzip', level=9)}
+        if brotli is not None:
+            self.bodies['br'] = compress(data, 'br', level=11)
+
+
+class AssetRegistry:
+    """Hashed, pre-compressed copies of the files in a directory"""
+
+    def __init__(self, directory, url_prefix='/static'):
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self.assets = {}
+        self.by_hashed_name = {}
+        self.load()
+
+    def load(self):
+        """(Re)read every file in the directory"""
+        self.assets = {}
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    self.assets[name] = Asset(name, f.read())
+        self.by_hashed_name = {asset.hashed_name: asset for asset in self.assets.values()}
+
+    def url(self, name):
+        """URL of the current version of an asset"""
+        return f"{self.url_prefix}/{self.assets[name].hashed_name}"
+
+    def lookup(self, hashed_name):
+        return self.by_hashed_name.get(hashed_name)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Compare CPU cost per sample of collector.py against monitor_container.sh
+
+Runs N samples with each implementation against the same container and
+reports wall time and CPU time (user + system, including child processes -
+that is where the shell version spends it) per sample.
+
+Usage (inside the monitor container):
+    python3 bench_collector.py --samples 50
+"""
+import argparse
+import os
+import re
+import resource
+import subprocess
+import tempfile
+import time
+
+import collector
+
+
+def cpu_seconds():
+    """User + system CPU time of this process and its reaped children"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def scratch_script(script, scratch):
+    """Copy of monitor_container.sh whose hardcoded /var/log paths point into scratch
+
+    Otherwise every shell sample appends to the live metrics CSV and alert
+    log, which the alert service tails and would send notifications for.
+    """
+    with open(script) as f:
+        text = f.read()
+    for name, filename in (('LOG_FILE', 'monitor.log'), ('ALERT_LOG', 'alerts.log'),
+                           ('METRICS_FILE', 'metrics.csv')):
+        text, found = re.subn(rf'^{name}=.*$', f'{name}="{os.path.join(scratch, "shell-" + filename)}"',
+                              text, count=1, flags=re.MULTILINE)
+        if not found:
+            raise SystemExit(f"{script}: no {name}= line to redirect; refusing to write to the real logs")
+    path = os.path.join(scratch, 'monitor_container.sh')
+    with open(path, 'w') as f:
+        f.write(text)
+    return path
+
+
+def measure(label, samples, take_sample):
+    take_sample()  # warm up connections and caches
+    cpu_start = cpu_seconds()
+    wall_start = time.perf_counter()
+    for _ in range(samples):
+        take_sample()
+    wall = (time.perf_counter() - wall_start) / samples
+    cpu = (cpu_seconds() - cpu_start) / samples
+    print(f"{label:<22} wall {wall * 1000:8.1f} ms/sample   cpu {cpu * 1000:8.1f} ms/sample")
+    return cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--script', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                         'monitor_container.sh'))
+    args = parser.parse_args()
+
+    # Keep the benchmark's output away from the real log files
+    scratch = tempfile.mkdtemp(prefix='collector-bench-')
+    env = dict(os.environ, HOME=scratch)
+    collector.LOG_FILE = os.path.join(scratch, 'monitor.log')
+    collector.ALERT_LOG = os.path.join(scratch, 'alerts.log')
+    collector.METRICS_FILE = os.path.join(scratch, 'metrics.csv')
+
+    python_collector = collector.Collector(echo=False)
+    python_collector.initialize_logs()
+    python_cpu = measure('collector.py', args.samples, python_collector.collect)
+
+    script = scratch_script(args.script, scratch)
+
+    def shell_sample():
+        subprocess.run(['bash', script, 'monitor'], env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    shell_cpu = measure('monitor_container.sh', args.samples, shell_sample)
+    if python_cpu > 0:
+        print(f"\nShell version uses {shell_cpu / python_cpu:.1f}x the CPU per sample")
+    print("Logs from both implementations were written to", scratch)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Fan-out of collector updates to Server-Sent Events clients"""
+import json
+import queue
+import threading
+
+# Sent to a client whose queue overflowed; it should refetch a snapshot
+RESYNC_EVENT = 'event: resync\ndata: {}\n\n'
+KEEPALIVE = ': keepalive\n\n'
+
+
+class Subscriber:
+    """One connected client with a bounded queue of pre-encoded events"""
+
+    def __init__(self, max_queue):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def offer(self, message):
+        """Queue a message without blocking the publisher
+
+        A client that cannot keep up has its backlog discarded and is told to
+        resync, so one slow connection never delays the others.
+        """
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self.queue.put_nowait(RESYNC_EVENT)
+
+
+class Broadcaster:
+    """Publish each update once and fan it out to every subscriber"""
+
+    def __init__(self, max_clients=100, max_queue=10):
+        self.max_clients = max_clients
+        self.max_queue = max_queue
+        self.published = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """Register a new client, or return None when at capacity"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            subscriber = Subscriber(self.max_queue)
+            self._subscribers.add(subscriber)
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, payload):
+        """Serialize payload once and queue it for every subscriber"""
+        message = f"data: {json.dumps(payload)}\n\n"
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.offer(message)
+        self.published += 1
+
+    def client_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def stream(self, subscriber, keepalive=15):
+        """Yield SSE messages for a subscriber until the client disconnects"""
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    yield subscriber.queue.get(timeout=keepalive)
+                except queue.Empty:
+                    yield KEEPALIVE
+        finally:
+            self.unsubscribe(subscriber)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Single-flight TTL cache for dashboard API results
+
+Concurrent requests for the same key share one computation: the first caller
+computes, the others wait for its result instead of starting their own. The
+result is then served from the cache until its TTL expires.
+"""
+import threading
+import time
+
+
+class _Flight:
+    """An in-progress computation other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlightCache:
+    """Cache with request coalescing and hit/miss counters
+
+    `ttl` is a number of seconds or a callable returning one, so it can follow
+    a setting that changes at runtime.
+    """
+
+    def __init__(self, ttl, max_entries=256):
+        self._ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}   # key -> (expires_at, value)
+        self._flights = {}   # key -> _Flight
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    @property
+    def ttl(self):
+        return self._ttl() if callable(self._ttl) else self._ttl
+
+    def get(self, key, compute):
+        """Return the cached value for key, computing it at most once when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            flight, leader = self._join(key)
+            if leader:
+                self.misses += 1
+        return self._run(key, flight, compute) if leader else self._wait(flight)
+
+    def refresh(self, key, compute):
+        """Recompute key now and cache the result, joining a computation already in flight"""
+        with self._lock:
+            flight, leader = self._join(key)
+        return self._run(key, flight, compute) if leader else self._wait(flight)
+
+    def _join(self, key):
+        """(flight, leader) - start a flight for key or join the one in progress"""
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            return flight, False
+        flight = self._flights[key] = _Flight()
+        return flight, True
+
+    def _run(self, key, flight, compute):
+        try:
+            flight.value = compute()
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        else:
+            with self._lock:
+                self._store(key, flight.value)
+            return flight.value
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _wait(self, flight):
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _store(self, key, value):
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # Entries are kept in insertion order, so the first one is the oldest
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def peek(self, key):
+        """The cached value for key even if expired, or None; never computes"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+
+    def clear(self):
+        """Drop all cached values (in-flight computations still complete)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+                'hit_ratio': (self.hits + self.coalesced) / lookups if lookups else None,
+                'entries': len(self._entries),
+                'in_flight': len(self._flights),
+                'ttl': self.ttl
+            }
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Container metrics collector - Python port of monitor_container.sh
+
+Produces the same CSV rows, alert lines and log lines as the shell script,
+but from a single process: container state and stats come from the Docker
+Engine API over the unix socket and the health check uses a keep-alive HTTP
+connection, so a sample costs no forks at all.
+
+Usage: python3 collector.py [monitor|continuous|report|live]
+
+Configured with the same environment variables as monitor_container.sh
+(CONTAINER_NAME, CPU_THRESHOLD, MEMORY_THRESHOLD, RESPONSE_TIME_THRESHOLD).
+"""
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from logtail import tail_lines
+from docker_api import DockerClient, DockerAPIError
+from prober import Prober
+
+CONTAINER_NAME = os.getenv('CONTAINER_NAME', 'flask-app')
+LOG_FILE = os.getenv('MONITOR_LOG', '/var/log/container_monitor.log')
+ALERT_LOG = os.getenv('ALERT_LOG', '/var/log/container_alerts.log')
+METRICS_FILE = os.getenv('METRICS_FILE', '/var/log/container_metrics.csv')
+CONTINUOUS_INTERVAL = int(os.getenv('COLLECTOR_INTERVAL', '60'))
+
+CSV_HEADER = 'timestamp,cpu_percent,memory_usage_mb,memory_percent,response_time_ms,status'
+
+
+def read_threshold(name):
+    """Read a numeric threshold; docker-compose may pass it with literal quotes"""
+    value = os.getenv(name, '').strip().strip('"\'')
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def cpu_percent(stats, previous=None):
+    """CPU usage the way `docker stats` computes it, optionally against our previous sample"""
+    cpu = stats.get('cpu_stats', {})
+    pre = previous or stats.get('precpu_stats', {})
+    if not pre.get('system_cpu_usage'):
+        # One-shot stats carry no previous reading to compare against
+        return 0.0
+    cpu_delta = cpu.get('cpu_usage', {}).get('total_usage', 0) - pre.get('cpu_usage', {}).get('total_usage', 0)
+    system_delta = cpu.get('system_cpu_usage', 0) - pre.get('system_cpu_usage', 0)
+    online = cpu.get('online_cpus') or len(cpu.get('cpu_usage', {}).get('percpu_usage') or []) or 1
+    if cpu_delta > 0 and system_delta > 0:
+        return cpu_delta / system_delta * online * 100
+    return 0.0
+
+
+def memory_usage(stats):
+    """(used MiB, limit MiB) excluding page cache, like `docker stats`"""
+    memory = stats.get('memory_stats', {})
+    details = memory.get('stats', {})
+    cache = details.get('inactive_file', details.get('total_inactive_file', 0))
+    used = max(0, memory.get('usage', 0) - cache)
+    return used / 1048576, memory.get('limit', 0) / 1048576
+
+
+class Collector:
+    """One sample = container state + resource stats + health probe"""
+
+    def __init__(self, container=CONTAINER_NAME, probe_urls=None, prober=None, client=None,
+                 write_outputs=True, echo=True, alert_handler=None):
+        self.container = container
+        self.probe_urls = probe_urls or [f"http://{container}:80/health"]
+        self.prober = prober or Prober(timeout=5)
+        self.client = client or DockerClient()
+        self.write_outputs = write_outputs
+        self.echo = echo
+        # Optional alert_handler(alert_type, message) replaces appending to ALERT_LOG
+        self.alert_handler = alert_handler
+        self.cpu_threshold = read_threshold('CPU_THRESHOLD')
+        self.memory_threshold = read_threshold('MEMORY_THRESHOLD')
+        self.response_time_threshold = read_threshold('RESPONSE_TIME_THRESHOLD')
+        self.samples = 0
+        self.errors = 0
+        self.last_duration = 0.0
+        self.last_sample_time = None
+        self.last_sample = None
+        self._previous_cpu = None
+        self._write_lock = threading.Lock()
+
+    # ----- outputs (same formats as monitor_container.sh) -----
+
+    def initialize_logs(self):
+        """Create the log files and the CSV header if needed"""
+        for path in (LOG_FILE, ALERT_LOG, METRICS_FILE):
+            open(path, 'a').close()
+        if os.path.getsize(METRICS_FILE) == 0:
+            with open(METRICS_FILE, 'w') as f:
+                f.write(CSV_HEADER + '\n')
+
+    def _append(self, path, line):
+        with self._write_lock, open(path, 'a') as f:
+            f.write(line + '\n')
+
+    def log_message(self, level, message):
+        line = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {message}"
+        if self.echo:
+            print(line)
+        if self.write_outputs:
+            self._append(LOG_FILE, line)
+
+    def send_alert(self, alert_type, message):
+        line = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ALERT: {alert_type} - {message}"
+        if self.echo:
+            print(line)
+        if self.alert_handler:
+            self.alert_handler(alert_type, message)
+        elif self.write_outputs:
+            self._append(ALERT_LOG, line)
+
+    # ----- collection -----
+
+    def container_state(self):
+        """Return 'running', 'stopped' or 'missing'"""
+        try:
+            state = self.client.inspect(self.container).get('State', {})
+        except DockerAPIError as e:
+            if e.status == 404:
+                return 'missing'
+            raise
+        return 'running' if state.get('Running') else 'stopped'
+
+    def resource_stats(self):
+        """(cpu %, memory used MiB, memory limit MiB, memory %)"""
+        stats = self.client.stats(self.container)
+        cpu = cpu_percent(stats, self._previous_cpu)
+        self._previous_cpu = stats.get('cpu_stats')
+        used, limit = memory_usage(stats)
+        percent = used / limit * 100 if limit > 0 else 0.0
+        return cpu, used, limit, percent
+
+    def collect(self):
+        """Take one sample, write CSV/alert outputs and return it as a dict"""
+        started = time.perf_counter()
+        sample = {
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'status': 'error', 'cpu': 0.0, 'memory_used': 0.0, 'memory_limit': 0.0,
+            'memory_percent': 0.0, 'response_time': 0, 'app_status': 'unhealthy', 'probes': []
+        }
+        try:
+            state = self.container_state()
+            if state == 'missing':
+                self.log_message('ERROR', f"Container {self.container} not found")
+                return sample
+            sample['status'] = state
+            if state != 'running':
+                self.send_alert('Container Down', f"Container {self.container} is not running")
+                return sample
+
+            cpu, used, limit, percent = self.resource_stats()
+            probes = self.prober.probe_all(self.probe_urls)
+            health = probes[0]
+            sample.update({
+                'cpu': cpu, 'memory_used': used, 'memory_limit': limit, 'memory_percent': percent,
+                'response_time': int(round(health['total_ms'])),
+                'app_status': 'healthy' if health['status'] == 200 else 'unhealthy',
+                'probes': probes
+            })
+            self.record(sample)
+            return sample
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.samples += 1
+            self.last_duration = time.perf_counter() - started
+            self.last_sample_time = time.time()
+            self.last_sample = sample
+
+    def pressure(self, sample):
+        """How close a sample came to the alert thresholds (1.0 = at a threshold), None if not running"""
+        if sample['status'] != 'running':
+            return None
+        if sample['app_status'] != 'healthy':
+            return 1.0
+        ratios = [value / threshold for value, threshold in (
+            (sample['cpu'], self.cpu_threshold),
+            (sample['memory_percent'], self.memory_threshold),
+            (sample['response_time'], self.response_time_threshold),
+        ) if threshold]
+        return max(ratios) if ratios else None
+
+    def record(self, sample):
+        """Write the CSV row, log line and threshold alerts for a running sample"""
+        if self.write_outputs:
+            self._append(METRICS_FILE, f"{sample['timestamp']},{sample['cpu']:.2f},{sample['memory_used']:.2f},"
+                                       f"{sample['memory_percent']:.2f},{sample['response_time']},{sample['app_status']}")
+        self.log_message('INFO', f"CPU: {sample['cpu']:.2f}%, Memory: {sample['memory_used']:.2f}MB "
+                                 f"({sample['memory_percent']:.2f}%), Response Time: {sample['response_time']}ms, "
+                                 f"Status: {sample['app_status']}")
+
+        if self.cpu_threshold is not None and sample['cpu'] > self.cpu_threshold:
+            self.send_alert('High CPU', f"CPU usage is {sample['cpu']:.2f}% (threshold: {self.cpu_threshold:g}%)")
+        if self.memory_threshold is not None and sample['memory_percent'] > self.memory_threshold:
+            self.send_alert('High Memory', f"Memory usage is {sample['memory_percent']:.2f}% "
+                                           f"(threshold: {self.memory_threshold:g}%)")
+        if self.response_time_threshold is not None and sample['response_time'] > self.response_time_threshold:
+            self.send_alert('Slow Response', f"Response time is {sample['response_time']}ms "
+                                             f"(threshold: {self.response_time_threshold:g}ms)")
+        if sample['app_status'] != 'healthy':
+            self.send_alert('Application Unhealthy', 'Application health check failed')
+
+
+def generate_report():
+    """Summary report like `monitor_container.sh report`"""
+    report_file = f"/var/log/container_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    totals = [0.0, 0.0, 0.0]
+    count = 0
+    if os.path.exists(METRICS_FILE):
+        with open(METRICS_FILE) as f:
+            next(f, None)
+            for line in f:
+                fields = line.rstrip('\n').split(',')
+                if len(fields) < 6:
+                    continue
+                try:
+                    totals[0] += float(fields[1])
+                    totals[1] += float(fields[3])
+                    totals[2] += float(fields[4])
+                    count += 1
+                except ValueError:
+                    continue
+    averages = [total / count if count else 0 for total in totals]
+
+    recent = tail_lines(ALERT_LOG, 10) if os.path.exists(ALERT_LOG) else []
+    with open(report_file, 'w') as f:
+        f.write("Container Monitoring Report\n==========================\n")
+        f.write(f"Generated: {datetime.now()}\nContainer: {CONTAINER_NAME}\n\n")
+        f.write("Summary Statistics:\n-------------------\n")
+        f.write(f"Average CPU Usage: {averages[0]:.2f}%\n")
+        f.write(f"Average Memory Usage: {averages[1]:.2f}%\n")
+        f.write(f"Average Response Time: {averages[2]:.0f}ms\n\n")
+        f.write("Recent Alerts:\n--------------\n")
+        f.write('\n'.join(recent) + '\n' if recent else "No recent alerts\n")
+    print(report_file)
+    return report_file
+
+
+def live(collector, interval=2):
+    """Refreshing text view, like `monitor_container.sh live`"""
+    while True:
+        sample = collector.collect()
+        print('\033[H\033[2J', end='')
+        print(f"Container Live Monitor - {sample['timestamp']}\n")
+        if sample['status'] != 'running':
+            print("🔴 Container Status: STOPPED\n\nWaiting for container to start...")
+        else:
+            print("🟢 Container Status: RUNNING\n")
+            print(f"CPU Usage:       {sample['cpu']:5.1f}%")
+            print(f"Memory Usage:    {sample['memory_percent']:5.1f}% ({sample['memory_used']:.2f} MB)")
+            print(f"Response Time:   {sample['response_time']} ms")
+            print(f"App Health:      {sample['app_status'].upper()}")
+            print(f"\nSample took {collector.last_duration * 1000:.1f} ms")
+        print("\nPress Ctrl+C to exit")
+        time.sleep(interval)
+
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'monitor'
+    if mode == 'report':
+        generate_report()
+        return
+
+    collector = Collector()
+    collector.initialize_logs()
+    if mode == 'monitor':
+        collector.collect()
+    elif mode == 'continuous':
+        collector.log_message('INFO', 'Starting continuous monitoring (Ctrl+C to stop)')
+        while True:
+            started = time.time()
+            try:
+                collector.collect()
+            except Exception as e:
+                collector.log_message('ERROR', f"Collection failed: {e}")
+            time.sleep(max(0, CONTINUOUS_INTERVAL - (time.time() - started)))
+    elif mode == 'live':
+        try:
+            live(collector)
+        except KeyboardInterrupt:
+            print("\n\nExiting live monitor...")
+    else:
+        print(f"Usage: {sys.argv[0]} [monitor|report|continuous|live]")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
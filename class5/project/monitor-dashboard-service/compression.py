@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Response compression negotiated from Accept-Encoding
+
+Brotli is used when the `brotli` package is installed and the client accepts
+it, gzip otherwise. Small bodies are sent as-is - below about a kilobyte the
+encoding overhead outweighs the saving.
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/css', 'application/javascript', 'text/plain')
+
+
+def accepted_encodings(header):
+    """Encodings from an Accept-Encoding header, ignoring those with q=0"""
+    accepted = set()
+    for part in (header or '').split(','):
+        name, *params = [field.strip() for field in part.split(';')]
+        quality = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.lower())
+    return accepted
+
+
+def choose_encoding(header):
+    """Best encoding we can produce for this Accept-Encoding header, or None"""
+    accepted = accepted_encodings(header)
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding, level=None):
+    """Compress bytes; level defaults favour speed for per-request use"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=5 if level is None else level)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def compress_response(response, accept_encoding, min_size=MIN_SIZE):
+    """Compress a Flask response in place when it is worth it; returns the response"""
+    response.vary.add('Accept-Encoding')
+    if (response.direct_passthrough or response.is_streamed or response.status_code < 200
+            or response.status_code in (204, 304) or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    compressed = compress(data, encoding)
+    if len(compressed) >= len(data):
+        return response
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    # The encoded body differs byte-for-byte, so a strong ETag no longer applies
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -1,105 +1,183 @@
 #!/usr/bin/env python3
-from flask import Flask, render_template, jsonify, request
-import subprocess
+from flask import Flask, render_template, jsonify, request, Response
+from prometheus_client import CollectorRegistry, make_wsgi_app
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
 import json
 import csv
 import os
+import threading
 import time
-from datetime import datetime, timedelta
+import zlib
+from datetime import datetime
 
-app = Flask(__name__)
+from logtail import cached_tail
+from metrics_store import MetricsStore, format_timestamp
+from downsample import downsample_rows, parse_range
+from broadcast import Broadcaster
+from prober import Prober
+from uptime import UptimeTracker, state_from_status, UP, DOWN, UNKNOWN
+from docker_events import DockerEventListener
+from ringbuffer import MmapRingBuffer
+from anomaly import AnomalyDetector
+from collector import Collector
+from cache import SingleFlightCache
+from assets import AssetRegistry, CACHE_FOREVER
+from compression import choose_encoding, compress_response
+from exporter import MonitorCollector
+from scheduler import AdaptiveScheduler
+from alertpush import AlertPusher
+
+# Static files are served by serve_asset() under content-hash names instead
+app = Flask(__name__, static_folder=None)
 
 # Configuration
 CONTAINER_NAME = os.getenv('CONTAINER_NAME', 'monitored-app')
 METRICS_FILE = '/var/log/container_metrics.csv'
 ALERTS_FILE = '/var/log/container_alerts.log'
+# Push alerts to the alert service's ingest API instead of the alert log, e.g.
+# http://alert-service:8025/alerts (the log is still used if a push fails)
+ALERT_INGEST_URL = os.getenv('ALERT_INGEST_URL')
+ALERT_INGEST_TOKEN = os.getenv('ALERT_INGEST_TOKEN')
+METRICS_DB = os.getenv('METRICS_DB', '/var/log/container_metrics.db')
+UPTIME_LOG = os.getenv('UPTIME_LOG', '/var/log/container_uptime.bin')
+# Availability target and the window shown on the dashboard
+SLO_TARGET = float(os.getenv('SLO_TARGET', '99.9'))
+SLO_WINDOW = os.getenv('SLO_WINDOW', '24h')
+# Uptime/latency series live in memory-mapped ring buffers under SERIES_DIR
+SERIES_DIR = os.getenv('SERIES_DIR', '/var/log')
+SERIES_CAPACITY = int(os.getenv('SERIES_CAPACITY', '100000'))
+# Points returned when no time range is requested
+LATEST_POINTS = 100
+# Streaming anomaly detection on top of the fixed thresholds in monitor_container.sh
+ANOMALY_DETECTION = os.getenv('ANOMALY_DETECTION', 'true').lower() == 'true'
+ANOMALY_Z_THRESHOLD = float(os.getenv('ANOMALY_Z_THRESHOLD', '4'))
+ANOMALY_WARMUP = int(os.getenv('ANOMALY_WARMUP', '30'))
 # Default collection frequency in seconds
+DASHBOARD_DEBUG = os.getenv('DASHBOARD_DEBUG', 'false').lower() == 'true'
+
 DEFAULT_COLLECTION_FREQUENCY = int(os.getenv('COLLECTION_FREQUENCY', '30'))
 collection_frequency = DEFAULT_COLLECTION_FREQUENCY
+# Adaptive sampling: faster near a threshold, slower when idle (see scheduler.py)
+ADAPTIVE_SAMPLING = os.getenv('ADAPTIVE_SAMPLING', 'true').lower() == 'true'
+ADAPTIVE_MIN_INTERVAL = float(os.getenv('ADAPTIVE_MIN_INTERVAL', '2'))
+ADAPTIVE_MAX_INTERVAL = float(os.getenv('ADAPTIVE_MAX_INTERVAL', '120'))
+# Per-container base intervals, e.g. "flask-app=10,db=60"
+CONTAINER_INTERVALS = {name.strip(): int(seconds) for name, _, seconds in
+                       (item.partition('=') for item in os.getenv('CONTAINER_INTERVALS', '').split(',') if '=' in item)}
+# Endpoints probed for response time; the first one drives the Response Time card
+PROBE_URLS = [url.strip() for url in os.getenv('PROBE_URLS', f"http://{CONTAINER_NAME}/health").split(',') if url.strip()]
+PROBE_CONCURRENCY = int(os.getenv('PROBE_CONCURRENCY', '4'))
+# Chart series are downsampled server-side to at most this many points
+DEFAULT_MAX_POINTS = int(os.getenv('DEFAULT_MAX_POINTS', '300'))
+MIN_POINTS = 10
+MAX_POINTS_LIMIT = 2000
+# Deltas longer than this are answered with a full snapshot instead
+MAX_DELTA_POINTS = MAX_POINTS_LIMIT
+
+# Rolling uptime and latency series, kept across restarts in fixed-size ring files
+# Uptime records: (timestamp, uptime value, status code); latency: (timestamp, ms)
+STATUS_CODES = {'running': 0, 'stopped': 1, 'error': 2}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+uptime_data = MmapRingBuffer(os.path.join(SERIES_DIR, 'uptime_series.ring'), '<ddB', SERIES_CAPACITY)
+latency_data = MmapRingBuffer(os.path.join(SERIES_DIR, 'latency_series.ring'), '<dd', SERIES_CAPACITY)
+
+# Collected stats are shared by all requests for one collection interval;
+# concurrent requests on a cold cache wait for a single collection
+stats_cache = SingleFlightCache(ttl=lambda: scheduler.current_interval(CONTAINER_NAME))
+# Chart series responses, keyed by endpoint and query; dropped on every new sample
+series_cache = SingleFlightCache(ttl=lambda: scheduler.current_interval(CONTAINER_NAME))
+
+# Live push to dashboards: the background collector publishes one delta per sample
+broadcaster = Broadcaster(
+    max_clients=int(os.getenv('SSE_MAX_CLIENTS', '100')),
+    max_queue=int(os.getenv('SSE_QUEUE_SIZE', '10'))
+)
+broadcast_cursor = None
+publish_lock = threading.Lock()
+
+# State transitions of the monitored container, persisted across monitor restarts
+uptime_tracker = UptimeTracker(
+    UPTIME_LOG,
+    slo_target=SLO_TARGET,
+    max_gap=max(120, 3 * DEFAULT_COLLECTION_FREQUENCY)
+)
+
+# Keep-alive HTTP prober used instead of spawning curl for each check
+prober = Prober(timeout=5, concurrency=PROBE_CONCURRENCY)
+
+# In-process collector; it also writes the CSV/alert/log outputs monitor_container.sh used to
+collector = Collector(
+    CONTAINER_NAME,
+    probe_urls=PROBE_URLS,
+    prober=prober,
+    write_outputs=os.getenv('COLLECTOR_WRITE_OUTPUTS', 'true').lower() == 'true',
+    alert_handler=lambda alert_type, message: deliver_alert(alert_type, message)
+)
+
+# Prometheus /metrics, built from cached values so a scrape never triggers a collection
+metrics_registry = CollectorRegistry()
+metrics_registry.register(MonitorCollector(
+    CONTAINER_NAME,
+    get_stats=lambda: stats_cache.peek('stats'),
+    collector=collector,
+    prober=prober,
+    probe_urls=PROBE_URLS,
+    interval=lambda: scheduler.current_interval(CONTAINER_NAME),
+    caches={'stats': stats_cache, 'series': series_cache}
+))
+app.wsgi_app = DispatcherMiddleware(app.wsgi_app, {'/metrics': make_wsgi_app(metrics_registry)})
 
-# Store uptime data - initialize with some default values
-uptime_data = []
-latency_data = []
+# Time-series store fed from the CSV written by monitor_container.sh
+metrics_store = None
+
+def get_metrics_store():
+    """Open the metrics store on first use"""
+    global metrics_store
+    if metrics_store is None:
+        metrics_store = MetricsStore(METRICS_DB, CONTAINER_NAME)
+    return metrics_store
 
 def get_container_stats():
     """Get current container statistics"""
+    observed = False
     try:
-        # Get container stats
-        cmd = f"docker stats --no-stream --format '{{{{json .}}}}' {CONTAINER_NAME}"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        # One in-process sample: Docker API over the socket plus a keep-alive health probe
+        sample = collector.collect()
+        status = sample['status']
+        # Docker reported the container's state ('error' = not found), so this is a real up/down
+        uptime_tracker.record(state_from_status(status))
+        observed = True
+        if status == 'error':
+            raise RuntimeError(f"Container {CONTAINER_NAME} not found")
+        
+        # Availability over the SLO window, from recorded state transitions
+        availability = uptime_tracker.stats(parse_range(SLO_WINDOW))['availability']
+        uptime_value = availability if availability is not None else 0
+        
+        # Response time of the health endpoint (0 if the probe failed)
+        probes = sample['probes']
+        response_time = probes[0]['total_ms'] if probes and probes[0]['ok'] else 0
         
-        if result.returncode == 0 and result.stdout:
-            stats = json.loads(result.stdout)
-            
-            # Parse CPU percentage
-            cpu = float(stats.get('CPUPerc', '0%').rstrip('%'))
-            
-            # Parse memory
-            mem_usage = stats.get('MemUsage', '0MiB / 0MiB')
-            mem_parts = mem_usage.split(' / ')
-            
-            # Handle different memory units (MiB, GiB)
-            mem_used = mem_parts[0]
-            mem_limit = mem_parts[1]
-            
-            # Convert to MB for consistent units
-            mem_used_mb = convert_to_mb(mem_used)
-            mem_limit_mb = convert_to_mb(mem_limit)
-            
-            # Calculate memory percentage correctly
-            mem_percent = 0
-            if mem_limit_mb > 0:
-                mem_percent = (mem_used_mb / mem_limit_mb) * 100
-            
-            # Check if container is running
-            status_cmd = f"docker inspect --format='{{{{.State.Status}}}}' {CONTAINER_NAME}"
-            status_result = subprocess.run(status_cmd, shell=True, capture_output=True, text=True)
-            
-            if status_result.returncode == 0 and "running" in status_result.stdout:
-                status = "running"
-                # Get container uptime
-                uptime_cmd = f"docker inspect --format='{{{{.State.StartedAt}}}}' {CONTAINER_NAME}"
-                uptime_result = subprocess.run(uptime_cmd, shell=True, capture_output=True, text=True)
-                
-                if uptime_result.returncode == 0 and uptime_result.stdout:
-                    # Parse the start time
-                    start_time_str = uptime_result.stdout.strip()
-                    try:
-                        start_time = datetime.strptime(start_time_str[:19], '%Y-%m-%dT%H:%M:%S')
-                        # Calculate uptime value based on how long the container has been running
-                        now = datetime.now()
-                        uptime_seconds = (now - start_time).total_seconds()
-                        # If recently started (less than 2 minutes), set lower uptime
-                        if uptime_seconds < 120:
-                            uptime_value = 70  # 70% uptime if recently restarted
-                        else:
-                            uptime_value = 100  # 100% uptime if running for a while
-                    except:
-                        uptime_value = 100  # Default to 100% if parsing fails
-                else:
-                    uptime_value = 90  # Default to 90% if we couldn't get start time
-            else:
-                status = "stopped"
-                uptime_value = 0  # 0% uptime if stopped
-            
-            # Calculate response time
-            response_time = check_app_response_time()
-            
-            # Update uptime and latency data
-            update_uptime_data(uptime_value, status)
-            update_latency_data(response_time)
-            
-            return {
-                'cpu': cpu,
-                'memory_percent': mem_percent,
-                'memory_used': f"{mem_used_mb:.2f}",
-                'memory_limit': f"{mem_limit_mb:.2f}",
-                'status': status,
-                'response_time': response_time
-            }
+        # Update uptime and latency data
+        update_uptime_data(uptime_value, status)
+        update_latency_data(response_time)
+        
+        return {
+            'cpu': sample['cpu'],
+            'memory_percent': sample['memory_percent'],
+            'memory_used': f"{sample['memory_used']:.2f}",
+            'memory_limit': f"{sample['memory_limit']:.2f}",
+            'status': status,
+            'response_time': response_time,
+            'response_time_percentiles': prober.percentiles(PROBE_URLS[0]),
+            'availability': availability
+        }
     except Exception as e:
         print(f"Error getting stats: {e}")
-        # Update uptime data with downtime
+        if not observed:
+            # Docker socket unreachable, timeout or a monitor bug: the container's state
+            # is unknown, which is left out of availability and the error budget
+            uptime_tracker.record(UNKNOWN)
         update_uptime_data(0, "error")  # 0% uptime if error
     
     return {
@@ -111,588 +189,375 @@ def get_container_stats():
         'response_time': 0
     }
 
-def convert_to_mb(mem_str):
-    """Convert memory string to MB regardless of unit (MiB, GiB)"""
-    try:
-        if 'MiB' in mem_str:
-            return float(mem_str.replace('MiB', '').strip())
-        elif 'GiB' in mem_str:
-            return float(mem_str.replace('GiB', '').strip()) * 1024
-        else:
-            # Try to parse as a plain number
-            return float(mem_str.strip())
-    except:
-        return 0
+def get_probe_summary():
+    """Latest timing breakdown and percentiles for each probed endpoint"""
+    summary = {}
+    for url in PROBE_URLS:
+        last = prober.last_results.get(url, {})
+        summary[url] = {
+            'last': {key: last.get(key) for key in
+                     ('status', 'reused', 'dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'total_ms')},
+            'percentiles': prober.percentiles(url)
+        }
+    return summary
 
-def check_app_response_time():
-    """Check application response time in milliseconds"""
+def update_uptime_data(uptime_value, status):
+    """Append an uptime value and status to the uptime ring buffer"""
+    uptime_data.append(time.time(), uptime_value, STATUS_CODES.get(status, STATUS_CODES['error']))
+
+def update_latency_data(latency_value):
+    """Append a latency value to the latency ring buffer"""
+    latency_data.append(time.time(), latency_value)
+
+def uptime_point(seq, record):
+    ts, value, status = record
+    return {'timestamp': format_timestamp(ts), 'value': value, 'status': STATUS_NAMES[status], 'seq': seq}
+
+def latency_point(seq, record):
+    ts, value = record
+    return {'timestamp': format_timestamp(ts), 'value': value, 'seq': seq}
+
+def get_metrics_history(limit=50, range_seconds=None, max_points=None):
+    """Get historical metrics from the metrics store
+
+    Without a range the last `limit` samples are returned. With a range the
+    window is downsampled to at most `max_points` samples.
+    """
     try:
-        # Record start time in milliseconds
-        start_time = time.time() * 1000
-        
-        # Make HTTP request to health endpoint
-        url = f"http://{CONTAINER_NAME}/health"
-        cmd = ["curl", "-s", "-o", "/dev/null", "-w", "%{time_total}", "-m", "5", url]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            # Convert to milliseconds
-            response_time = float(result.stdout) * 1000
-            return response_time
+        store = get_metrics_store()
+        # Pick up rows appended to the CSV since the last call
+        store.sync_csv(METRICS_FILE)
+
+        if range_seconds is None:
+            rows = [{
+                'ts': ts,
+                'cpu_percent': cpu,
+                'memory_used': memory_used,
+                'memory_percent': memory_percent,
+                'response_time': latency,
+                'status': status
+            } for ts, cpu, memory_used, memory_percent, latency, status in store.latest(limit)]
         else:
-            return 0
+            rows = get_history_window(store, range_seconds, max_points or DEFAULT_MAX_POINTS)
+
+        for row in rows:
+            row['timestamp'] = format_timestamp(row.pop('ts'))
+        return rows
     except Exception as e:
-        print(f"Error checking response time: {e}")
-        return 0
+        print(f"Error reading metrics store: {e}")
+    return []
 
-def update_uptime_data(uptime_value, status):
-    """Update uptime data array with timestamp and status"""
-    global uptime_data
-    
-    # Add current uptime value with timestamp
-    timestamp = datetime.now()
-    uptime_data.append({
-        'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-        'value': uptime_value,
+def get_history_window(store, range_seconds, max_points):
+    """Get a downsampled window of history ending now"""
+    end = int(time.time())
+    start = end - range_seconds
+
+    if range_seconds // max_points >= 240:
+        # Long windows: pre-aggregate minute rollups to ~4 buckets per point first.
+        # Each bucket's peak is plotted and min/max picks among them, so spikes survive.
+        bucket = max(1, range_seconds // (max_points * 4 * 60)) * 60
+        rows = [{
+            'ts': ts,
+            'cpu_percent': max_cpu,
+            'memory_used': max_mem_used,
+            'memory_percent': max_mem,
+            'response_time': max_latency,
+            'status': 'healthy' if healthy_ratio >= 1 else 'unhealthy'
+        } for ts, avg_cpu, max_cpu, avg_mem, max_mem, avg_mem_used, max_mem_used, avg_latency, max_latency,
+            healthy_ratio in store.downsample(start, end, bucket)]
+        return downsample_rows(rows, 'ts', ['cpu_percent', 'memory_percent'], max_points, 'minmax')
+
+    rows = [{
+        'ts': ts,
+        'cpu_percent': cpu,
+        'memory_used': memory_used,
+        'memory_percent': memory_percent,
+        'response_time': latency,
         'status': status
-    })
-    
-    # Keep only the last 100 data points
-    if len(uptime_data) > 100:
-        uptime_data = uptime_data[-100:]
+    } for ts, cpu, memory_used, memory_percent, latency, status in store.query(start, end)]
+    return downsample_rows(rows, 'ts', ['cpu_percent', 'memory_percent'], max_points)
 
-def update_latency_data(latency_value):
-    """Update latency data array with timestamp"""
-    global latency_data
-    
-    # Add current latency value with timestamp
-    timestamp = datetime.now()
-    latency_data.append({
-        'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-        'value': latency_value
-    })
-    
-    # Keep only the last 100 data points
-    if len(latency_data) > 100:
-        latency_data = latency_data[-100:]
-
-def get_metrics_history():
-    """Get historical metrics from CSV file"""
-    metrics = []
-    if os.path.exists(METRICS_FILE):
-        try:
-            with open(METRICS_FILE, 'r') as f:
-                reader = csv.reader(f)
-                # Skip header
-                next(reader, None)
-                for row in reader:
-                    if len(row) >= 6:
-                        metrics.append({
-                            'timestamp': row[0],
-                            'cpu_percent': row[1],
-                            'memory_used': row[2],
-                            'memory_percent': row[3],
-                            'response_time': row[4],
-                            'status': row[5]
-                        })
-            # Return last 50 entries
-            return metrics[-50:] if len(metrics) > 50 else metrics
-        except Exception as e:
-            print(f"Error reading metrics file: {e}")
-    return []
+def uptime_plotted(point):
+    """What the uptime chart draws for a point: 1 while running, 0 otherwise"""
+    return 1 if point['status'] == 'running' else 0
+
+def get_series_window(series, to_point, range_seconds, max_points, method, plotted=None):
+    """Read a window of a ring-buffer series and downsample it
+
+    `plotted(point)` is the value the chart draws, which the downsampling
+    has to preserve (the point's 'value' by default).
+    """
+    if range_seconds is None:
+        records = series.last(LATEST_POINTS)
+    else:
+        records = series.since_time(time.time() - range_seconds)
+    rows = [dict(to_point(seq, record), ts=record[0]) for seq, record in records]
+    for row in rows:
+        row['plotted'] = plotted(row) if plotted else row['value']
+    rows = downsample_rows(rows, 'ts', ['plotted'], max_points, method)
+    for row in rows:
+        del row['ts'], row['plotted']
+    return rows
+
+def get_chart_params():
+    """Read the range and max_points query parameters"""
+    range_seconds = parse_range(request.args.get('range'))
+    max_points = request.args.get('max_points', DEFAULT_MAX_POINTS, type=int)
+    max_points = max(MIN_POINTS, min(max_points, MAX_POINTS_LIMIT))
+    return range_seconds, max_points
+
+def get_current_stats():
+    """Get container stats, collecting at most once per collection interval"""
+    return stats_cache.get('stats', get_container_stats)
+
+def get_cache_stats():
+    """Hit/miss counters of the API caches"""
+    return {'stats': stats_cache.stats(), 'series': series_cache.stats()}
+
+def collect_and_publish():
+    """Collect one sample and push the resulting delta to all live dashboards"""
+    global broadcast_cursor
+    with publish_lock:
+        # Joins a collection a request may already have started
+        stats = stats_cache.refresh('stats', get_container_stats)
+        series_cache.clear()
+
+        if anomaly_detector and stats['status'] == 'running':
+            anomaly_detector.observe(CONTAINER_NAME, stats)
+
+        snapshot, cursor = get_snapshot(broadcast_cursor)
+        # Clients apply the delta only if they are at the same base cursor
+        snapshot['base'] = broadcast_cursor
+        # A full snapshot (stale broadcast cursor) is not pushed; it has no range applied
+        if broadcast_cursor is not None and cursor != broadcast_cursor and not snapshot['full']:
+            broadcaster.publish(snapshot)
+        broadcast_cursor = cursor
+
+def collect_container():
+    """Scheduled job: collect and publish, then report how close the sample was to a threshold"""
+    collect_and_publish()
+    return collector.pressure(collector.last_sample) if collector.last_sample else None
+
+# Server-side sampling schedule, reconfigured at runtime through /api/settings
+scheduler = AdaptiveScheduler(
+    DEFAULT_COLLECTION_FREQUENCY,
+    min_interval=ADAPTIVE_MIN_INTERVAL,
+    max_interval=ADAPTIVE_MAX_INTERVAL,
+    adaptive=ADAPTIVE_SAMPLING
+)
+scheduler.add(CONTAINER_NAME, collect_container, CONTAINER_INTERVALS.get(CONTAINER_NAME))
+
+alert_lock = threading.Lock()
+
+def append_alerts(alerts):
+    """Append alerts in the format monitor_container.sh uses and alert_service.py parses"""
+    try:
+        with alert_lock, open(ALERTS_FILE, 'a') as f:
+            for alert in alerts:
+                f.write(f"[{alert['timestamp']}] ALERT: {alert['type']} - {alert['message']}\n")
+    except OSError as e:
+        print(f"Error writing alert: {e}")
+
+alert_pusher = AlertPusher(
+    ALERT_INGEST_URL,
+    token=ALERT_INGEST_TOKEN,
+    fallback=append_alerts
+) if ALERT_INGEST_URL else None
+
+def deliver_alert(alert_type, message):
+    """Send an alert to the ingest API if configured, otherwise to the alert log"""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    if alert_pusher:
+        alert_pusher.push(alert_type, message, timestamp)
+    else:
+        append_alerts([{'timestamp': timestamp, 'type': alert_type, 'message': message}])
+
+def write_alert(alert_type, message):
+    """Log and deliver an alert"""
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ALERT: {alert_type} - {message}")
+    deliver_alert(alert_type, message)
+
+def handle_container_event(event):
+    """React to a Docker event as soon as it arrives"""
+    action = event['action']
+    if action == 'start':
+        uptime_tracker.record(UP, event['time'])
+    elif action == 'die':
+        uptime_tracker.record(DOWN, event['time'])
+        write_alert("Container Down", f"Container {CONTAINER_NAME} exited (exit code {event['exit_code']})")
+    elif action == 'oom':
+        write_alert("Container OOM", f"Container {CONTAINER_NAME} ran out of memory")
+    elif action == 'health_status' and event['health'] == 'unhealthy':
+        write_alert("Application Unhealthy", f"Docker health check reports {CONTAINER_NAME} unhealthy")
+
+    # Push the new state to open dashboards without waiting for the next sample
+    collect_and_publish()
+
+# Anomaly alerts go to the same alert log as the threshold alerts
+anomaly_detector = AnomalyDetector(
+    write_alert,
+    z_threshold=ANOMALY_Z_THRESHOLD,
+    warmup=ANOMALY_WARMUP
+) if ANOMALY_DETECTION else None
+
+def start_collector():
+    """Start the background sampling scheduler"""
+    return scheduler.start()
+
+background_lock = threading.Lock()
+background_started = False
+
+def start_background():
+    """Start sampling and the Docker event listener, once per serving process"""
+    global background_started
+    with background_lock:
+        if background_started:
+            return
+        background_started = True
+    if collector.write_outputs:
+        collector.initialize_logs()
+    start_collector()
+    DockerEventListener(CONTAINER_NAME, handle_container_event).start()
+
+def signature(value):
+    """Short content hash used in snapshot cursors"""
+    return format(zlib.crc32(json.dumps(value, sort_keys=True).encode()), 'x')
+
+def parse_cursor(cursor):
+    """Split a snapshot cursor into (uptime_seq, latency_seq, history_ts, alerts_sig, stats_sig)"""
+    try:
+        uptime_seq, latency_seq, history_ts, alerts_sig, stats_sig = cursor.split('.')
+        return int(uptime_seq), int(latency_seq), int(history_ts), alerts_sig, stats_sig
+    except (AttributeError, ValueError):
+        return None
+
+def delta_available(series, seq):
+    """True if the points after seq are all still in the ring and few enough for a delta"""
+    oldest = series.count - len(series)
+    return oldest <= seq <= series.count and series.count - seq <= MAX_DELTA_POINTS
+
+def get_snapshot(since=None, range_seconds=None, max_points=None):
+    """Build a dashboard snapshot, or only what changed since a previous cursor
+
+    Returns (snapshot, cursor). Sections that did not change are left out of a
+    delta; history/uptime/latency deltas only carry new points.
+    """
+    stats = get_current_stats()
+    alerts = get_recent_alerts()
+    store = get_metrics_store()
+    store.sync_csv(METRICS_FILE)
+
+    previous = parse_cursor(since)
+    if previous is not None:
+        uptime_seq, latency_seq, history_ts, alerts_sig, stats_sig = previous
+        # One past the cap tells a long backlog from one that fits
+        new_rows = store.query(start=history_ts + 1, limit=MAX_DELTA_POINTS + 1)
+        if (len(new_rows) > MAX_DELTA_POINTS or not delta_available(uptime_data, uptime_seq)
+                or not delta_available(latency_data, latency_seq)):
+            # Stale or hand-made cursor: answer with a full, downsampled snapshot
+            previous = None
+    snapshot = {'full': previous is None, 'range_seconds': range_seconds}
+
+    if previous is None:
+        snapshot['stats'] = stats
+        snapshot['alerts'] = alerts
+        snapshot['history'] = get_metrics_history(range_seconds=range_seconds, max_points=max_points)
+        snapshot['uptime'] = get_series_window(uptime_data, uptime_point, range_seconds, max_points, 'minmax',
+                                               uptime_plotted)
+        snapshot['latency'] = get_series_window(latency_data, latency_point, range_seconds, max_points, 'lttb')
+        # Deltas continue from the newest raw sample, not the last downsampled bucket
+        newest = store.latest(1)
+        history_ts = newest[0][0] if newest else 0
+    else:
+        if signature(stats) != stats_sig:
+            snapshot['stats'] = stats
+        if signature(alerts) != alerts_sig:
+            snapshot['alerts'] = alerts
+        snapshot['history'] = [{
+            'timestamp': format_timestamp(ts),
+            'cpu_percent': cpu,
+            'memory_used': memory_used,
+            'memory_percent': memory_percent,
+            'response_time': latency,
+            'status': status
+        } for ts, cpu, memory_used, memory_percent, latency, status in new_rows]
+        if new_rows:
+            history_ts = new_rows[-1][0]
+        snapshot['uptime'] = [uptime_point(seq, record) for seq, record in uptime_data.since(uptime_seq)]
+        snapshot['latency'] = [latency_point(seq, record) for seq, record in latency_data.since(latency_seq)]
+
+    cursor = f"{uptime_data.count}.{latency_data.count}.{history_ts}.{signature(alerts)}.{signature(stats)}"
+    snapshot['cursor'] = cursor
+    return snapshot, cursor
 
 def get_recent_alerts():
     """Get recent alerts"""
-    alerts = []
     if os.path.exists(ALERTS_FILE):
         try:
-            with open(ALERTS_FILE, 'r') as f:
-                lines = f.readlines()
-            # Return last 10 alerts
-            return [line.strip() for line in lines[-10:]]
+            # Return last 10 alerts, only re-reading the file when it changed
+            return cached_tail(ALERTS_FILE, 10)
         except:
             pass
     return []
 
+# CSS/JS for the dashboard page, hashed and pre-compressed at startup
+assets = AssetRegistry(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
+app.jinja_env.globals['asset_url'] = assets.url
+
+@app.before_request
+def ensure_background():
+    """Start collection on the first request when served by a WSGI server instead of __main__"""
+    start_background()
+
+@app.after_request
+def compress(response):
+    """gzip/brotli-encode JSON and HTML responses when the client accepts it"""
+    return compress_response(response, request.headers.get('Accept-Encoding'))
+
 @app.route('/')
 def dashboard():
-    return '''
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Container Monitor Dashboard</title>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
-        body { 
-            font-family: Arial, sans-serif; 
-            margin: 0; 
-            padding: 20px; 
-            background-color: #f5f5f5;
-        }
-        .container { max-width: 1200px; margin: 0 auto; }
-        .header { 
-            background-color: #2c3e50; 
-            color: white; 
-            padding: 20px; 
-            border-radius: 10px; 
-            margin-bottom: 20px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        .metrics { 
-            display: grid; 
-            grid-template-columns: repeat(4, 1fr); 
-            gap: 20px; 
-            margin-bottom: 20px;
-        }
-        @media (max-width: 768px) {
-            .metrics {
-                grid-template-columns: 1fr;
-            }
-        }
-        .metric-card { 
-            background: white; 
-            padding: 20px; 
-            border-radius: 10px; 
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }
-        .metric-value { 
-            font-size: 36px; 
-            font-weight: bold; 
-            margin: 10px 0;
-        }
-        .metric-label { 
-            color: #666; 
-            font-size: 14px;
-        }
-        .gauge { 
-            width: 100%; 
-            height: 20px; 
-            background: #e0e0e0; 
-            border-radius: 10px; 
-            overflow: hidden;
-        }
-        .gauge-fill { 
-            height: 100%; 
-            border-radius: 10px;
-            transition: width 0.5s ease;
-        }
-        .cpu-fill { background: linear-gradient(90deg, #2ecc71, #f39c12, #e74c3c); }
-        .memory-fill { background: linear-gradient(90deg, #3498db, #9b59b6, #e74c3c); }
-        .alerts { 
-            background: white; 
-            padding: 20px; 
-            border-radius: 10px; 
-            margin-bottom: 20px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }
-        .alert-item { 
-            padding: 10px; 
-            margin: 5px 0; 
-            border-left: 4px solid #e74c3c; 
-            background: #fff5f5;
-        }
-        .charts-container {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 20px;
-            margin-bottom: 20px;
-        }
-        .chart-container { 
-            background: white; 
-            padding: 20px; 
-            border-radius: 10px; 
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-            height: 300px;
-        }
-        .status-indicator {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            margin-right: 10px;
-        }
-        .status-running { background-color: #2ecc71; }
-        .status-stopped { background-color: #e74c3c; }
-        .settings-panel {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }
-        .settings-panel label {
-            display: block;
-            margin-bottom: 5px;
-        }
-        .settings-panel input {
-            margin-bottom: 15px;
-            padding: 8px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            width: 100%;
-            max-width: 200px;
-        }
-        .settings-panel button {
-            background: #3498db;
-            color: white;
-            border: none;
-            padding: 8px 15px;
-            border-radius: 4px;
-            cursor: pointer;
-        }
-        .settings-panel button:hover {
-            background: #2980b9;
-        }
-        .chart-title {
-            margin-top: 0;
-            margin-bottom: 15px;
-            font-size: 18px;
-            color: #333;
-        }
-        .hourly-stats-container {
-            background: white; 
-            padding: 20px; 
-            border-radius: 10px; 
-            margin-bottom: 20px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }
-        .hourly-stats-table {
-            width: 100%;
-            border-collapse: collapse;
-        }
-        .hourly-stats-table th, .hourly-stats-table td {
-            padding: 8px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }
-        .hourly-stats-table th {
-            background-color: #f2f2f2;
-        }
-        .uptime-indicator {
-            display: inline-block;
-            width: 100%;
-            height: 20px;
-            background-color: #e74c3c;
-            position: relative;
-        }
-        .uptime-fill {
-            position: absolute;
-            height: 100%;
-            background-color: #2ecc71;
-            left: 0;
-            top: 0;
-        }
-        /* Media query for mobile responsiveness */
-        @media (max-width: 768px) {
-            .charts-container {
-                grid-template-columns: 1fr;
-            }
-            .full-width {
-                grid-column: 1 / -1;
-            }
-        }
-    </style>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div>
-                <h1>Container Monitor Dashboard</h1>
-                <p>Real-time monitoring for ''' + CONTAINER_NAME + '''</p>
-            </div>
-            <div>
-                <button onclick="toggleSettings()">⚙️ Settings</button>
-            </div>
-        </div>
-        
-        <div id="settings-panel" class="settings-panel" style="display: none;">
-            <h3>Dashboard Settings</h3>
-            <label for="collection-frequency">Data Collection Frequency (seconds):</label>
-            <input type="number" id="collection-frequency" value="''' + str(DEFAULT_COLLECTION_FREQUENCY) + '''" min="5" max="300">
-            <button onclick="updateSettings()">Update</button>
-        </div>
-        
-        <div class="metrics">
-            <div class="metric-card">
-                <div class="metric-label">Container Status</div>
-                <div class="metric-value">
-                    <span class="status-indicator" id="status-indicator"></span>
-                    <span id="container-status">Loading...</span>
-                </div>
-            </div>
-            
-            <div class="metric-card">
-                <div class="metric-label">CPU Usage</div>
-                <div class="metric-value" id="cpu-value">0%</div>
-                <div class="gauge">
-                    <div class="gauge-fill cpu-fill" id="cpu-gauge" style="width: 0%"></div>
-                </div>
-            </div>
-            
-            <div class="metric-card">
-                <div class="metric-label">Memory Usage</div>
-                <div class="metric-value" id="memory-value">0%</div>
-                <div class="gauge">
-                    <div class="gauge-fill memory-fill" id="memory-gauge" style="width: 0%"></div>
-                </div>
-                <div class="metric-label" id="memory-details">0 MB / 0 MB</div>
-            </div>
-            
-            <div class="metric-card">
-                <div class="metric-label">Response Time</div>
-                <div class="metric-value" id="response-time">0 ms</div>
-            </div>
-        </div>
-        
-        <!-- Remove the alerts section from here as we're moving it to the 4th quadrant -->
-        
-        <!-- Latency, Uptime, Resource Metrics, and Alerts - 2x2 grid layout -->
-        <div class="charts-container">
-            <div class="chart-container">
-                <h3 class="chart-title">Latency</h3>
-                <canvas id="latency-chart"></canvas>
-            </div>
-            
-            <div class="chart-container">
-                <h3 class="chart-title">Uptime</h3>
-                <canvas id="uptime-chart"></canvas>
-            </div>
-            
-            <div class="chart-container">
-                <h3 class="chart-title">Resource Metrics</h3>
-                <canvas id="metrics-chart"></canvas>
-            </div>
-            
-            <div class="alerts-container">
-                <h3 class="chart-title">Recent Alerts</h3>
-                <div id="alerts-list">No alerts</div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        // Initialize Charts
-        const metricsCtx = document.getElementById('metrics-chart').getContext('2d');
-        const metricsChart = new Chart(metricsCtx, {
-            type: 'line',
-            data: {
-                labels: [],
-                datasets: [{
-                    label: 'CPU %',
-                    data: [],
-                    borderColor: '#3498db',
-                    tension: 0.1
-                }, {
-                    label: 'Memory %',
-                    data: [],
-                    borderColor: '#e74c3c',
-                    tension: 0.1
-                }]
-            },
-            options: {
-                responsive: true,
-                maintainAspectRatio: false,
-                scales: {
-                    y: {
-                        beginAtZero: true,
-                        max: 100
-                    }
-                }
-            }
-        });
-        
-        const uptimeCtx = document.getElementById('uptime-chart').getContext('2d');
-        const uptimeChart = new Chart(uptimeCtx, {
-            type: 'line',
-            data: {
-                labels: [],
-                datasets: [{
-                    label: 'Status (1=Up, 0=Down)',
-                    data: [],
-                    borderColor: '#2ecc71',
-                    backgroundColor: 'rgba(46, 204, 113, 0.1)',
-                    fill: true,
-                    tension: 0.1,
-                    stepped: true
-                }]
-            },
-            options: {
-                responsive: true,
-                maintainAspectRatio: false,
-                scales: {
-                    y: {
-                        beginAtZero: true,
-                        max: 1,
-                        ticks: {
-                            callback: function(value) {
-                                return value === 0 ? 'Down' : value === 1 ? 'Up' : '';
-                            }
-                        }
-                    }
-                }
-            }
-        });
-        
-        const latencyCtx = document.getElementById('latency-chart').getContext('2d');
-        const latencyChart = new Chart(latencyCtx, {
-            type: 'line',
-            data: {
-                labels: [],
-                datasets: [{
-                    label: 'Response Time (ms)',
-                    data: [],
-                    borderColor: '#f39c12',
-                    tension: 0.1
-                }]
-            },
-            options: {
-                responsive: true,
-                maintainAspectRatio: false,
-                scales: {
-                    y: {
-                        beginAtZero: true
-                    }
-                }
-            }
-        });
-        
-        // Show/hide settings panel
-        function toggleSettings() {
-            const panel = document.getElementById('settings-panel');
-            panel.style.display = panel.style.display === 'none' ? 'block' : 'none';
-        }
-        
-        // Update settings
-        function updateSettings() {
-            const frequency = document.getElementById('collection-frequency').value;
-            fetch('/api/settings', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    collection_frequency: frequency
-                }),
-            })
-            .then(response => response.json())
-            .then(data => {
-                alert('Settings updated successfully!');
-                updateInterval = data.collection_frequency * 1000;
-                clearInterval(dashboardInterval);
-                dashboardInterval = setInterval(updateDashboard, updateInterval);
-            });
-        }
-        
-        // Update dashboard
-        function updateDashboard() {
-            fetch('/api/stats')
-                .then(response => response.json())
-                .then(data => {
-                    // Update status
-                    const statusIndicator = document.getElementById('status-indicator');
-                    const statusText = document.getElementById('container-status');
-                    
-                    if (data.status === 'running') {
-                        statusIndicator.className = 'status-indicator status-running';
-                        statusText.textContent = 'Running';
-                    } else {
-                        statusIndicator.className = 'status-indicator status-stopped';
-                        statusText.textContent = 'Stopped';
-                    }
-                    
-                    // Update CPU
-                    document.getElementById('cpu-value').textContent = data.cpu.toFixed(1) + '%';
-                    document.getElementById('cpu-gauge').style.width = Math.min(data.cpu, 100) + '%';
-                    
-                    // Update Memory - ensure percentage is between 0-100%
-                    const memoryPercent = Math.min(Math.max(data.memory_percent, 0), 100);
-                    document.getElementById('memory-value').textContent = memoryPercent.toFixed(1) + '%';
-                    document.getElementById('memory-gauge').style.width = memoryPercent + '%';
-                    document.getElementById('memory-details').textContent = 
-                        `${data.memory_used} MB / ${data.memory_limit} MB`;
-                        
-                    // Update Response Time
-                    document.getElementById('response-time').textContent = 
-                        `${Math.round(data.response_time)} ms`;
-                });
-            
-            // Update alerts in the 4th quadrant
-            fetch('/api/alerts')
-                .then(response => response.json())
-                .then(alerts => {
-                    const alertsList = document.getElementById('alerts-list');
-                    if (alerts.length === 0) {
-                        alertsList.innerHTML = 'No recent alerts';
-                    } else {
-                        alertsList.innerHTML = alerts.map(alert => 
-                            `<div class="alert-item">${alert}</div>`
-                        ).join('');
-                    }
-                });
-            
-            // Update resource metrics chart
-            fetch('/api/history')
-                .then(response => response.json())
-                .then(history => {
-                    const timestamps = history.map(item => 
-                        new Date(item.timestamp).toLocaleTimeString());
-                    const cpuData = history.map(item => parseFloat(item.cpu_percent));
-                    const memoryData = history.map(item => parseFloat(item.memory_percent));
-                    
-                    metricsChart.data.labels = timestamps;
-                    metricsChart.data.datasets[0].data = cpuData;
-                    metricsChart.data.datasets[1].data = memoryData;
-                    metricsChart.update();
-                });
-                
-            // Update uptime chart - with binary up/down status
-            fetch('/api/uptime')
-                .then(response => response.json())
-                .then(uptimeData => {
-                    const timestamps = uptimeData.map(item => 
-                        new Date(item.timestamp).toLocaleTimeString());
-                    
-                    // Convert status to binary (1 for running, 0 for any other status)
-                    const statusData = uptimeData.map(item => 
-                        item.status === 'running' ? 1 : 0);
-                    
-                    uptimeChart.data.labels = timestamps;
-                    uptimeChart.data.datasets[0].data = statusData;
-                    uptimeChart.update();
-                });
-                
-            // Update latency chart
-            fetch('/api/latency')
-                .then(response => response.json())
-                .then(latencyData => {
-                    const timestamps = latencyData.map(item => 
-                        new Date(item.timestamp).toLocaleTimeString());
-                    const values = latencyData.map(item => parseFloat(item.value));
-                    
-                    latencyChart.data.labels = timestamps;
-                    latencyChart.data.datasets[0].data = values;
-                    latencyChart.update();
-                });
-        }
-        
-        // Initial update interval
-        let updateInterval = ''' + str(DEFAULT_COLLECTION_FREQUENCY * 1000) + ''';
-        
-        // Update dashboard initially and set interval
-        updateDashboard();
-        let dashboardInterval = setInterval(updateDashboard, updateInterval);
-    </script>
-</body>
-</html>
-'''
+    response = app.make_response(render_template('dashboard.html', container_name=CONTAINER_NAME,
+                                                 collection_frequency=collection_frequency))
+    # The page is small and names the current asset versions, so always revalidate it
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/static/<name>')
+def serve_asset(name):
+    """Content-hashed static file; the name changes whenever the content does"""
+    asset = assets.lookup(name)
+    if asset is None:
+        return jsonify({'status': 'error', 'message': 'Not found'}), 404
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    response = app.response_class(asset.bodies.get(encoding, asset.bodies[None]), mimetype=asset.mimetype)
+    if encoding in asset.bodies:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Cache-Control'] = CACHE_FOREVER
+    response.vary.add('Accept-Encoding')
+    response.set_etag(asset.digest)
+    return response
+
 
 @app.route('/api/stats')
 def api_stats():
-    return jsonify(get_container_stats())
+    return jsonify(get_current_stats())
+
+@app.route('/api/cache')
+def api_cache():
+    return jsonify(get_cache_stats())
+
+@app.route('/api/slo')
+def api_slo():
+    """Availability, MTBF/MTTR and error budget over ?window= (default SLO_WINDOW)"""
+    try:
+        window = parse_range(request.args.get('window', SLO_WINDOW))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid window value'}), 400
+    return jsonify(uptime_tracker.stats(window))
+
+@app.route('/api/probes')
+def api_probes():
+    return jsonify(get_probe_summary())
 
 @app.route('/api/alerts')
 def api_alerts():
@@ -700,63 +565,106 @@ def api_alerts():
 
 @app.route('/api/history')
 def api_history():
-    return jsonify(get_metrics_history())
+    try:
+        range_seconds, max_points = get_chart_params()
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid range value'}), 400
+    return jsonify(series_cache.get(('history', range_seconds, max_points),
+                                    lambda: get_metrics_history(range_seconds=range_seconds, max_points=max_points)))
 
 @app.route('/api/uptime')
 def api_uptime():
-    return jsonify(uptime_data)
+    try:
+        range_seconds, max_points = get_chart_params()
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid range value'}), 400
+    # Min/max buckets keep every up/down transition visible
+    return jsonify(series_cache.get(('uptime', range_seconds, max_points),
+                                    lambda: get_series_window(uptime_data, uptime_point, range_seconds, max_points,
+                                                              'minmax', uptime_plotted)))
 
 @app.route('/api/latency')
 def api_latency():
-    return jsonify(latency_data)
+    try:
+        range_seconds, max_points = get_chart_params()
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid range value'}), 400
+    return jsonify(series_cache.get(('latency', range_seconds, max_points),
+                                    lambda: get_series_window(latency_data, latency_point, range_seconds, max_points, 'lttb')))
+
+@app.route('/api/snapshot')
+def api_snapshot():
+    """Everything the dashboard needs in one request, as a delta when ?since= is given"""
+    try:
+        range_seconds, max_points = get_chart_params()
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid range value'}), 400
+
+    since = request.args.get('since')
+    snapshot, cursor = get_snapshot(since, range_seconds, max_points)
+    etag = f'"{cursor}"'
+
+    # Nothing changed since the client's cursor
+    if since == cursor or etag in request.headers.get('If-None-Match', ''):
+        response = app.response_class(status=304)
+        response.headers['ETag'] = etag
+        return response
+
+    response = jsonify(snapshot)
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-Sent Events stream of snapshot deltas published by the collector"""
+    subscriber = broadcaster.subscribe()
+    if subscriber is None:
+        # Too many live clients - the page falls back to polling /api/snapshot
+        return jsonify({'status': 'error', 'message': 'Too many stream clients'}), 503
+
+    response = Response(broadcaster.stream(subscriber), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/settings', methods=['GET'])
+def api_get_settings():
+    """Current sampling intervals per container and why they were chosen"""
+    return jsonify(scheduler.state())
 
 @app.route('/api/settings', methods=['POST'])
 def api_settings():
+    """Change the collection frequency (optionally for one container) or toggle adaptive sampling"""
     global collection_frequency
-    data = request.json
+    data = request.json or {}
+    
+    if 'adaptive' in data:
+        scheduler.set_adaptive(bool(data['adaptive']))
+        if 'collection_frequency' not in data:
+            return jsonify({'status': 'success', 'adaptive': scheduler.adaptive})
     
     if 'collection_frequency' in data:
         try:
             new_frequency = int(data['collection_frequency'])
-            if 5 <= new_frequency <= 300:  # Limit between 5 and 300 seconds
-                collection_frequency = new_frequency
-                return jsonify({'status': 'success', 'collection_frequency': collection_frequency})
-            else:
-                return jsonify({'status': 'error', 'message': 'Frequency must be between 5 and 300 seconds'}), 400
-        except:
+        except (TypeError, ValueError):
             return jsonify({'status': 'error', 'message': 'Invalid frequency value'}), 400
+        if not 5 <= new_frequency <= 300:  # Limit between 5 and 300 seconds
+            return jsonify({'status': 'error', 'message': 'Frequency must be between 5 and 300 seconds'}), 400
+        
+        container = data.get('container')
+        if container is None:
+            collection_frequency = new_frequency
+        elif container not in scheduler.schedules:
+            return jsonify({'status': 'error', 'message': f"Unknown container {container}"}), 404
+        # Applied to the running schedule right away
+        scheduler.set_interval(new_frequency, container)
+        return jsonify({'status': 'success', 'collection_frequency': new_frequency, 'container': container})
     
     return jsonify({'status': 'error', 'message': 'Missing required parameters'}), 400
 
 if __name__ == '__main__':
-    # Initialize with varied uptime data to demonstrate proper tracking
-    now = datetime.now()
-    
-    # Initialize with some recent uptime and latency data points
-    for i in range(10):
-        timestamp = (now - timedelta(minutes=10-i)).strftime('%Y-%m-%d %H:%M:%S')
-        # Create more realistic initial data with variations
-        if i < 3:
-            uptime_data.append({
-                'timestamp': timestamp, 
-                'value': 0, 
-                'status': 'stopped'
-            })  # Show downtime at start
-        elif i < 7:
-            uptime_data.append({
-                'timestamp': timestamp, 
-                'value': 70, 
-                'status': 'running'
-            })  # Show restart/partial uptime
-        else:
-            uptime_data.append({
-                'timestamp': timestamp, 
-                'value': 100, 
-                'status': 'running'
-            })  # Show full uptime
-            
-        # Add varied latency data
-        latency_value = 20 + (i * 5) % 30  # Vary between 20-50ms
-        latency_data.append({'timestamp': timestamp, 'value': latency_value})
-    
-    app.run(host='0.0.0.0', port=8001, debug=True)
\ No newline at end of file
+    # With the debug reloader only the child process (WERKZEUG_RUN_MAIN) serves requests
+    if not DASHBOARD_DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background()
+    app.run(host='0.0.0.0', port=8001, debug=DASHBOARD_DEBUG, threaded=True)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Minimal Docker Engine API client over the unix socket (no docker CLI forks)"""
+import http.client
+import json
+import os
+import socket
+import threading
+from urllib.parse import quote
+
+from keepalive import request_with_retry
+
+DOCKER_SOCKET = os.getenv('DOCKER_SOCKET', '/var/run/docker.sock')
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that talks to a unix domain socket"""
+
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class DockerAPIError(Exception):
+    """Non-2xx response from the Docker Engine API"""
+
+    def __init__(self, status, message):
+        super().__init__(f"Docker API error {status}: {message}")
+        self.status = status
+
+
+class DockerClient:
+    """Keeps one keep-alive connection for request/response calls
+
+    The connection is shared by the scheduler thread and request handlers,
+    so calls on it are serialized by a lock.
+    """
+
+    def __init__(self, socket_path=DOCKER_SOCKET, timeout=10):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _request(self, path):
+        with self._lock:
+            return self._request_locked(path)
+
+    def _request_locked(self, path):
+        def get(conn):
+            conn.request('GET', path)
+            response = conn.getresponse()
+            return response.status, response.read()
+
+        return request_with_retry(lambda: self._conn, self._open_conn, get,
+                                  lambda conn: self._close_conn())
+
+    def _open_conn(self):
+        self._conn = UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        return self._conn
+
+    def get_json(self, path):
+        """GET a path and decode the JSON body"""
+        status, body = self._request(path)
+        if status >= 300:
+            raise DockerAPIError(status, body.decode('utf-8', errors='replace').strip())
+        return json.loads(body)
+
+    def inspect(self, container):
+        return self.get_json(f"/containers/{quote(container)}/json")
+
+    def stats(self, container):
+        """One-shot stats sample (same data as `docker stats --no-stream`)
+
+        one-shot skips the daemon's wait for a second CPU reading; CPU % is
+        computed against the previous sample instead.
+        """
+        return self.get_json(f"/containers/{quote(container)}/stats?stream=false&one-shot=true")
+
+    def stream_json(self, path):
+        """Yield JSON objects from a streaming endpoint such as /events
+
+        Uses its own connection without a read timeout; the generator ends when
+        the daemon closes the stream.
+        """
+        conn = UnixHTTPConnection(self.socket_path, timeout=None)
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            if response.status >= 300:
+                raise DockerAPIError(response.status, response.read().decode('utf-8', errors='replace').strip())
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        finally:
+            conn.close()
+
+    def _close_conn(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self):
+        with self._lock:
+            self._close_conn()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Long-lived subscriber to Docker container events
+
+Container start/die/oom/health changes are delivered within milliseconds of
+happening instead of waiting for the next `docker inspect` poll.
+"""
+import json
+import threading
+import time
+from urllib.parse import quote
+
+from docker_api import DockerClient
+
+# Actions passed on to the handler; stop/kill are always followed by die
+WATCHED_ACTIONS = ('start', 'die', 'oom', 'health_status')
+
+
+def normalize_event(event):
+    """Flatten a raw Docker event into the fields the monitor uses"""
+    action = event.get('Action') or event.get('status') or ''
+    health = None
+    if action.startswith('health_status'):
+        # Reported as "health_status: healthy" / "health_status: unhealthy"
+        health = action.split(':', 1)[1].strip() if ':' in action else None
+        action = 'health_status'
+
+    attributes = event.get('Actor', {}).get('Attributes', {})
+    time_nano = event.get('timeNano')
+    return {
+        'action': action,
+        'container': attributes.get('name', event.get('id', '')),
+        'time': time_nano / 1e9 if time_nano else event.get('time', time.time()),
+        'exit_code': attributes.get('exitCode'),
+        'health': health,
+    }
+
+
+class DockerEventListener:
+    """Background thread streaming /events for one container, reconnecting with backoff"""
+
+    def __init__(self, container, on_event, client=None, max_delay=30):
+        self.container = container
+        self.on_event = on_event
+        self.client = client or DockerClient()
+        self.max_delay = max_delay
+        self.connected = False
+        self.events_received = 0
+        self._stopped = threading.Event()
+
+    def _path(self):
+        filters = json.dumps({'type': ['container'], 'container': [self.container]})
+        return f"/events?filters={quote(filters)}"
+
+    def run(self):
+        delay = 1
+        while not self._stopped.is_set():
+            try:
+                self.connected = True
+                for raw in self.client.stream_json(self._path()):
+                    delay = 1
+                    event = normalize_event(raw)
+                    if event['action'] not in WATCHED_ACTIONS:
+                        continue
+                    self.events_received += 1
+                    try:
+                        self.on_event(event)
+                    except Exception as e:
+                        print(f"Error handling docker event {event['action']}: {e}")
+            except Exception as e:
+                print(f"Docker event stream error: {e}")
+            self.connected = False
+            # Reconnect with exponential backoff
+            self._stopped.wait(delay)
+            delay = min(delay * 2, self.max_delay)
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name='docker-events', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stopped.set()
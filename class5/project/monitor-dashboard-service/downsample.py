@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Shape-preserving downsampling for dashboard chart series"""
+import math
+
+
+def few_indices(ys, threshold):
+    """At most threshold indices for budgets too small to bucket: first, last, then the extremes"""
+    length = len(ys)
+    picks = [0, length - 1, ys.index(min(ys)), ys.index(max(ys))]
+    selected = []
+    for index in picks:
+        if len(selected) >= threshold:
+            break
+        if index not in selected:
+            selected.append(index)
+    return sorted(selected)
+
+
+def lttb_indices(xs, ys, threshold):
+    """Pick indices with Largest-Triangle-Three-Buckets
+
+    Keeps the first and last point and, for each bucket in between, the point
+    forming the largest triangle with the previously kept point and the
+    average of the next bucket. Runs in O(len(xs)).
+    """
+    length = len(xs)
+    if threshold >= length:
+        return list(range(length))
+    if threshold < 3:
+        return few_indices(ys, threshold)
+
+    selected = [0]
+    bucket_size = (length - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, length)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        # Pick the point in this bucket with the largest triangle area
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = xs[a], ys[a]
+        max_area = -1
+        max_index = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                max_index = j
+
+        selected.append(max_index)
+        a = max_index
+
+    selected.append(length - 1)
+    return selected
+
+
+def minmax_indices(ys, threshold):
+    """Pick the min and max point of each bucket, keeping first and last
+
+    Suited to step-like series (up/down status) where every transition matters.
+    """
+    length = len(ys)
+    if threshold >= length:
+        return list(range(length))
+    if threshold < 4:
+        return few_indices(ys, threshold)
+
+    buckets = (threshold - 2) // 2
+    bucket_size = (length - 2) / buckets
+    selected = {0, length - 1}
+
+    for i in range(buckets):
+        start = int(i * bucket_size) + 1
+        end = min(int((i + 1) * bucket_size) + 1, length - 1)
+        if start >= end:
+            continue
+        window = ys[start:end]
+        selected.add(start + window.index(min(window)))
+        selected.add(start + window.index(max(window)))
+
+    return sorted(selected)
+
+
+def downsample_rows(rows, x_key, y_keys, max_points, method='lttb'):
+    """Downsample a list of dicts to at most max_points rows
+
+    The budget is split between the y series and the union of the points each
+    series keeps is returned, so every chart line keeps its own shape.
+    """
+    if max_points is None or len(rows) <= max_points:
+        return rows
+
+    xs = [row[x_key] for row in rows]
+    # Each series gets an equal share, so the union stays within max_points
+    per_series = max(1, max_points // max(1, len(y_keys)))
+    keep = set()
+    for key in y_keys:
+        ys = [float(row[key]) for row in rows]
+        if method == 'minmax':
+            keep.update(minmax_indices(ys, per_series))
+        else:
+            keep.update(lttb_indices(xs, ys, per_series))
+
+    return [rows[i] for i in sorted(keep)]
+
+
+def parse_range(value):
+    """Parse a range like '900', '15m', '6h' or '7d' into seconds (None if empty)
+
+    Raises ValueError unless the range is a finite, positive number of seconds.
+    """
+    if value is None or value == '':
+        return None
+    value = str(value).strip().lower()
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+    if value and value[-1] in units:
+        seconds = float(value[:-1]) * units[value[-1]]
+    else:
+        seconds = float(value)
+    if not math.isfinite(seconds) or seconds < 1:
+        raise ValueError(f"range must be a positive number of seconds: {value!r}")
+    return int(seconds)
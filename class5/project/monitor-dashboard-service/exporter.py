@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Prometheus exporter for the monitor
+
+A custom prometheus_client collector that builds every metric from values the
+background collector has already gathered - cached stats, prober histograms
+and collector counters - so a scrape is cheap and never samples the container.
+"""
+import time
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+
+# Probe latency bucket bounds in milliseconds (exported in seconds)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class MonitorCollector:
+    """Exports container, probe and collector self-metrics on each scrape"""
+
+    def __init__(self, container, get_stats, collector, prober, probe_urls, interval, caches=None):
+        self.container = container
+        self.get_stats = get_stats      # returns the cached stats dict or None, never collects
+        self.collector = collector
+        self.prober = prober
+        self.probe_urls = probe_urls
+        self.interval = interval        # callable returning the collection interval in seconds
+        self.caches = caches or {}
+
+    def collect(self):
+        yield from self._container_metrics()
+        yield from self._probe_metrics()
+        yield from self._collector_metrics()
+
+    def _container_metrics(self):
+        labels = ['container']
+        up = GaugeMetricFamily('monitor_container_up', 'Whether the container is running (1) or not (0)', labels=labels)
+        cpu = GaugeMetricFamily('monitor_container_cpu_percent', 'CPU usage in percent of one core', labels=labels)
+        memory_percent = GaugeMetricFamily('monitor_container_memory_percent', 'Memory usage in percent of the limit',
+                                           labels=labels)
+        memory_used = GaugeMetricFamily('monitor_container_memory_usage_bytes', 'Memory usage excluding page cache',
+                                        labels=labels)
+        memory_limit = GaugeMetricFamily('monitor_container_memory_limit_bytes', 'Memory limit', labels=labels)
+        availability = GaugeMetricFamily('monitor_container_availability_ratio',
+                                         'Availability over the SLO window (0-1)', labels=labels)
+
+        stats = self.get_stats()
+        if stats is not None:
+            up.add_metric([self.container], 1 if stats.get('status') == 'running' else 0)
+            if stats.get('status') == 'running':
+                cpu.add_metric([self.container], float(stats.get('cpu') or 0))
+                memory_percent.add_metric([self.container], float(stats.get('memory_percent') or 0))
+                memory_used.add_metric([self.container], float(stats.get('memory_used') or 0) * 1048576)
+                memory_limit.add_metric([self.container], float(stats.get('memory_limit') or 0) * 1048576)
+            if stats.get('availability') is not None:
+                availability.add_metric([self.container], stats['availability'] / 100)
+        return [up, cpu, memory_percent, memory_used, memory_limit, availability]
+
+    def _probe_metrics(self):
+        duration = HistogramMetricFamily('monitor_probe_duration_seconds',
+                                         'Total time of successful health probes', labels=['url'])
+        failures = CounterMetricFamily('monitor_probe_failures', 'Failed health probes', labels=['url'])
+        for url in self.probe_urls:
+            histogram = self.prober.lifetime_histogram(url)
+            counts = histogram.cumulative(LATENCY_BUCKETS_MS)
+            buckets = [(str(bound / 1000), count) for bound, count in zip(LATENCY_BUCKETS_MS, counts)]
+            buckets.append(('+Inf', histogram.total))
+            duration.add_metric([url], buckets, histogram.sum_ms / 1000)
+            failures.add_metric([url], self.prober.failures.get(url, 0))
+        return [duration, failures]
+
+    def _collector_metrics(self):
+        collector = self.collector
+        interval = self.interval()
+        metrics = [
+            CounterMetricFamily('monitor_collector_samples', 'Samples taken by the collector',
+                                value=collector.samples),
+            CounterMetricFamily('monitor_collector_errors', 'Samples that failed', value=collector.errors),
+            GaugeMetricFamily('monitor_collector_sample_duration_seconds', 'Duration of the last sample',
+                              value=collector.last_duration),
+            GaugeMetricFamily('monitor_collector_interval_seconds', 'Configured collection interval',
+                              value=interval),
+        ]
+        if collector.last_sample_time is not None:
+            age = time.time() - collector.last_sample_time
+            metrics.append(GaugeMetricFamily('monitor_collector_last_sample_timestamp_seconds',
+                                             'Unix time of the last sample', value=collector.last_sample_time))
+            # How far the collector is behind its schedule (0 while on time)
+            metrics.append(GaugeMetricFamily('monitor_collector_lag_seconds',
+                                             'Time since the last sample beyond the collection interval',
+                                             value=max(0.0, age - interval)))
+
+        hits = CounterMetricFamily('monitor_cache_hits', 'API cache hits', labels=['cache'])
+        misses = CounterMetricFamily('monitor_cache_misses', 'API cache misses', labels=['cache'])
+        coalesced = CounterMetricFamily('monitor_cache_coalesced', 'Requests that waited on an in-flight computation',
+                                        labels=['cache'])
+        for name, cache in self.caches.items():
+            stats = cache.stats()
+            hits.add_metric([name], stats['hits'])
+            misses.add_metric([name], stats['misses'])
+            coalesced.add_metric([name], stats['coalesced'])
+        return metrics + [hits, misses, coalesced]
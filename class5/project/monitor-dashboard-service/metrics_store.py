@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""SQLite-backed time-series store for container metrics
+
+Samples are kept in a WITHOUT ROWID table clustered on (container, ts), so
+time-range scans read contiguous pages and the latest N samples are an index
+walk from the end. Timestamps are stored as epoch seconds and all metrics as
+numbers, so nothing has to be re-parsed from strings on the way out.
+
+A per-minute rollup table is maintained on append, so downsampling weeks of
+1s samples into minute-aligned buckets touches ~60x fewer rows.
+
+Usage:
+    python3 metrics_store.py import /var/log/container_metrics.csv
+    python3 metrics_store.py query --since 3600
+    python3 metrics_store.py downsample --since 86400 --bucket 300
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from sqlitetx import transaction
+
+METRICS_DB = os.getenv('METRICS_DB', '/var/log/container_metrics.db')
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+ROLLUP_TABLE = """
+CREATE TABLE IF NOT EXISTS rollup_1m (
+    container TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    cpu_sum REAL NOT NULL,
+    cpu_max REAL NOT NULL,
+    memory_sum REAL NOT NULL,
+    memory_max REAL NOT NULL,
+    memory_used_sum REAL NOT NULL,
+    memory_used_max REAL NOT NULL,
+    latency_sum REAL NOT NULL,
+    latency_max REAL NOT NULL,
+    healthy INTEGER NOT NULL,
+    PRIMARY KEY (container, ts)
+) WITHOUT ROWID
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    container TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    cpu REAL NOT NULL,
+    memory_used REAL NOT NULL,
+    memory_percent REAL NOT NULL,
+    latency REAL NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (container, ts)
+) WITHOUT ROWID;
+
+""" + ROLLUP_TABLE + """;
+
+CREATE TABLE IF NOT EXISTS csv_offsets (
+    path TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    offset INTEGER NOT NULL
+);
+"""
+
+COLUMNS = ('ts', 'cpu', 'memory_used', 'memory_percent', 'latency', 'status')
+ROLLUP_SECONDS = 60
+# Bytes read per block when importing new CSV rows
+SYNC_BLOCK_SIZE = 1024 * 1024
+
+# Recompute the rollup rows covering [start, end] from the raw samples
+ROLLUP_SQL = """
+INSERT OR REPLACE INTO rollup_1m
+SELECT container, (ts / 60) * 60, COUNT(*), SUM(cpu), MAX(cpu), SUM(memory_percent),
+       MAX(memory_percent), SUM(memory_used), MAX(memory_used), SUM(latency), MAX(latency),
+       SUM(CASE WHEN status = 'healthy' THEN 1 ELSE 0 END)
+FROM samples WHERE container = ? AND ts >= ? AND ts <= ?
+GROUP BY container, (ts / 60) * 60
+"""
+
+
+def parse_timestamp(value):
+    """Convert a 'YYYY-MM-DD HH:MM:SS' string to epoch seconds"""
+    return int(time.mktime(time.strptime(value, TIMESTAMP_FORMAT)))
+
+
+def format_timestamp(ts):
+    """Convert epoch seconds back to the 'YYYY-MM-DD HH:MM:SS' format"""
+    return datetime.fromtimestamp(ts).strftime(TIMESTAMP_FORMAT)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def row_from_csv(row):
+    """Convert a container_metrics.csv row into a (ts, cpu, mem, mem%, latency, status) tuple"""
+    return (
+        parse_timestamp(row[0]),
+        _to_float(row[1]),
+        _to_float(row[2]),
+        _to_float(row[3]),
+        _to_float(row[4]),
+        row[5].strip(),
+    )
+
+
+def complete_lines(f, consumed, block_size=SYNC_BLOCK_SIZE):
+    """Decoded newline-terminated lines from f, read block_size bytes at a time
+
+    consumed[0] is advanced by the bytes of the lines yielded so far; a
+    trailing partial line is left unread.
+    """
+    pending = b''
+    while True:
+        block = f.read(block_size)
+        if not block:
+            return
+        pending += block
+        end = pending.rfind(b'\n') + 1
+        if end:
+            consumed[0] += end
+            yield from pending[:end].decode('utf-8', errors='replace').splitlines()
+            pending = pending[end:]
+
+
+class MetricsStore:
+    """Append-mostly store of per-container samples with range queries and downsampling"""
+
+    def __init__(self, path=METRICS_DB, container='monitored-app'):
+        self.path = path
+        self.container = container
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._upgrade_rollup()
+
+    def _upgrade_rollup(self):
+        """Rebuild rollup_1m from the samples if it predates the memory_used columns"""
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(rollup_1m)')}
+        if 'memory_used_sum' in columns:
+            return
+
+        def rebuild(conn):
+            conn.execute('DROP TABLE rollup_1m')
+            conn.execute(ROLLUP_TABLE)
+            for (container,) in conn.execute('SELECT DISTINCT container FROM samples').fetchall():
+                conn.execute(ROLLUP_SQL, (container, 0, 2 ** 62))
+
+        transaction(self._conn, rebuild)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def append(self, ts, cpu, memory_used, memory_percent, latency, status, container=None):
+        """Append a single sample"""
+        self.append_many([(ts, cpu, memory_used, memory_percent, latency, status)], container)
+
+    def append_many(self, rows, container=None):
+        """Append (ts, cpu, memory_used, memory_percent, latency, status) tuples in one transaction"""
+        container = container or self.container
+        rows = [tuple(row) for row in rows]
+        if not rows:
+            return
+        first = min(row[0] for row in rows)
+        last = max(row[0] for row in rows)
+        # Refresh the minute buckets touched by this batch
+        first -= first % ROLLUP_SECONDS
+        last += ROLLUP_SECONDS - 1 - last % ROLLUP_SECONDS
+
+        def insert(conn):
+            conn.executemany('INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             ((container,) + row for row in rows))
+            conn.execute(ROLLUP_SQL, (container, int(first), int(last)))
+
+        with self._lock:
+            transaction(self._conn, insert)
+
+    def query(self, start=None, end=None, limit=None, container=None):
+        """Return samples between start and end (epoch seconds), oldest first
+
+        With a limit, the newest `limit` samples of the range are returned.
+        """
+        container = container or self.container
+        start = start if start is not None else 0
+        end = end if end is not None else 2 ** 62
+        sql = ('SELECT ts, cpu, memory_used, memory_percent, latency, status FROM samples '
+               'WHERE container = ? AND ts >= ? AND ts <= ? ORDER BY ts DESC')
+        params = [container, int(start), int(end)]
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        rows.reverse()
+        return rows
+
+    def latest(self, n=50, container=None):
+        """Return the newest n samples, oldest first"""
+        return self.query(limit=n, container=container)
+
+    def downsample(self, start, end, bucket_seconds, container=None):
+        """Aggregate a range into fixed-width buckets
+
+        Returns (bucket_ts, avg_cpu, max_cpu, avg_mem, max_mem, avg_mem_used,
+        max_mem_used, avg_latency, max_latency, healthy_ratio) tuples, one per
+        non-empty bucket.
+        """
+        container = container or self.container
+        bucket_seconds = max(1, int(bucket_seconds))
+        if bucket_seconds % ROLLUP_SECONDS == 0:
+            return self._downsample_rollup(start, end, bucket_seconds, container)
+        sql = ('SELECT (ts / ?) * ? AS bucket, AVG(cpu), MAX(cpu), AVG(memory_percent), '
+               'MAX(memory_percent), AVG(memory_used), MAX(memory_used), AVG(latency), MAX(latency), '
+               "AVG(CASE WHEN status = 'healthy' THEN 1.0 ELSE 0.0 END) "
+               'FROM samples WHERE container = ? AND ts >= ? AND ts <= ? '
+               'GROUP BY bucket ORDER BY bucket')
+        with self._lock:
+            return self._conn.execute(
+                sql, (bucket_seconds, bucket_seconds, container, int(start), int(end))
+            ).fetchall()
+
+    def _downsample_rollup(self, start, end, bucket_seconds, container):
+        """Minute-aligned downsampling from the rollup table
+
+        Range edges are rounded to whole minutes.
+        """
+        sql = ('SELECT (ts / ?) * ? AS bucket, SUM(cpu_sum) / SUM(samples), MAX(cpu_max), '
+               'SUM(memory_sum) / SUM(samples), MAX(memory_max), '
+               'SUM(memory_used_sum) / SUM(samples), MAX(memory_used_max), '
+               'SUM(latency_sum) / SUM(samples), MAX(latency_max), '
+               'CAST(SUM(healthy) AS REAL) / SUM(samples) '
+               'FROM rollup_1m WHERE container = ? AND ts >= ? AND ts <= ? '
+               'GROUP BY bucket ORDER BY bucket')
+        start = int(start) - int(start) % ROLLUP_SECONDS
+        with self._lock:
+            return self._conn.execute(
+                sql, (bucket_seconds, bucket_seconds, container, start, int(end))
+            ).fetchall()
+
+    def count(self, container=None):
+        container = container or self.container
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM samples WHERE container = ?', (container,)
+            ).fetchone()[0]
+
+    def import_csv(self, csv_path, container=None, batch_size=5000):
+        """Import a whole container_metrics.csv file, returning the number of rows read"""
+        with open(csv_path, 'r', newline='') as f:
+            return self._import_rows(f, container, batch_size)
+
+    def sync_csv(self, csv_path, container=None):
+        """Import only rows appended to csv_path since the last sync
+
+        The byte offset and inode are remembered per path, so each call costs
+        O(new rows). A changed inode or a shrunk file restarts from the top.
+        """
+        try:
+            st = os.stat(csv_path)
+        except OSError:
+            return 0
+
+        with self._lock:
+            saved = self._conn.execute(
+                'SELECT inode, offset FROM csv_offsets WHERE path = ?', (csv_path,)
+            ).fetchone()
+        offset = 0
+        if saved and saved[0] == st.st_ino and saved[1] <= st.st_size:
+            offset = saved[1]
+        if offset == st.st_size:
+            return 0
+
+        with open(csv_path, 'rb') as f:
+            f.seek(offset)
+            consumed = [0]
+            imported = self._import_rows(complete_lines(f, consumed), container)
+        # Only complete lines were consumed; a partially written row is picked up next time
+        new_offset = offset + consumed[0]
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO csv_offsets VALUES (?, ?, ?)',
+                (csv_path, st.st_ino, new_offset)
+            )
+        return imported
+
+    def _import_rows(self, lines, container=None, batch_size=5000):
+        batch = []
+        imported = 0
+        for row in csv.reader(lines):
+            if len(row) < 6 or row[0] == 'timestamp':
+                continue
+            try:
+                batch.append(row_from_csv(row))
+            except ValueError:
+                continue
+            if len(batch) >= batch_size:
+                self.append_many(batch, container)
+                imported += len(batch)
+                batch = []
+        if batch:
+            self.append_many(batch, container)
+            imported += len(batch)
+        return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Container metrics store')
+    parser.add_argument('--db', default=METRICS_DB, help='SQLite database path')
+    parser.add_argument('--container', default=os.getenv('CONTAINER_NAME', 'monitored-app'))
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    imp = sub.add_parser('import', help='Import a container_metrics.csv file')
+    imp.add_argument('csv_path')
+
+    query = sub.add_parser('query', help='Print samples from the last N seconds')
+    query.add_argument('--since', type=int, default=3600)
+
+    down = sub.add_parser('downsample', help='Print bucketed aggregates from the last N seconds')
+    down.add_argument('--since', type=int, default=86400)
+    down.add_argument('--bucket', type=int, default=300)
+
+    args = parser.parse_args()
+    store = MetricsStore(args.db, args.container)
+    now = int(time.time())
+
+    if args.command == 'import':
+        started = time.time()
+        count = store.import_csv(args.csv_path)
+        print(f"Imported {count} rows in {time.time() - started:.2f}s ({store.count()} total)")
+    elif args.command == 'query':
+        for row in store.query(now - args.since, now):
+            print(format_timestamp(row[0]), *row[1:])
+    elif args.command == 'downsample':
+        for row in store.downsample(now - args.since, now, args.bucket):
+            print(format_timestamp(row[0]), *(f"{v:.2f}" for v in row[1:]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""In-process HTTP latency prober with keep-alive connections and latency histograms
+
+Replaces spawning curl for every health check. Connections are pooled per
+host, so steady-state probes skip DNS and TCP setup, and every probe records a
+DNS / connect / TLS / time-to-first-byte / total breakdown. Totals go into a
+log-linear (HDR-style) histogram so percentiles are cheap to read.
+"""
+import http.client
+import socket
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from keepalive import request_with_retry
+
+# Errors that mean a pooled keep-alive connection went stale
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of microsecond values with ~1% relative precision
+
+    Values below 2**SUB_BUCKET_BITS get one bucket each; above that each power
+    of two is split into 2**(SUB_BUCKET_BITS - 1) linear sub-buckets, like an
+    HDR histogram with two significant digits.
+    """
+
+    SUB_BUCKET_BITS = 7
+    HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+    def __init__(self):
+        self.counts = []
+        self.total = 0
+        self.max_value = 0
+        self.sum_ms = 0.0
+
+    def _index(self, value):
+        exponent = max(0, value.bit_length() - self.SUB_BUCKET_BITS)
+        return exponent * self.HALF + (value >> exponent)
+
+    def _value_at(self, index):
+        """Midpoint of the value range covered by a bucket"""
+        if index < 2 * self.HALF:
+            return index
+        exponent = index // self.HALF - 1
+        mantissa = index - exponent * self.HALF
+        return ((mantissa << exponent) + ((mantissa + 1) << exponent) - 1) // 2
+
+    def record(self, value_ms):
+        """Record a latency in milliseconds"""
+        value = max(0, int(value_ms * 1000))
+        index = self._index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.total += 1
+        self.max_value = max(self.max_value, value)
+        self.sum_ms += value_ms
+
+    def merge(self, other):
+        """Add the counts of another histogram into this one"""
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.max_value = max(self.max_value, other.max_value)
+        self.sum_ms += other.sum_ms
+
+    def percentile(self, p):
+        """Return the p-th percentile in milliseconds (0 if empty)"""
+        if self.total == 0:
+            return 0
+        target = max(1, int(round(self.total * p / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._value_at(index), self.max_value) / 1000.0
+        return self.max_value / 1000.0
+
+    def cumulative(self, bounds_ms):
+        """Counts of values <= each bound (Prometheus-style buckets, ~1% precision)"""
+        cumulative = [0] * len(bounds_ms)
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            value_ms = self._value_at(index) / 1000.0
+            for i, bound in enumerate(bounds_ms):
+                if value_ms <= bound:
+                    cumulative[i] += count
+        return cumulative
+
+    def summary(self):
+        """Percentiles used by the dashboard"""
+        return {
+            'count': self.total,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max_value / 1000.0
+        }
+
+
+class WindowedHistogram:
+    """Histogram over roughly the last `window` seconds, built from two rotating halves"""
+
+    def __init__(self, window=300):
+        self.window = window
+        self._lock = threading.Lock()
+        self._current = LatencyHistogram()
+        self._previous = LatencyHistogram()
+        self._rotated = time.time()
+
+    def _rotate(self):
+        if time.time() - self._rotated >= self.window / 2:
+            self._previous = self._current
+            self._current = LatencyHistogram()
+            self._rotated = time.time()
+
+    def record(self, value_ms):
+        with self._lock:
+            self._rotate()
+            self._current.record(value_ms)
+
+    def snapshot(self):
+        """Merged histogram of the current and previous half-windows"""
+        with self._lock:
+            self._rotate()
+            merged = LatencyHistogram()
+            merged.merge(self._previous)
+            merged.merge(self._current)
+            return merged
+
+    def summary(self):
+        return self.snapshot().summary()
+
+
+class Prober:
+    """Keep-alive HTTP prober recording timing breakdowns per endpoint"""
+
+    def __init__(self, timeout=5, max_idle_per_host=4, histogram_window=300, concurrency=4):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.histogram_window = histogram_window
+        self.histograms = {}
+        # Never reset, for exporters that expect monotonic counters
+        self.lifetime = {}
+        self.failures = {}
+        self.last_results = {}
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='probe')
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _connect(self, scheme, host, port, timings):
+        """Open a new connection, timing DNS, TCP connect and TLS separately"""
+        started = time.perf_counter()
+        address = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][4]
+        resolved = time.perf_counter()
+        sock = socket.create_connection(address[:2], timeout=self.timeout)
+        connected = time.perf_counter()
+        timings['dns_ms'] = (resolved - started) * 1000
+        timings['connect_ms'] = (connected - resolved) * 1000
+
+        if scheme == 'https':
+            context = ssl.create_default_context()
+            sock = context.wrap_socket(sock, server_hostname=host)
+            timings['tls_ms'] = (time.perf_counter() - connected) * 1000
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        conn.sock = sock
+        return conn
+
+    def probe(self, url):
+        """Probe a URL once and return a result dict with timings in milliseconds"""
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        host = parts.hostname
+        port = parts.port or (443 if scheme == 'https' else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        key = (scheme, host, port)
+
+        result = {'url': url, 'ok': False, 'status': 0, 'reused': False,
+                  'dns_ms': 0.0, 'connect_ms': 0.0, 'tls_ms': 0.0,
+                  'ttfb_ms': 0.0, 'total_ms': 0.0, 'error': None}
+        started = time.perf_counter()
+
+        def acquire():
+            conn = self._acquire(key)
+            result['reused'] = conn is not None
+            return conn
+
+        def connect():
+            result['reused'] = False
+            return self._connect(scheme, host, port, result)
+
+        def get(conn):
+            sent = time.perf_counter()
+            conn.request('GET', path, headers={'Connection': 'keep-alive'})
+            response = conn.getresponse()
+            result['ttfb_ms'] = (time.perf_counter() - sent) * 1000
+            response.read()
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return response
+
+        try:
+            response = request_with_retry(acquire, connect, get, lambda conn: conn.close(),
+                                          retry_on=STALE_CONNECTION_ERRORS)
+            result['status'] = response.status
+            result['ok'] = 200 <= response.status < 400
+        except (OSError, http.client.HTTPException) as e:
+            result['error'] = str(e) or e.__class__.__name__
+
+        result['total_ms'] = (time.perf_counter() - started) * 1000
+        if result['ok']:
+            self._histogram(url).record(result['total_ms'])
+        with self._lock:
+            self.last_results[url] = result
+            if result['ok']:
+                self.lifetime.setdefault(url, LatencyHistogram()).record(result['total_ms'])
+            else:
+                self.failures[url] = self.failures.get(url, 0) + 1
+        return result
+
+    def probe_all(self, urls, repeat=1):
+        """Probe every URL `repeat` times concurrently and return the results"""
+        futures = [self._executor.submit(self.probe, url) for url in urls for _ in range(repeat)]
+        return [future.result() for future in futures]
+
+    def _histogram(self, url):
+        with self._lock:
+            histogram = self.histograms.get(url)
+            if histogram is None:
+                histogram = self.histograms[url] = WindowedHistogram(self.histogram_window)
+            return histogram
+
+    def lifetime_histogram(self, url):
+        """Copy of the all-time histogram of successful probes to url"""
+        with self._lock:
+            histogram = LatencyHistogram()
+            if url in self.lifetime:
+                histogram.merge(self.lifetime[url])
+            return histogram
+
+    def percentiles(self, url):
+        """p50/p95/p99 of successful probes to url over the histogram window"""
+        return self._histogram(url).summary()
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+        self._executor.shutdown(wait=False)
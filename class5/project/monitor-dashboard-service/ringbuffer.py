@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Fixed-capacity ring buffer of fixed-size records in a memory-mapped file
+
+Appends overwrite the oldest record in place - O(1), no reallocation, and no
+Python objects kept per sample. The file is the storage, so the buffer
+survives process restarts. Records are addressed by a 1-based sequence number
+that keeps increasing across wrap-arounds and restarts.
+"""
+import mmap
+import os
+import struct
+import threading
+
+HEADER = struct.Struct('<4sIQQ')  # magic, record size, capacity, total appended
+MAGIC = b'RNG1'
+
+
+class MmapRingBuffer:
+    """Ring of struct records; the first field of every record must be a timestamp"""
+
+    def __init__(self, path, record_format, capacity):
+        self.path = path
+        self.record = struct.Struct(record_format)
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._open()
+
+    def _size(self):
+        return HEADER.size + self.capacity * self.record.size
+
+    def _open(self):
+        existing = self._read_existing()
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, self._size())
+            self._mm = mmap.mmap(fd, self._size())
+        finally:
+            os.close(fd)
+
+        if existing is None:
+            self.count = 0
+            self._write_header()
+        else:
+            self.count = existing[0]
+            if existing[1] is not None:
+                # Re-layout records kept from a buffer with another capacity;
+                # sequence numbers carry on from the old buffer unless that would
+                # count slots no record was kept for (grown capacity, short file)
+                self.count = existing[0] - len(existing[1])
+                if min(existing[0], self.capacity) > len(existing[1]):
+                    self.count = 0
+                self._write_header()
+                for values in existing[1]:
+                    self.append(*values)
+
+    def _read_existing(self):
+        """Return (count, records_to_migrate) for an existing file, or None"""
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, record_size, capacity, count = HEADER.unpack_from(data)
+        if magic != MAGIC or record_size != self.record.size:
+            return None
+        if capacity == self.capacity:
+            # A file cut short (e.g. by a crash) has lost records and is started afresh
+            return (count, None) if len(data) >= self._size() else None
+
+        # Capacity changed: keep the newest records that fit, skipping any that lie
+        # past the end of a truncated file
+        kept = min(count, capacity)
+        records = []
+        for seq in range(count - kept, count):
+            offset = HEADER.size + (seq % capacity) * record_size
+            if offset + record_size <= len(data):
+                records.append(self.record.unpack_from(data, offset))
+        return count, records[-self.capacity:]
+
+    def _write_header(self):
+        HEADER.pack_into(self._mm, 0, MAGIC, self.record.size, self.capacity, self.count)
+
+    def _offset(self, index):
+        return HEADER.size + (index % self.capacity) * self.record.size
+
+    def append(self, *values):
+        """Append a record, overwriting the oldest one when full; returns its sequence number"""
+        with self._lock:
+            self.record.pack_into(self._mm, self._offset(self.count), *values)
+            self.count += 1
+            self._write_header()
+            return self.count
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def _range(self, first_index, end_index):
+        """(seq, record) pairs for 0-based indexes [first_index, end_index)"""
+        return [(index + 1, self.record.unpack_from(self._mm, self._offset(index)))
+                for index in range(first_index, end_index)]
+
+    def last(self, n):
+        """The newest n records as (seq, record) pairs, oldest first"""
+        with self._lock:
+            n = min(n, len(self))
+            return self._range(self.count - n, self.count)
+
+    def since(self, seq):
+        """Records with a sequence number greater than seq"""
+        with self._lock:
+            oldest = self.count - len(self)
+            return self._range(max(seq, oldest), self.count)
+
+    def since_time(self, ts):
+        """Records whose timestamp is >= ts (binary search over the ring)"""
+        with self._lock:
+            lo = self.count - len(self)
+            hi = self.count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.record.unpack_from(self._mm, self._offset(mid))[0] < ts:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return self._range(lo, self.count)
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        with self._lock:
+            self._mm.flush()
+            self._mm.close()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Adaptive per-container sampling scheduler
+
+Each container has a base interval (the configured collection frequency) and
+its own current interval. After every sample the job reports its "pressure" -
+how close the sample came to the alert thresholds, 1.0 being at a threshold:
+
+- pressure >= near: sample at min_interval until it calms down
+- pressure < idle for idle_samples samples in a row: back off, doubling the
+  interval up to max_interval
+- otherwise: sample at the base interval
+
+Interval changes take effect immediately, not after the current sleep.
+"""
+import threading
+import time
+
+
+class Schedule:
+    """Sampling state of one container"""
+
+    def __init__(self, name, job, interval):
+        self.name = name
+        self.job = job
+        self.base_interval = interval
+        self.override = interval is not None
+        self.current = interval
+        self.reason = 'base'
+        self.pressure = None
+        self.quiet_samples = 0
+        self.last_run = None
+        self.next_due = time.monotonic()
+        self.runs = 0
+
+
+class AdaptiveScheduler:
+    """Runs each container's job on its own, adaptively chosen interval"""
+
+    def __init__(self, interval, min_interval=2, max_interval=120, near=0.8, idle=0.3,
+                 idle_samples=5, adaptive=True):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.near = near
+        self.idle = idle
+        self.idle_samples = idle_samples
+        self.adaptive = adaptive
+        self.schedules = {}
+        self._changed = threading.Condition()
+        self._stopped = False
+
+    def add(self, name, job, interval=None):
+        """Schedule job() for a container; job returns the sample's pressure or None"""
+        with self._changed:
+            schedule = self.schedules[name] = Schedule(name, job, interval)
+            if interval is None:
+                schedule.base_interval = schedule.current = self.interval
+            self._changed.notify()
+
+    def set_interval(self, seconds, name=None):
+        """Change the base interval of one container, or the default for all others"""
+        with self._changed:
+            if name is None:
+                self.interval = seconds
+                targets = [s for s in self.schedules.values() if not s.override]
+            else:
+                schedule = self.schedules[name]
+                schedule.override = True
+                targets = [schedule]
+            for schedule in targets:
+                schedule.base_interval = seconds
+                self._reset(schedule)
+            self._changed.notify()
+
+    def set_adaptive(self, enabled):
+        with self._changed:
+            self.adaptive = enabled
+            for schedule in self.schedules.values():
+                self._reset(schedule)
+            self._changed.notify()
+
+    def current_interval(self, name):
+        schedule = self.schedules.get(name)
+        return schedule.current if schedule is not None else self.interval
+
+    def _reset(self, schedule):
+        """Go back to the base interval after a configuration change"""
+        schedule.current, schedule.reason = schedule.base_interval, 'base'
+        schedule.quiet_samples = 0
+        self._reschedule(schedule)
+
+    def _reschedule(self, schedule):
+        start = schedule.last_run if schedule.last_run is not None else time.monotonic()
+        schedule.next_due = start + schedule.current
+
+    def _apply(self, schedule, pressure):
+        """Pick the next interval from the latest pressure and reschedule"""
+        base = schedule.base_interval
+        schedule.pressure = pressure
+        if not self.adaptive or pressure is None:
+            schedule.current, schedule.reason = base, 'base'
+            schedule.quiet_samples = 0
+        elif pressure >= self.near:
+            schedule.current, schedule.reason = min(base, self.min_interval), 'near threshold'
+            schedule.quiet_samples = 0
+        elif pressure < self.idle:
+            schedule.quiet_samples += 1
+            if schedule.quiet_samples >= self.idle_samples:
+                backed_off = schedule.current * 2 if schedule.current >= base else base * 2
+                schedule.current, schedule.reason = max(base, min(backed_off, self.max_interval)), 'idle'
+            else:
+                schedule.current, schedule.reason = base, 'base'
+        else:
+            schedule.current, schedule.reason = base, 'base'
+            schedule.quiet_samples = 0
+        self._reschedule(schedule)
+
+    def run(self):
+        while True:
+            with self._changed:
+                while not self._stopped:
+                    if self.schedules:
+                        schedule = min(self.schedules.values(), key=lambda s: s.next_due)
+                        delay = schedule.next_due - time.monotonic()
+                        if delay <= 0:
+                            break
+                    else:
+                        delay = None
+                    self._changed.wait(delay)
+                if self._stopped:
+                    return
+
+            schedule.last_run = time.monotonic()
+            try:
+                pressure = schedule.job()
+            except Exception as e:
+                print(f"Error collecting {schedule.name}: {e}")
+                pressure = None
+            schedule.runs += 1
+            with self._changed:
+                self._apply(schedule, pressure)
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name='scheduler', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        with self._changed:
+            self._stopped = True
+            self._changed.notify()
+
+    def state(self):
+        """Current interval and the reason for it, per container"""
+        with self._changed:
+            return {
+                'default_interval': self.interval,
+                'adaptive': self.adaptive,
+                'containers': {name: {
+                    'base_interval': s.base_interval,
+                    'interval': s.current,
+                    'reason': s.reason,
+                    'pressure': s.pressure,
+                    'samples': s.runs
+                } for name, s in self.schedules.items()}
+            }
@@ -0,0 +1,300 @@
+// Initialize Charts
+const metricsCtx = document.getElementById('metrics-chart').getContext('2d');
+const metricsChart = new Chart(metricsCtx, {
+    type: 'line',
+    data: {
+        labels: [],
+        datasets: [{
+            label: 'CPU %',
+            data: [],
+            borderColor: '#3498db',
+            tension: 0.1
+        }, {
+            label: 'Memory %',
+            data: [],
+            borderColor: '#e74c3c',
+            tension: 0.1
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: {
+            y: {
+                beginAtZero: true,
+                max: 100
+            }
+        }
+    }
+});
+
+const uptimeCtx = document.getElementById('uptime-chart').getContext('2d');
+const uptimeChart = new Chart(uptimeCtx, {
+    type: 'line',
+    data: {
+        labels: [],
+        datasets: [{
+            label: 'Status (1=Up, 0=Down)',
+            data: [],
+            borderColor: '#2ecc71',
+            backgroundColor: 'rgba(46, 204, 113, 0.1)',
+            fill: true,
+            tension: 0.1,
+            stepped: true
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: {
+            y: {
+                beginAtZero: true,
+                max: 1,
+                ticks: {
+                    callback: function(value) {
+                        return value === 0 ? 'Down' : value === 1 ? 'Up' : '';
+                    }
+                }
+            }
+        }
+    }
+});
+
+const latencyCtx = document.getElementById('latency-chart').getContext('2d');
+const latencyChart = new Chart(latencyCtx, {
+    type: 'line',
+    data: {
+        labels: [],
+        datasets: [{
+            label: 'Response Time (ms)',
+            data: [],
+            borderColor: '#f39c12',
+            tension: 0.1
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: {
+            y: {
+                beginAtZero: true
+            }
+        }
+    }
+});
+
+// Show/hide settings panel
+function toggleSettings() {
+    const panel = document.getElementById('settings-panel');
+    panel.style.display = panel.style.display === 'none' ? 'block' : 'none';
+}
+
+// Update settings
+function updateSettings() {
+    const frequency = document.getElementById('collection-frequency').value;
+    fetch('/api/settings', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            collection_frequency: frequency
+        }),
+    })
+    .then(response => response.json())
+    .then(data => {
+        alert('Settings updated successfully!');
+        updateInterval = data.collection_frequency * 1000;
+        if (dashboardInterval) {
+            stopPolling();
+            startPolling();
+        }
+    });
+}
+
+// Client-side copy of the chart series, kept in sync with /api/snapshot deltas
+const MAX_POINTS = 300;  // points per chart for a selected time window
+let cursor = '';
+let rangeSeconds = null;
+let series = { history: [], uptime: [], latency: [] };
+
+// Keep the latest points (or the selected time window) of a series
+function trimSeries(items, rangeSeconds, latestCount) {
+    if (rangeSeconds) {
+        const cutoff = Date.now() - rangeSeconds * 1000;
+        return items.filter(item => new Date(item.timestamp).getTime() >= cutoff);
+    }
+    return items.slice(-latestCount);
+}
+
+// Start over with a full snapshot (e.g. after changing the time window)
+function resetDashboard() {
+    cursor = '';
+    updateDashboard();
+}
+
+// Update the status cards
+function renderStats(data) {
+    // Update status
+    const statusIndicator = document.getElementById('status-indicator');
+    const statusText = document.getElementById('container-status');
+
+    if (data.status === 'running') {
+        statusIndicator.className = 'status-indicator status-running';
+        statusText.textContent = 'Running';
+    } else {
+        statusIndicator.className = 'status-indicator status-stopped';
+        statusText.textContent = 'Stopped';
+    }
+
+    // Update CPU
+    document.getElementById('cpu-value').textContent = data.cpu.toFixed(1) + '%';
+    document.getElementById('cpu-gauge').style.width = Math.min(data.cpu, 100) + '%';
+
+    // Update Memory - ensure percentage is between 0-100%
+    const memoryPercent = Math.min(Math.max(data.memory_percent, 0), 100);
+    document.getElementById('memory-value').textContent = memoryPercent.toFixed(1) + '%';
+    document.getElementById('memory-gauge').style.width = memoryPercent + '%';
+    document.getElementById('memory-details').textContent = 
+        `${data.memory_used} MB / ${data.memory_limit} MB`;
+
+    // Update Response Time
+    document.getElementById('response-time').textContent = 
+        `${Math.round(data.response_time)} ms`;
+    if (data.availability !== undefined && data.availability !== null) {
+        document.getElementById('availability').textContent = 
+            `(${data.availability.toFixed(2)}% availability)`;
+    }
+    if (data.response_time_percentiles) {
+        const p = data.response_time_percentiles;
+        document.getElementById('response-percentiles').textContent = 
+            `p50 ${Math.round(p.p50)} / p95 ${Math.round(p.p95)} / p99 ${Math.round(p.p99)} ms`;
+    }
+}
+
+// Update alerts in the 4th quadrant
+function renderAlerts(alerts) {
+    const alertsList = document.getElementById('alerts-list');
+    if (alerts.length === 0) {
+        alertsList.innerHTML = 'No recent alerts';
+    } else {
+        alertsList.innerHTML = alerts.map(alert => 
+            `<div class="alert-item">${alert}</div>`
+        ).join('');
+    }
+}
+
+// Redraw the three charts from the client-side series
+function renderCharts() {
+    // Update resource metrics chart
+    metricsChart.data.labels = series.history.map(item => 
+        new Date(item.timestamp).toLocaleTimeString());
+    metricsChart.data.datasets[0].data = series.history.map(item => parseFloat(item.cpu_percent));
+    metricsChart.data.datasets[1].data = series.history.map(item => parseFloat(item.memory_percent));
+    metricsChart.update();
+
+    // Update uptime chart - with binary up/down status
+    // (1 for running, 0 for any other status)
+    uptimeChart.data.labels = series.uptime.map(item => 
+        new Date(item.timestamp).toLocaleTimeString());
+    uptimeChart.data.datasets[0].data = series.uptime.map(item => 
+        item.status === 'running' ? 1 : 0);
+    uptimeChart.update();
+
+    // Update latency chart
+    latencyChart.data.labels = series.latency.map(item => 
+        new Date(item.timestamp).toLocaleTimeString());
+    latencyChart.data.datasets[0].data = series.latency.map(item => parseFloat(item.value));
+    latencyChart.update();
+}
+
+// Apply a full snapshot or a delta from /api/snapshot
+function applySnapshot(data) {
+    if (data.stats) renderStats(data.stats);
+    if (data.alerts) renderAlerts(data.alerts);
+
+    if (data.full) {
+        series = { history: data.history, uptime: data.uptime, latency: data.latency };
+        rangeSeconds = data.range_seconds;
+    } else {
+        series.history = trimSeries(series.history.concat(data.history), rangeSeconds, 50);
+        series.uptime = trimSeries(series.uptime.concat(data.uptime), rangeSeconds, 100);
+        series.latency = trimSeries(series.latency.concat(data.latency), rangeSeconds, 100);
+    }
+    renderCharts();
+    cursor = data.cursor;
+
+    // Deltas carry raw points; once a window outgrows its budget, fetch it downsampled again
+    if (rangeSeconds && [series.history, series.uptime, series.latency].some(s => s.length > MAX_POINTS)) {
+        resetDashboard();
+    }
+}
+
+// Update dashboard - one request returning only what changed since our cursor
+function updateDashboard() {
+    const range = document.getElementById('chart-range').value;
+    const params = new URLSearchParams({ since: cursor });
+    if (range) {
+        // The server downsamples the window to max_points
+        params.set('range', range);
+        params.set('max_points', MAX_POINTS);
+    }
+
+    fetch('/api/snapshot?' + params.toString())
+        .then(response => {
+            // 304 - nothing changed since our cursor
+            if (response.status === 304) return null;
+            return response.json();
+        })
+        .then(data => {
+            if (data) applySnapshot(data);
+        });
+}
+
+// Initial update interval
+let updateInterval = document.getElementById('collection-frequency').value * 1000;
+
+// Polling fallback, used only while the live stream is unavailable
+let dashboardInterval = null;
+
+function startPolling() {
+    if (!dashboardInterval) {
+        dashboardInterval = setInterval(updateDashboard, updateInterval);
+    }
+}
+
+function stopPolling() {
+    clearInterval(dashboardInterval);
+    dashboardInterval = null;
+}
+
+// Live updates pushed by the server's collector
+function startLiveUpdates() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+
+    const source = new EventSource('/api/stream');
+    source.onopen = () => {
+        stopPolling();
+        updateDashboard();
+    };
+    source.onmessage = event => {
+        const data = JSON.parse(event.data);
+        // Apply deltas built on our cursor, otherwise catch up with one request
+        if (data.base === cursor) {
+            applySnapshot(data);
+        } else {
+            updateDashboard();
+        }
+    };
+    // Our queue overflowed on the server - refetch what we missed
+    source.addEventListener('resync', () => updateDashboard());
+    // EventSource reconnects on its own; poll in the meantime
+    source.onerror = () => startPolling();
+}
+
+// Update dashboard initially, then follow the live stream
+updateDashboard();
+startLiveUpdates();
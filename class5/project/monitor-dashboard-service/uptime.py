@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Container uptime and SLO accounting from recorded state transitions
+
+Only state changes are stored, as fixed 9-byte records (epoch float + state
+byte) appended to a file, so the log stays tiny and survives monitor restarts.
+A heartbeat file marks the last time the monitor was alive; on startup any gap
+longer than `max_gap` is recorded as UNKNOWN rather than silently counted as
+up or down. Window statistics walk only the transitions inside the window.
+"""
+import bisect
+import os
+import struct
+import threading
+import time
+from array import array
+
+DOWN = 0
+UP = 1
+UNKNOWN = 2
+
+STATE_NAMES = {DOWN: 'down', UP: 'up', UNKNOWN: 'unknown'}
+RECORD = struct.Struct('<dB')
+
+
+def state_from_status(status):
+    """Map a container status string to an uptime state"""
+    return UP if status == 'running' else DOWN
+
+
+class UptimeTracker:
+    """Append-only log of state transitions with availability/MTBF/MTTR queries"""
+
+    def __init__(self, path, slo_target=99.9, max_gap=120):
+        self.path = path
+        self.heartbeat_path = path + '.heartbeat'
+        self.slo_target = slo_target
+        self.max_gap = max_gap
+        self._times = array('d')
+        self._states = bytearray()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Read the transition log and account for time the monitor was not running"""
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            # Drop a partial record left by an interrupted write
+            usable = len(data) - len(data) % RECORD.size
+            if usable != len(data):
+                with open(self.path, 'r+b') as f:
+                    f.truncate(usable)
+            for ts, state in RECORD.iter_unpack(data[:usable]):
+                self._times.append(ts)
+                self._states.append(state)
+
+        if self._states and self._states[-1] != UNKNOWN:
+            try:
+                last_seen = os.path.getmtime(self.heartbeat_path)
+            except OSError:
+                last_seen = self._times[-1]
+            if time.time() - last_seen > self.max_gap:
+                self._append(max(last_seen, self._times[-1]), UNKNOWN)
+
+    def _append(self, ts, state):
+        self._times.append(ts)
+        self._states.append(state)
+        with open(self.path, 'ab') as f:
+            f.write(RECORD.pack(ts, state))
+
+    def record(self, state, ts=None):
+        """Record the observed state; only changes are written to disk"""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            # Transitions stay sorted for bisect; a late report counts from the last one
+            if self._times:
+                ts = max(ts, self._times[-1])
+            if not self._states or self._states[-1] != state:
+                self._append(ts, state)
+            self.heartbeat(ts)
+
+    def heartbeat(self, ts=None):
+        """Mark the monitor as alive so restarts can detect unobserved gaps"""
+        ts = time.time() if ts is None else ts
+        try:
+            with open(self.heartbeat_path, 'a'):
+                pass
+            os.utime(self.heartbeat_path, (ts, ts))
+        except OSError as e:
+            print(f"Warning: Could not update uptime heartbeat: {e}")
+
+    def current_state(self):
+        with self._lock:
+            return self._states[-1] if self._states else UNKNOWN
+
+    def transitions(self, start=None, end=None):
+        """(ts, state name) pairs of the transitions within a window"""
+        with self._lock:
+            lo = 0 if start is None else bisect.bisect_left(self._times, start)
+            hi = len(self._times) if end is None else bisect.bisect_right(self._times, end)
+            return [(self._times[i], STATE_NAMES[self._states[i]]) for i in range(lo, hi)]
+
+    def stats(self, window, now=None):
+        """Availability, MTBF, MTTR and error-budget figures for the last `window` seconds"""
+        now = time.time() if now is None else now
+        start = now - window
+        durations = {DOWN: 0.0, UP: 0.0, UNKNOWN: 0.0}
+        failures = 0
+        recoveries = 0
+
+        with self._lock:
+            # The state in force at the window start comes from the transition before it
+            index = bisect.bisect_right(self._times, start) - 1
+            if index >= 0:
+                state, since = self._states[index], start
+            else:
+                state, since = UNKNOWN, start
+                index = -1
+
+            for i in range(index + 1, len(self._times)):
+                ts, new_state = self._times[i], self._states[i]
+                if ts > now:
+                    break
+                durations[state] += ts - since
+                if state == UP and new_state == DOWN:
+                    failures += 1
+                elif state == DOWN and new_state == UP:
+                    recoveries += 1
+                state, since = new_state, ts
+            durations[state] += now - since
+
+        observed = durations[UP] + durations[DOWN]
+        availability = (durations[UP] / observed * 100) if observed > 0 else None
+        allowed_down = observed * (100 - self.slo_target) / 100
+        return {
+            'window_seconds': window,
+            'slo_target': self.slo_target,
+            'availability': availability,
+            'up_seconds': durations[UP],
+            'down_seconds': durations[DOWN],
+            'unknown_seconds': durations[UNKNOWN],
+            'failures': failures,
+            'mtbf_seconds': durations[UP] / failures if failures else None,
+            'mttr_seconds': durations[DOWN] / recoveries if recoveries else None,
+            'error_budget_seconds': allowed_down,
+            'error_budget_remaining': (1 - durations[DOWN] / allowed_down) * 100 if allowed_down > 0 else None,
+            'burn_rate': (durations[DOWN] / observed) / ((100 - self.slo_target) / 100) if observed > 0 else None,
+        }
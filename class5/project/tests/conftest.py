@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The services import each other's modules and common/ by bare name, as they do
+# when run with PYTHONPATH set in their images
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+for directory in ('common', 'alert-service', 'monitor-dashboard-service'):
+    sys.path.insert(0, os.path.join(ROOT, directory))
@@ -0,0 +1,40 @@
+import pytest
+
+from counters import SlidingCounters, WindowCounter, parse_duration
+
+
+def test_parse_duration():
+    assert parse_duration('90') == 90
+    assert parse_duration('5m') == 300
+    assert parse_duration(' 2h ') == 7200
+    with pytest.raises(ValueError):
+        parse_duration('5 minutes')
+
+
+def test_window_counter_slides():
+    counter = WindowCounter(60, buckets=6)
+    counter.add(now=0)
+    counter.add(2, now=30)
+    assert counter.count(now=59) == 3
+    # The first bucket has slid out, the second is still inside
+    assert counter.count(now=65) == 2
+    assert counter.count(now=200) == 0
+
+
+def test_window_counter_ignores_events_older_than_window():
+    counter = WindowCounter(60, buckets=6)
+    counter.add(now=100)
+    counter.add(now=10)
+    assert counter.count(now=100) == 1
+
+
+def test_sliding_counters_snapshot_and_rate():
+    counters = SlidingCounters(windows=('5m', '1h'))
+    for ts in (0, 100, 3000):
+        counters.add('High CPU', now=ts)
+    assert counters.count('High CPU', '5m', now=3000) == 1
+    assert counters.count('High CPU', '1h', now=3000) == 3
+    assert counters.rate('High CPU', '5m', now=3000) == pytest.approx(0.2)
+    assert counters.count('Unknown', '5m', now=3000) == 0
+    assert counters.snapshot(now=3000) == {'High CPU': {'5m': 1, '1h': 3}}
+    assert counters.snapshot(now=10000) == {}
@@ -0,0 +1,61 @@
+import json
+import os
+import time
+
+from dedup import RECORD, DedupStore
+
+
+def test_lines_expire_after_window(tmp_path):
+    store = DedupStore(str(tmp_path / 'seen'), window=60)
+    now = time.time()
+    store.add('old line', seen_at=now - 120)
+    store.add('new line', seen_at=now)
+    assert 'old line' not in store
+    assert 'new line' in store
+    store.expire()
+    assert len(store) == 1
+
+
+def test_flush_and_reload_skip_expired(tmp_path):
+    path = str(tmp_path / 'seen')
+    store = DedupStore(path, window=60)
+    now = time.time()
+    store.add('a', seen_at=now - 120)
+    store._seen.clear()  # written to disk, but already expired
+    store.add('b', seen_at=now)
+    store.flush()
+
+    reloaded = DedupStore(path, window=60)
+    assert 'b' in reloaded and 'a' not in reloaded
+    assert len(reloaded) == 1
+
+
+def test_partial_record_is_compacted_away(tmp_path):
+    path = str(tmp_path / 'seen')
+    store = DedupStore(path, window=60)
+    store.add('a')
+    store.flush()
+    with open(path, 'ab') as f:
+        f.write(b'\x01\x02\x03')
+    reloaded = DedupStore(path, window=60)
+    assert 'a' in reloaded
+    assert os.path.getsize(path) == RECORD.size
+
+
+def test_compacts_when_mostly_expired(tmp_path):
+    path = str(tmp_path / 'seen')
+    store = DedupStore(path, window=60, min_compact_records=4)
+    old = time.time() - 120
+    for i in range(10):
+        store.add(f'old {i}', seen_at=old)
+    store.add('fresh')
+    store.flush()
+    assert os.path.getsize(path) == RECORD.size
+
+
+def test_import_json(tmp_path):
+    legacy = tmp_path / 'processed_alerts.json'
+    legacy.write_text(json.dumps(['x', 'y']))
+    store = DedupStore(str(tmp_path / 'seen'))
+    assert store.import_json(str(legacy)) == 2
+    assert 'x' in store and not legacy.exists()
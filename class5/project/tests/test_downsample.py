@@ -0,0 +1,65 @@
+import math
+
+import pytest
+
+from downsample import downsample_rows, lttb_indices, minmax_indices, parse_range
+
+
+def wave(n):
+    xs = list(range(n))
+    return xs, [math.sin(x / 10) * 50 + (100 if x == n // 3 else 0) for x in xs]
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    xs, ys = wave(1000)
+    picked = lttb_indices(xs, ys, 50)
+    assert len(picked) == 50
+    assert picked[0] == 0 and picked[-1] == 999
+    assert picked == sorted(picked)
+    # The spike is the largest triangle in its bucket
+    assert 1000 // 3 in picked
+
+
+def test_minmax_keeps_extremes():
+    ys = [0.0] * 500
+    ys[123], ys[321] = 5.0, -5.0
+    picked = minmax_indices(ys, 20)
+    assert len(picked) <= 20
+    assert {0, 123, 321, 499} <= set(picked)
+
+
+@pytest.mark.parametrize('threshold', [1, 2, 3])
+def test_small_budgets_stay_within_threshold(threshold):
+    xs, ys = wave(200)
+    assert len(lttb_indices(xs, ys, threshold)) <= threshold
+    assert len(minmax_indices(ys, threshold)) <= threshold
+
+
+def test_under_budget_returns_everything():
+    xs, ys = wave(10)
+    assert lttb_indices(xs, ys, 10) == list(range(10))
+    assert minmax_indices(ys, 50) == list(range(10))
+
+
+@pytest.mark.parametrize('max_points', [1, 2, 5, 300])
+def test_downsample_rows_respects_max_points(max_points):
+    rows = [{'ts': i, 'cpu': i % 7, 'memory': i % 13, 'latency': i % 5} for i in range(2000)]
+    for method in ('lttb', 'minmax'):
+        result = downsample_rows(rows, 'ts', ['cpu', 'memory', 'latency'], max_points, method)
+        assert 0 < len(result) <= max_points
+        assert [row['ts'] for row in result] == sorted(row['ts'] for row in result)
+
+
+def test_parse_range_units():
+    assert parse_range(None) is None
+    assert parse_range('') is None
+    assert parse_range('900') == 900
+    assert parse_range('15m') == 900
+    assert parse_range('6H') == 21600
+    assert parse_range('7d') == 604800
+
+
+@pytest.mark.parametrize('value', ['inf', 'nan', '-1', '0', '0.5s', 'infd', 'abc', '5x'])
+def test_parse_range_rejects_bad_values(value):
+    with pytest.raises(ValueError):
+        parse_range(value)
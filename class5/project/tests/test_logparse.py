@@ -0,0 +1,74 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from logparse import (AlertLineParser, CombinedLogParser, alert_timestamp_cache,
+                      apache_timestamp_cache)
+
+
+def test_alert_timestamps_match_strptime():
+    cache = alert_timestamp_cache()
+    for value in ('2024-03-20 10:15:00', '2024-03-20 10:15:59', '2024-03-20 10:16:07'):
+        expected = time.mktime(datetime.strptime(value, '%Y-%m-%d %H:%M:%S').timetuple())
+        assert cache(value) == expected
+    assert len(cache._minutes) == 2
+
+
+def test_apache_timestamps_keep_offset():
+    cache = apache_timestamp_cache()
+    assert cache('08/Jul/2025:10:15:23 +0000') == 1751969723
+    assert cache('08/Jul/2025:12:15:23 +0200') == 1751969723
+
+
+def test_short_timestamps_are_not_sliced():
+    cache = alert_timestamp_cache()
+    cache('2024-03-20 10:15:00')
+    assert cache('2024-03-20 10:15:3') == cache('2024-03-20 10:15:03')
+
+
+@pytest.mark.parametrize('value', ['2024-03-20 10:15:60', '2024-13-20 10:15:30', '2024-03-20 10:15'])
+def test_bad_alert_timestamps_raise(value):
+    with pytest.raises(ValueError):
+        alert_timestamp_cache()(value)
+
+
+def test_alert_parser_counts_reasons():
+    parser = AlertLineParser()
+    good = parser.parse('[2024-03-20 10:15:30] ALERT: High CPU - CPU usage is 85%')
+    assert good['alert_type'] == 'High CPU' and good['message'] == 'CPU usage is 85%'
+    assert parser.parse('hello') is None
+    assert parser.parse('[2024-03-20 10:15:30] ALERT: High CPU') is None
+    assert parser.parse('[2024-03-20 10:15:99] ALERT: High CPU - x') is None
+    stats = parser.stats.snapshot()
+    assert stats['lines'] == 4 and stats['parsed'] == 1
+    assert stats['errors'] == {'not_an_alert': 1, 'missing_message': 1, 'bad_timestamp': 1}
+
+
+def test_combined_parser():
+    parser = CombinedLogParser()
+    entry = parser.parse('192.168.1.100 - - [08/Jul/2025:10:15:23 +0000] "GET /api/users HTTP/1.1" '
+                         '200 - "-" "Mozilla/5.0"')
+    assert entry['method'] == 'GET' and entry['path'] == '/api/users'
+    assert entry['status'] == 200 and entry['bytes'] == 0 and entry['ts'] == 1751969723
+    assert parser.parse('not a log line') is None
+    assert parser.stats.snapshot()['errors'] == {'malformed': 1}
+
+
+def test_stats_are_consistent_across_threads():
+    parser = AlertLineParser()
+    lines = ['[2024-03-20 10:15:30] ALERT: High CPU - x', 'junk'] * 2000
+
+    def work():
+        for line in lines:
+            parser.parse(line)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = parser.stats.snapshot()
+    assert stats['lines'] == 16000
+    assert stats['parsed'] + sum(stats['errors'].values()) == stats['lines']
@@ -0,0 +1,57 @@
+import os
+
+from ringbuffer import HEADER, MmapRingBuffer
+
+FORMAT = '<dd'
+
+
+def fill(path, capacity, n):
+    ring = MmapRingBuffer(path, FORMAT, capacity)
+    for i in range(n):
+        ring.append(float(i), float(i) * 2)
+    return ring
+
+
+def test_wraps_and_keeps_sequence_numbers(tmp_path):
+    ring = fill(str(tmp_path / 'ring'), 10, 25)
+    assert len(ring) == 10
+    assert [seq for seq, _ in ring.last(3)] == [23, 24, 25]
+    assert [record[0] for _, record in ring.since(20)] == [20.0, 21.0, 22.0, 23.0, 24.0]
+    # A cursor older than the ring only gets what is still held
+    assert ring.since(0)[0][0] == 16
+    assert [record[0] for _, record in ring.since_time(22.5)] == [23.0, 24.0]
+
+
+def test_survives_restart(tmp_path):
+    path = str(tmp_path / 'ring')
+    fill(path, 10, 15).close()
+    ring = MmapRingBuffer(path, FORMAT, 10)
+    assert ring.count == 15
+    assert ring.append(15.0, 30.0) == 16
+
+
+def test_shrinking_capacity_keeps_newest(tmp_path):
+    path = str(tmp_path / 'ring')
+    fill(path, 10, 15).close()
+    ring = MmapRingBuffer(path, FORMAT, 4)
+    assert [record[0] for _, record in ring.last(10)] == [11.0, 12.0, 13.0, 14.0]
+    assert ring.count == 15
+
+
+def test_growing_capacity_does_not_count_empty_slots(tmp_path):
+    path = str(tmp_path / 'ring')
+    fill(path, 4, 3).close()
+    ring = MmapRingBuffer(path, FORMAT, 10)
+    assert len(ring) == 3
+    assert [record[0] for _, record in ring.last(10)] == [0.0, 1.0, 2.0]
+
+
+def test_truncated_file_starts_afresh(tmp_path):
+    path = str(tmp_path / 'ring')
+    fill(path, 10, 8).close()
+    with open(path, 'r+b') as f:
+        f.truncate(HEADER.size + 3 * 16)
+    ring = MmapRingBuffer(path, FORMAT, 10)
+    assert len(ring) == 0
+    assert ring.append(1.0, 2.0) == 1
+    assert os.path.getsize(path) == HEADER.size + 10 * 16
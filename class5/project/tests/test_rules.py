@@ -0,0 +1,67 @@
+import pytest
+
+from rules import RuleSet
+
+
+def alert(alert_type, message=''):
+    return {'alert_type': alert_type, 'message': message}
+
+
+CONFIG = {
+    'defaults': {'cooldown': 60},
+    'rules': [
+        {'name': 'down', 'match': {'type': 'Container Down'}, 'severity': 'critical', 'buffer': 0},
+        {'name': 'anomalies', 'match': {'type_regex': 'Anomaly$', 'message_regex': r'on (?P<container>\S+)'},
+         'group_by': ['alert_type', 'container']},
+    ],
+    'inhibit': [
+        {'source': {'type': 'Container Down'}, 'target': {'type': ['High CPU']}, 'duration': 300},
+    ],
+}
+
+
+def test_first_matching_rule_wins():
+    rules = RuleSet(CONFIG)
+    rule, key = rules.classify(alert('Container Down', 'gone'))
+    assert rule.name == 'down' and rule.severity == 'critical' and rule.buffer == 0
+    assert key == ('down', 'Container Down')
+
+
+def test_group_key_uses_named_regex_groups():
+    rules = RuleSet(CONFIG)
+    _, web = rules.classify(alert('CPU Anomaly', 'cpu spike on web'))
+    _, db = rules.classify(alert('CPU Anomaly', 'cpu spike on db'))
+    assert web == ('anomalies', 'CPU Anomaly', 'web')
+    assert web != db
+
+
+def test_unmatched_alerts_get_the_defaults():
+    rules = RuleSet(CONFIG)
+    first = alert('CPU Anomaly', 'no container named')
+    rule, key = rules.classify(first)
+    assert rule.name == 'default' and rule.cooldown == 60
+    assert first['rule'] == 'default' and first['severity'] == 'warning'
+
+
+def test_inhibition_window():
+    rules = RuleSet(CONFIG)
+    assert not rules.inhibited(alert('High CPU'), now=0)
+    assert not rules.inhibited(alert('Container Down'), now=100)
+    assert rules.inhibited(alert('High CPU'), now=200)
+    assert not rules.inhibited(alert('High Memory'), now=200)
+    assert not rules.inhibited(alert('High CPU'), now=401)
+    assert rules.suppressed == 1
+
+
+def test_restore_source_rearms_inhibition():
+    rules = RuleSet(CONFIG)
+    rules.restore_source(alert('Container Down'), at=1000)
+    assert rules.inhibits(alert('High CPU'), now=1200)
+    assert not rules.inhibits(alert('High CPU'), now=1301)
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError):
+        RuleSet({'rules': [{'name': 'x', 'severity': 'urgent'}]})
+    with pytest.raises(ValueError):
+        RuleSet({'rules': [{'name': 'x', 'match': {'kind': 'y'}}]})
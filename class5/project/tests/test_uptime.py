@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from uptime import DOWN, UNKNOWN, UP, UptimeTracker, state_from_status
+
+
+def test_state_from_status():
+    assert state_from_status('running') == UP
+    assert state_from_status('exited') == DOWN
+
+
+def test_availability_excludes_unknown_time(tmp_path):
+    tracker = UptimeTracker(str(tmp_path / 'uptime'))
+    tracker.record(UP, ts=1000)
+    tracker.record(DOWN, ts=1300)
+    tracker.record(UNKNOWN, ts=1400)
+    tracker.record(UP, ts=1900)
+    stats = tracker.stats(1000, now=2000)
+    assert stats['up_seconds'] == pytest.approx(400)
+    assert stats['down_seconds'] == pytest.approx(100)
+    assert stats['unknown_seconds'] == pytest.approx(500)
+    assert stats['availability'] == pytest.approx(80.0)
+    assert stats['failures'] == 1
+
+
+def test_nothing_observed_has_no_availability(tmp_path):
+    tracker = UptimeTracker(str(tmp_path / 'uptime'))
+    stats = tracker.stats(3600, now=5000)
+    assert stats['availability'] is None
+    assert stats['unknown_seconds'] == pytest.approx(3600)
+
+
+def test_restart_after_gap_records_unknown(tmp_path):
+    path = str(tmp_path / 'uptime')
+    tracker = UptimeTracker(path, max_gap=120)
+    tracker.record(UP, ts=1000)
+    os.utime(path + '.heartbeat', (1000, 1000))
+
+    restarted = UptimeTracker(path, max_gap=120)
+    assert restarted.current_state() == UNKNOWN
+    assert restarted.transitions() == [(1000, 'up'), (1000, 'unknown')]
+
+
+def test_only_changes_are_written(tmp_path):
+    path = str(tmp_path / 'uptime')
+    tracker = UptimeTracker(path)
+    for ts in range(1000, 1010):
+        tracker.record(UP, ts=ts)
+    tracker.record(DOWN, ts=1010)
+    assert len(tracker.transitions()) == 2
+    assert os.path.getsize(path) == 18